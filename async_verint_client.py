@@ -0,0 +1,175 @@
+"""
+Module: async_verint_client.py
+Purpose: Defines an asyncio-native client for making authenticated requests to
+the Verint API, mirroring VerintClient.verint_call on top of httpx.
+"""
+
+import asyncio
+import logging
+import time
+import httpx
+from hmac_auth import VerintHmac
+from rate_limiter import RetryPolicy, get_default_rate_limiter, parse_retry_after
+from response_archive import get_default_response_archive
+from metrics import get_default_metrics
+from diagnostics import get_diagnostics
+from memo_cache import ResponseMemo
+from config import BASE_URL, API_KEY_ID, API_KEY_SECRET, ASYNC_MAX_CONCURRENCY
+
+
+class AsyncVerintHmac(httpx.Auth):
+    """
+    httpx authentication flow that signs each request with VerintHmac,
+    producing the same Authorization header as the synchronous client.
+    """
+
+    def __init__(self, signer):
+        self.signer = signer
+
+    def auth_flow(self, request):
+        self.signer._encode(request)
+        yield request
+
+
+class AsyncVerintClient:
+    """
+    An asyncio client to interact with the Verint API using HMAC authentication.
+
+    One event loop can keep up to max_concurrency requests in flight over a
+    shared pool of keep-alive connections, without a thread per request.
+    Throttling, retries and the memoization of repeated lookups follow the
+    same rate limiter, retry policy and VERINT_MEMO_ENDPOINTS rules as
+    VerintClient.
+    """
+
+    def __init__(self, base_url=None, api_key_id=None, api_key_secret=None, max_concurrency=None,
+                 rate_limiter=None, retry_policy=None, archive=None, metrics=None, memo=None):
+        """
+        Initializes the AsyncVerintClient with API credentials and base URL.
+
+        Args:
+            base_url (str, optional): Verint base URL (defaults to config).
+            api_key_id (str, optional): API key id (defaults to config).
+            api_key_secret (str, optional): Base64url API secret (defaults to config).
+            max_concurrency (int, optional): Maximum in-flight requests (defaults to config).
+            rate_limiter (TokenBucket, optional): Limiter to share (defaults to the process-wide one).
+            retry_policy (RetryPolicy, optional): Retry/backoff policy (defaults to config).
+            archive (ResponseArchive, optional): Raw response archive (defaults to the run's
+                archive unless VERINT_ARCHIVE is off).
+            metrics (MetricsRegistry, optional): Request metrics (defaults to the process-wide registry).
+            memo (ResponseMemo, optional): In-memory memo of repeated GETs (defaults to
+                a new memo of the VERINT_MEMO_ENDPOINTS rules, for the client's lifetime).
+        """
+        self.base_url = base_url or BASE_URL
+        self.api_key_id = api_key_id or API_KEY_ID
+        self.api_key_val = api_key_secret or API_KEY_SECRET
+        self.max_concurrency = max_concurrency or ASYNC_MAX_CONCURRENCY
+        self.rate_limiter = rate_limiter or get_default_rate_limiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.archive = archive or get_default_response_archive()
+        self.metrics = metrics or get_default_metrics()
+        self.memo = memo if memo is not None else ResponseMemo()
+
+        # Reusable HMAC signer wrapped for httpx
+        self.auth = AsyncVerintHmac(VerintHmac(self.api_key_id, self.api_key_val))
+
+        # Connection pool sized to the concurrency limit; no timeout, matching VerintClient
+        limits = httpx.Limits(max_connections=self.max_concurrency,
+                              max_keepalive_connections=self.max_concurrency)
+        self.http = httpx.AsyncClient(limits=limits, timeout=None,
+                                      headers={'Content-Type': 'application/json'})
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Closes the underlying HTTP client and releases pooled connections.
+        """
+        await self.http.aclose()
+        if self.archive is not None:
+            self.archive.close()
+
+    async def verint_call(self, endpoint, method="GET", request_body=None):
+        """
+        Makes an authenticated request to the Verint API.
+
+        Args:
+            endpoint (str): API endpoint to be called (relative to base_url).
+            method (str): HTTP method (default is 'GET').
+            request_body (dict, optional): JSON body to be sent with the request.
+
+        Returns:
+            dict: Parsed JSON response from the API.
+
+        Raises:
+            httpx.HTTPStatusError: If the HTTP request returned an unsuccessful status code.
+        """
+        # Memoized lookups are served from memory or shared with an identical
+        # request in flight
+        rule = self.memo.rule_for(method, endpoint)
+        if rule is None:
+            return await self._request(endpoint, method, request_body)
+        response, source = await self.memo.call_async(rule, endpoint, lambda: self._request(endpoint, method))
+        if source is not None:
+            self.metrics.observe_local(method, endpoint, source)
+        return response
+
+    async def _request(self, endpoint, method="GET", request_body=None):
+        # Construct the full URL by appending the endpoint to the base URL
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        logging.debug(f"Calling Verint API [{method}] => {url}")
+
+        attempt = 0
+        while True:
+            # Wait for the shared rate limiter before sending
+            await self.rate_limiter.acquire_async()
+
+            # Bound the number of requests in flight across all tasks
+            try:
+                async with self._semaphore:
+                    start = time.perf_counter()
+                    response = await self.http.request(method, url, auth=self.auth, json=request_body)
+            except httpx.TransportError as e:
+                self.metrics.observe_request(method, endpoint, "error", time.perf_counter() - start)
+                if not self.retry_policy.should_retry(attempt):
+                    raise
+                self.metrics.observe_retry(method, endpoint)
+                delay = self.retry_policy.backoff(attempt)
+                get_diagnostics().record("retry", method=method, endpoint=endpoint, error=str(e),
+                                         delay=round(delay, 3))
+                logging.debug(f"Verint API [{method}] {url} failed ({e}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.metrics.observe_request(method, endpoint, response.status_code,
+                                         time.perf_counter() - start, len(response.content))
+
+            if self.retry_policy.should_retry(attempt, response.status_code):
+                self.metrics.observe_retry(method, endpoint)
+                # Honour Retry-After and hold back every task sharing the limiter
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = self.retry_policy.backoff(attempt, retry_after)
+                if retry_after is not None:
+                    self.rate_limiter.pause(delay)
+                get_diagnostics().record("retry", method=method, endpoint=endpoint,
+                                         status=response.status_code, delay=round(delay, 3))
+                logging.debug(f"Verint API [{method}] {url} returned {response.status_code}; "
+                              f"retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            break
+
+        # Raise an exception for unsuccessful responses
+        response.raise_for_status()
+
+        if self.archive is not None:
+            self.archive.record(method, endpoint, response.status_code, response.content)
+
+        # Return the parsed JSON response
+        return response.json()
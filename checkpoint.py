@@ -0,0 +1,87 @@
+"""
+Module: checkpoint.py
+Purpose: Append-only checkpoint journals for long extraction runs.
+
+Each completed entity is appended as one JSON line holding its id and the
+rows it produced. Lines are flushed to the OS as they are written and fsynced
+periodically, so a crashed or interrupted run can be resumed: entities found
+in the journal are skipped and their rows are taken from it.
+"""
+
+import json
+import logging
+import os
+import threading
+from config import CHECKPOINT_DIR, CHECKPOINT_FSYNC_EVERY
+
+class CheckpointJournal:
+    """
+    Journal of completed entities for one extractor.
+
+    Args:
+        name (str): Journal name, e.g. "employees"; the file is <CHECKPOINT_DIR>/<name>.ndjson.
+        resume (bool): Load entries of an existing journal instead of starting a new one.
+        fsync_every (int): Force journal lines to disk every this many entries.
+    """
+
+    def __init__(self, name, resume=False, fsync_every=None):
+        self.path = os.path.join(CHECKPOINT_DIR, f"{name}.ndjson")
+        self.fsync_every = fsync_every or CHECKPOINT_FSYNC_EVERY
+        self._completed = {}
+        self._lock = threading.Lock()
+        self._pending_sync = 0
+
+        if resume and os.path.exists(self.path):
+            self._load()
+        os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash; everything before it is valid
+                    break
+                self._completed[str(entry["id"])] = entry["rows"]
+        logging.info(f"Resuming from {self.path}: {len(self._completed)} entities already done")
+
+    def __len__(self):
+        return len(self._completed)
+
+    def get(self, entity_id):
+        """
+        Returns the journaled rows of an entity, or None if it is not done yet.
+        """
+        return self._completed.get(str(entity_id))
+
+    def record(self, entity_id, rows):
+        """
+        Appends a completed entity and the rows it produced.
+        """
+        line = json.dumps({"id": entity_id, "rows": rows}, separators=(",", ":"), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self._pending_sync += 1
+            if self._pending_sync >= self.fsync_every:
+                os.fsync(self._file.fileno())
+                self._pending_sync = 0
+
+    def close(self):
+        """
+        Syncs and closes the journal, keeping it for a later resume.
+        """
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+
+    def finish(self):
+        """
+        Closes and removes the journal once its extraction completed successfully.
+        """
+        self.close()
+        os.remove(self.path)
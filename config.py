@@ -12,4 +12,86 @@ load_dotenv()
 
 BASE_URL = os.getenv("VERINT_BASE_URL")
 API_KEY_ID = os.getenv("VERINT_API_KEY_ID")
-API_KEY_SECRET = os.getenv("VERINT_API_KEY_SECRET")
\ No newline at end of file
+API_KEY_SECRET = os.getenv("VERINT_API_KEY_SECRET")
+
+# HTTP connection pooling: number of keep-alive connections kept per host
+POOL_SIZE = int(os.getenv("VERINT_POOL_SIZE", "10"))
+
+# Worker threads used for concurrent sub-resource fetches (1 = sequential)
+MAX_WORKERS = int(os.getenv("VERINT_MAX_WORKERS", "1"))
+
+# Maximum in-flight requests for the asyncio client and extractors
+ASYNC_MAX_CONCURRENCY = int(os.getenv("VERINT_ASYNC_MAX_CONCURRENCY", "100"))
+
+# Client-side rate limiting (0 = unlimited) and retry policy for 429/5xx responses
+RATE_LIMIT_RPS = float(os.getenv("VERINT_RATE_LIMIT_RPS", "0"))
+RATE_LIMIT_BURST = int(os.getenv("VERINT_RATE_LIMIT_BURST", "10"))
+MAX_RETRIES = int(os.getenv("VERINT_MAX_RETRIES", "5"))
+RETRY_BACKOFF_BASE = float(os.getenv("VERINT_RETRY_BACKOFF_BASE", "0.5"))
+RETRY_BACKOFF_MAX = float(os.getenv("VERINT_RETRY_BACKOFF_MAX", "60"))
+
+# Optional on-disk GET response cache (empty = disabled)
+CACHE_DIR = os.getenv("VERINT_CACHE_DIR", "")
+CACHE_TTL = float(os.getenv("VERINT_CACHE_TTL", "86400"))
+CACHE_MAX_BYTES = int(os.getenv("VERINT_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+# In-memory memoization of repeated GET lookups within a run: comma-separated
+# "endpoint template pattern=max entries" rules (empty = disabled). Concurrent
+# identical requests to a memoized endpoint share one call.
+MEMO_ENDPOINTS = os.getenv("VERINT_MEMO_ENDPOINTS", "api/em/v2/datasources/{id}=4096")
+
+# Directory for incremental-run state (fingerprints and stored rows)
+STATE_DIR = os.getenv("VERINT_STATE_DIR", "state")
+
+# Checkpoint journals used to resume interrupted extraction runs
+CHECKPOINT_DIR = os.getenv("VERINT_CHECKPOINT_DIR", "checkpoints")
+CHECKPOINT_FSYNC_EVERY = int(os.getenv("VERINT_CHECKPOINT_FSYNC_EVERY", "100"))
+
+# How organization skills, UDFs and job titles are fetched: "per_org" (one call
+# per organization and collection) or "bulk" (one call per leaf organization,
+# whose response also carries everything inherited from its ancestors)
+ORG_FETCH_MODE = os.getenv("VERINT_ORG_FETCH_MODE", "per_org")
+
+# Export formats of a run (comma-separated: xlsx, csv, ndjson). CSV and NDJSON
+# files are written per sheet under EXPORT_DIR, optionally gzip-compressed;
+# the workbook goes to WORKBOOK_PATH.
+EXPORT_FORMATS = [fmt.strip() for fmt in os.getenv("VERINT_EXPORT_FORMATS", "xlsx").split(",") if fmt.strip()]
+EXPORT_DIR = os.getenv("VERINT_EXPORT_DIR", "output")
+WORKBOOK_PATH = os.getenv("VERINT_WORKBOOK_PATH", "output/verint_full_export.xlsx")
+EXPORT_GZIP = os.getenv("VERINT_EXPORT_GZIP", "false").lower() in ("1", "true", "yes")
+
+# Local SQLite snapshot of every extracted sheet, indexed for querying (empty =
+# disabled). When enabled, sheets are bulk-loaded into the snapshot in one
+# transaction (SNAPSHOT_BATCH_SIZE rows per insert) and the export formats
+# above are generated from it.
+SNAPSHOT_PATH = os.getenv("VERINT_SNAPSHOT_PATH", "output/verint_snapshot.sqlite")
+SNAPSHOT_BATCH_SIZE = int(os.getenv("VERINT_SNAPSHOT_BATCH_SIZE", "5000"))
+
+# Raw response archive of each run (gzip members plus an NDJSON index by
+# endpoint); disable for pure throughput runs
+ARCHIVE_ENABLED = os.getenv("VERINT_ARCHIVE", "true").lower() in ("1", "true", "yes")
+ARCHIVE_DIR = os.getenv("VERINT_ARCHIVE_DIR", "json_dump")
+ARCHIVE_COMPRESSLEVEL = int(os.getenv("VERINT_ARCHIVE_COMPRESSLEVEL", "1"))
+
+# Access rights export: "flat" (one Access Rights row per employee-role pair)
+# or "normalized" (Employee Roles fact sheet plus an Access Roles dimension sheet)
+ACCESS_RIGHTS_MODE = os.getenv("VERINT_ACCESS_RIGHTS_MODE", "flat")
+
+# Employees whose skills, UDFs and preferences are normalized together
+NORMALIZE_BATCH_SIZE = int(os.getenv("VERINT_NORMALIZE_BATCH_SIZE", "500"))
+
+# Where per-run metrics (JSON summary and Prometheus textfile) are written
+METRICS_DIR = os.getenv("VERINT_METRICS_DIR", "metrics")
+
+# Logging verbosity, progress line interval (seconds) and the per-entity
+# diagnostics log written in batches of DIAGNOSTICS_BATCH events
+LOG_LEVEL = os.getenv("VERINT_LOG_LEVEL", "INFO")
+PROGRESS_INTERVAL = float(os.getenv("VERINT_PROGRESS_INTERVAL", "5"))
+DIAGNOSTICS_DIR = os.getenv("VERINT_DIAGNOSTICS_DIR", "logs")
+DIAGNOSTICS_BATCH = int(os.getenv("VERINT_DIAGNOSTICS_BATCH", "500"))
+
+# Where the reports of --diff comparisons of two extractions are written
+DIFF_DIR = os.getenv("VERINT_DIFF_DIR", "diffs")
+
+# Parent directory of the per-shard output of sharded runs (--shard k/N)
+SHARD_DIR = os.getenv("VERINT_SHARD_DIR", "shards")
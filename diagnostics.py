@@ -0,0 +1,94 @@
+"""
+Module: diagnostics.py
+Purpose: Structured per-entity diagnostics of a run, written in batches.
+
+Details such as a skipped sub-resource of one employee are recorded as
+NDJSON events in logs/diagnostics_<timestamp>.ndjson instead of being
+printed to the terminal. Events are buffered and appended in batches, so
+recording one costs a dict append rather than a terminal write.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from config import DIAGNOSTICS_DIR, DIAGNOSTICS_BATCH
+
+class DiagnosticsLog:
+    """
+    Buffered NDJSON event log.
+
+    Args:
+        path (str): Log file (created on the first flush).
+        batch_size (int, optional): Events buffered before they are appended to the file.
+    """
+
+    def __init__(self, path, batch_size=None):
+        self.path = path
+        self.batch_size = batch_size or DIAGNOSTICS_BATCH
+        self.events = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def record(self, event, **fields):
+        """
+        Records one event, e.g. record("fetch_failed", extractor="employees", entity_id="42").
+        """
+        entry = {"time": round(time.time(), 3), "event": event}
+        entry.update(fields)
+        with self._lock:
+            self._buffer.append(entry)
+            self.events += 1
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(entry, default=str) + "\n" for entry in self._buffer))
+        self._buffer.clear()
+
+    def flush(self):
+        """
+        Appends the buffered events to the file.
+        """
+        with self._lock:
+            self._flush_locked()
+
+def failure(extractor, resource, entity_id, error, progress=None):
+    """
+    Records a skipped fetch in the run's diagnostics log and counts it on a
+    progress reporter, if one is given.
+
+    Args:
+        extractor (str): Extractor name, e.g. "employees".
+        resource (str): What could not be fetched, e.g. "skills".
+        entity_id: Id of the employee, group or organization concerned.
+        error (Exception | str): Cause of the failure.
+        progress (ProgressReporter, optional): Reporter counting errors per resource.
+    """
+    get_diagnostics().record("fetch_failed", extractor=extractor, resource=resource,
+                             entity_id=entity_id, error=str(error))
+    logging.debug(f"{extractor}: {resource} fetch failed for {entity_id} — skipping. Error: {error}")
+    if progress is not None:
+        progress.error(resource)
+
+_default_log = None
+_default_log_lock = threading.Lock()
+
+def get_diagnostics():
+    """
+    Returns the diagnostics log of the current run, flushed at interpreter exit.
+    """
+    global _default_log
+    with _default_log_lock:
+        if _default_log is None:
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            _default_log = DiagnosticsLog(os.path.join(DIAGNOSTICS_DIR, f"diagnostics_{stamp}.ndjson"))
+            atexit.register(_default_log.flush)
+        return _default_log
@@ -0,0 +1,34 @@
+"""
+Runs the local Verint API emulator.
+
+Usage:
+    python -m emulator --employees 50000 --orgs 200 --group-depth 5 --latency-ms 20 --error-rate 0.01
+
+Point the toolkit at it with:
+    VERINT_BASE_URL=http://127.0.0.1:8080
+    VERINT_API_KEY_ID=emulator-key
+    VERINT_API_KEY_SECRET=<printed on startup>
+"""
+
+import argparse
+from emulator.server import add_tenant_arguments, build_app
+
+
+def main():
+    import uvicorn
+    from emulator.app import DEFAULT_API_KEY_ID, DEFAULT_API_KEY_SECRET
+
+    parser = argparse.ArgumentParser(description="Local Verint API emulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_tenant_arguments(parser)
+    args = parser.parse_args()
+
+    app = build_app(args)
+    print(f"Verint emulator on http://{args.host}:{args.port} "
+          f"(API key id: {DEFAULT_API_KEY_ID}, secret: {DEFAULT_API_KEY_SECRET})")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
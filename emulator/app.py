@@ -0,0 +1,189 @@
+"""
+Module: app.py
+Purpose:
+    FastAPI application emulating the Verint endpoints used by the extractors.
+
+    Requests are checked against the Verint HMAC Authorization header, can be
+    slowed down with injected latency and can fail with injected errors (429
+    responses carry a Retry-After header), so throughput, retry and rate-limit
+    behaviour can be exercised offline. Successful responses carry an ETag and
+    honour If-None-Match, so response caching can be exercised as well.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import re
+from collections import Counter
+from hashlib import sha256
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from hmac_auth import VerintHmac, base64url_decode, base64url_encode
+
+DEFAULT_API_KEY_ID = "emulator-key"
+DEFAULT_API_KEY_SECRET = base64url_encode(b"verint-emulator-secret")
+
+AUTH_PATTERN = re.compile(
+    re.escape(VerintHmac.SIGNATURE_PREFIX) + r" salt=([^,]*),iat=([^,]*),kid=([^,]*),sig=(.*)$"
+)
+
+def _json(payload, status_code=200, headers=None):
+    return Response(json.dumps(payload, separators=(",", ":")), status_code=status_code,
+                    media_type="application/json", headers=headers)
+
+def verify_signature(header, method, path, api_key_id, secret_key):
+    """
+    Checks a Verint HMAC Authorization header against the request method and path.
+
+    Returns:
+        bool: True if the key id matches and the signature is valid.
+    """
+    match = AUTH_PATTERN.match(header or "")
+    if not match:
+        return False
+    salt, timestamp, kid, signature = match.groups()
+    if kid != api_key_id:
+        return False
+    string_to_sign = f'{salt}\n{method}\n{path}\n{timestamp}\n\n'
+    expected = base64url_encode(hmac.new(base64url_decode(secret_key), string_to_sign.encode('utf-8'),
+                                         sha256).digest())
+    return hmac.compare_digest(expected, signature)
+
+def create_app(tenant, latency_ms=0.0, latency_jitter_ms=0.0, error_rate=0.0,
+               error_statuses=(429, 500, 503), retry_after=1, check_auth=True, etags=True,
+               api_key_id=DEFAULT_API_KEY_ID, api_key_secret=DEFAULT_API_KEY_SECRET):
+    """
+    Builds the emulator application for a synthetic tenant.
+
+    Args:
+        tenant (SyntheticTenant): Data served by the emulator.
+        latency_ms (float): Base latency added to every response.
+        latency_jitter_ms (float): Uniform random latency added on top of latency_ms.
+        error_rate (float): Probability (0-1) that a request fails with an injected error.
+        error_statuses (tuple[int]): Status codes used for injected errors.
+        retry_after (int): Retry-After seconds sent with injected 429/503 responses.
+        check_auth (bool): Reject requests without a valid HMAC signature.
+        etags (bool): Send ETags and answer matching If-None-Match requests with 304.
+        api_key_id (str): Expected API key id.
+        api_key_secret (str): Base64url secret used to verify signatures.
+
+    Returns:
+        FastAPI: The application; request statistics are kept in app.state.stats.
+    """
+    app = FastAPI(title="Verint API emulator")
+    app.state.tenant = tenant
+    app.state.stats = Counter()
+    rng = random.Random(tenant.seed)
+    list_cache = {}
+
+    @app.middleware("http")
+    async def emulate_transport(request: Request, call_next):
+        # Emulator control endpoints bypass auth, latency and error injection
+        if request.url.path.startswith("/_emulator"):
+            return await call_next(request)
+
+        stats = app.state.stats
+        stats["requests"] += 1
+
+        if check_auth:
+            raw_path = request.scope.get("raw_path", b"").decode("latin-1") or request.url.path
+            if not verify_signature(request.headers.get("authorization"), request.method,
+                                    raw_path, api_key_id, api_key_secret):
+                stats["status_401"] += 1
+                return _json({"errors": [{"detail": "Invalid HMAC signature"}]}, 401)
+
+        delay = latency_ms + (rng.uniform(0, latency_jitter_ms) if latency_jitter_ms else 0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000.0)
+
+        if error_rate and rng.random() < error_rate:
+            status = rng.choice(error_statuses)
+            stats[f"status_{status}"] += 1
+            headers = {"Retry-After": str(retry_after)} if status in (429, 503) else None
+            return _json({"errors": [{"detail": "Injected error"}]}, status, headers)
+
+        response = await call_next(request)
+
+        # Tag successful responses and short-circuit unchanged ones with 304
+        if etags and response.status_code == 200:
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if request.headers.get("if-none-match") == etag:
+                response = Response(status_code=304, headers={"ETag": etag})
+            else:
+                stats["bytes_sent"] += len(body)
+                response = Response(body, media_type="application/json", headers={"ETag": etag})
+
+        stats[f"status_{response.status_code}"] += 1
+        return response
+
+    def cached_list(name, data):
+        # Serialize large, immutable list responses once
+        if name not in list_cache:
+            list_cache[name] = json.dumps({"data": data}, separators=(",", ":"))
+        return Response(list_cache[name], media_type="application/json")
+
+    def not_found():
+        return _json({"errors": [{"detail": "Not found"}]}, 404)
+
+    # User management: employees
+    @app.get("/wfo/user-mgmt-api/v1/employees")
+    async def list_employees():
+        return cached_list("employees", tenant.employees)
+
+    @app.get("/wfo/user-mgmt-api/v1/employees/{employee_id}/{resource}")
+    async def employee_resource(employee_id: str, resource: str, keys: str = None):
+        if employee_id not in tenant.employee_by_id:
+            return not_found()
+        handlers = {
+            "jobTitle": tenant.employee_job_title,
+            "workspace": tenant.employee_workspace,
+            "skills": tenant.employee_skills,
+            "user-defined-fields": tenant.employee_udfs,
+            "supervisor": tenant.employee_supervisor,
+            "teamLead": tenant.employee_team_lead,
+            "roles": tenant.employee_roles,
+        }
+        if resource == "preferences":
+            return _json(tenant.employee_preferences(employee_id, keys.split(",") if keys else None))
+        if resource not in handlers:
+            return not_found()
+        return _json(handlers[resource](employee_id))
+
+    # User management: groups, organizations and roles
+    @app.get("/wfo/user-mgmt-api/v1/groups")
+    async def list_groups():
+        return cached_list("groups", tenant.groups)
+
+    @app.get("/wfo/user-mgmt-api/v1/groups/{group_id}/employees")
+    async def group_employees(group_id: str):
+        if group_id not in tenant.group_by_id:
+            return not_found()
+        return _json(tenant.group_employees(group_id))
+
+    @app.get("/wfo/user-mgmt-api/v1/organizations")
+    async def list_organizations():
+        return cached_list("organizations", tenant.organizations)
+
+    @app.get("/wfo/user-mgmt-api/v1/organizations/{org_id}/{resource}")
+    async def organization_resource(org_id: str, resource: str):
+        if org_id not in tenant.org_by_id or resource not in ("skills", "user-defined-fields", "jobTitles"):
+            return not_found()
+        return _json(tenant.org_items(org_id, resource))
+
+    @app.get("/wfo/user-mgmt-api/v1/roles")
+    async def list_roles():
+        return cached_list("roles", tenant.roles)
+
+    # Enterprise manager: data sources
+    @app.get("/api/em/v2/datasources/{ds_id}")
+    async def datasource(ds_id: str):
+        return _json(tenant.datasource(ds_id))
+
+    @app.get("/_emulator/stats")
+    async def emulator_stats():
+        return dict(app.state.stats)
+
+    return app
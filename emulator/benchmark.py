@@ -0,0 +1,159 @@
+"""
+Module: benchmark.py
+Purpose:
+    Runs the extractors end-to-end against the local Verint API emulator and
+    records per-stage wall-clock time, so throughput regressions can be caught
+    offline before they reach production.
+
+Usage:
+    python -m emulator.benchmark --employees 50000 --max-workers 16 --output bench.json
+    python -m emulator.benchmark --employees 5000 --baseline bench.json --tolerance 0.15
+    python -m emulator.benchmark --employees 5000 --parallel
+
+The process exits with status 1 when a stage is slower than its baseline by
+more than the tolerance. Exports, the snapshot, archived responses and every
+other file of the run are written under a scratch directory (--work-dir, by
+default a new temporary directory), never over a real migration's output.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from emulator.server import add_tenant_arguments, build_app, start_in_thread
+
+# The toolkit (pipeline, metrics, extractors) reads config.py on import, so it
+# is only imported in main() once the environment points at the emulator
+
+# Environment variable -> path of the run's files under the work directory
+WORK_DIR_PATHS = {
+    "VERINT_WORKBOOK_PATH": os.path.join("output", "verint_full_export.xlsx"),
+    "VERINT_EXPORT_DIR": "output",
+    "VERINT_SNAPSHOT_PATH": os.path.join("output", "verint_snapshot.sqlite"),
+    "VERINT_ARCHIVE_DIR": "json_dump",
+    "VERINT_CHECKPOINT_DIR": "checkpoints",
+    "VERINT_STATE_DIR": "state",
+    "VERINT_METRICS_DIR": "metrics",
+    "VERINT_DIAGNOSTICS_DIR": "logs",
+    "VERINT_SHARD_DIR": "shards",
+    "VERINT_DIFF_DIR": "diffs",
+}
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Returns a list of human-readable regressions against a baseline result file.
+    """
+    regressions = []
+    for stage, current in results["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if previous and current["seconds"] > previous["seconds"] * (1 + tolerance):
+            regressions.append(f"{stage}: {current['seconds']:.2f}s vs baseline {previous['seconds']:.2f}s")
+    return regressions
+
+
+def main():
+    from emulator.app import DEFAULT_API_KEY_ID, DEFAULT_API_KEY_SECRET
+
+    parser = argparse.ArgumentParser(description="Benchmark the extractors against the Verint emulator")
+    add_tenant_arguments(parser)
+    parser.add_argument("--stages", default=None,
+                        help="Comma-separated stages to run (default: every stage)")
+    parser.add_argument("--max-workers", type=int, default=None, help="Sets VERINT_MAX_WORKERS for the run")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Run independent stages concurrently through the pipeline scheduler")
+    parser.add_argument("--server-url", default=None,
+                        help="Use an already running emulator instead of starting one in-process")
+    parser.add_argument("--work-dir", default=None,
+                        help="Directory of the run's exports, snapshot, archive and state "
+                             "(default: a new temporary directory)")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    parser.add_argument("--baseline", default=None, help="Compare against a previous results file")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed slowdown per stage before it counts as a regression")
+    args = parser.parse_args()
+
+    app = None
+    if args.server_url:
+        base_url = args.server_url.rstrip("/")
+    else:
+        app = build_app(args)
+        _, base_url = start_in_thread(app)
+
+    # Point the toolkit configuration at the emulator before importing it
+    os.environ["VERINT_BASE_URL"] = base_url
+    os.environ["VERINT_API_KEY_ID"] = DEFAULT_API_KEY_ID
+    os.environ["VERINT_API_KEY_SECRET"] = DEFAULT_API_KEY_SECRET
+    if args.max_workers:
+        os.environ["VERINT_MAX_WORKERS"] = str(args.max_workers)
+    # Synthetic data must never replace a real export, snapshot or archive
+    work_dir = os.path.abspath(args.work_dir or tempfile.mkdtemp(prefix="verint_benchmark_"))
+    for name, path in WORK_DIR_PATHS.items():
+        os.environ[name] = os.path.join(work_dir, path)
+    print(f"[benchmark] work directory: {work_dir}")
+    from exporters.multi_sink import create_run_sink
+    from metrics import get_default_metrics
+    from pipeline import build_extraction_pipeline
+    from progress import configure_logging
+    from run_context import RunContext
+
+    configure_logging()
+    pipeline = build_extraction_pipeline()
+    stages = [s.strip() for s in (args.stages or ",".join(pipeline.names())).split(",") if s.strip()]
+    unknown = [s for s in stages if s not in pipeline.names()]
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(unknown)} (choose from {', '.join(pipeline.names())})")
+
+    results = {"tenant": {"employees": args.employees, "orgs": args.orgs, "groups": args.groups,
+                          "group_depth": args.group_depth, "skills_per_employee": args.skills_per_employee},
+               "max_workers": args.max_workers, "work_dir": work_dir, "stages": {}}
+    results["parallel"] = args.parallel
+    context = RunContext()
+    sink = create_run_sink(sheet_order=pipeline.sheet_order())
+    total_start = time.perf_counter()
+    if args.parallel:
+        # Stages overlap, so requests cannot be attributed to a single stage
+        for stage, entry in pipeline.run(context, sink, names=stages).items():
+            results["stages"][stage] = entry
+    else:
+        for stage in pipeline.resolve(stages):
+            requests_before = app.state.stats["requests"] if app else None
+            start = time.perf_counter()
+            stage.run(context, sink)
+            elapsed = time.perf_counter() - start
+            entry = {"seconds": round(elapsed, 3)}
+            if app:
+                entry["requests"] = app.state.stats["requests"] - requests_before
+                entry["requests_per_second"] = round(entry["requests"] / elapsed, 1) if elapsed else None
+            results["stages"][stage.name] = entry
+            print(f"[benchmark] {stage.name}: {elapsed:.2f}s")
+
+    # Finalizing the workbook (and any other export files) is timed as its own stage
+    start = time.perf_counter()
+    sink.close()
+    context.finish_journals()
+    results["stages"]["workbook"] = {"seconds": round(time.perf_counter() - start, 3)}
+    print(f"[benchmark] workbook: {results['stages']['workbook']['seconds']:.2f}s")
+    results["total_seconds"] = round(time.perf_counter() - total_start, 3)
+    if app:
+        results["emulator_stats"] = dict(app.state.stats)
+    results["metrics"] = get_default_metrics().summary()
+    print(f"[benchmark] total: {results['total_seconds']:.2f}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"[benchmark] REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
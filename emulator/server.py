@@ -0,0 +1,74 @@
+"""
+Module: server.py
+Purpose: Command-line options and server helpers shared by the emulator entry
+point (python -m emulator) and the benchmark runner.
+"""
+
+import socket
+import threading
+import time
+
+def add_tenant_arguments(parser):
+    """
+    Adds synthetic tenant and fault-injection options to an argument parser.
+    """
+    parser.add_argument("--employees", type=int, default=1000, help="Number of employees")
+    parser.add_argument("--orgs", type=int, default=50, help="Number of organizations")
+    parser.add_argument("--org-depth", type=int, default=4, help="Maximum organization depth")
+    parser.add_argument("--groups", type=int, default=100, help="Number of groups")
+    parser.add_argument("--group-depth", type=int, default=4, help="Maximum group depth")
+    parser.add_argument("--roles", type=int, default=20, help="Number of roles")
+    parser.add_argument("--skills-per-employee", type=int, default=5, help="Skill assignments per employee")
+    parser.add_argument("--items-per-org", type=int, default=2,
+                        help="Skills, UDFs and job titles defined on each organization")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed for the synthetic tenant")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base latency per request")
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0, help="Random extra latency per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected error")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on injected 429/503")
+    parser.add_argument("--no-auth", action="store_true", help="Do not verify HMAC signatures")
+
+
+def build_app(args):
+    """
+    Builds the emulator app from parsed command-line arguments.
+    """
+    from emulator.app import create_app
+    from emulator.tenant import SyntheticTenant
+
+    tenant = SyntheticTenant(
+        employees=args.employees, orgs=args.orgs, org_depth=args.org_depth,
+        groups=args.groups, group_depth=args.group_depth, roles=args.roles,
+        skills_per_employee=args.skills_per_employee, items_per_org=args.items_per_org,
+        seed=args.seed,
+    )
+    return create_app(
+        tenant, latency_ms=args.latency_ms, latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate, retry_after=args.retry_after, check_auth=not args.no_auth,
+    )
+
+
+def start_in_thread(app, host="127.0.0.1", port=0):
+    """
+    Starts the emulator with uvicorn in a daemon thread.
+
+    Args:
+        app (FastAPI): Emulator application.
+        host (str): Interface to bind.
+        port (int): Port to bind; 0 picks a free port.
+
+    Returns:
+        tuple: (uvicorn.Server, base_url). Set server.should_exit to stop it.
+    """
+    import uvicorn
+
+    if not port:
+        with socket.socket() as sock:
+            sock.bind((host, 0))
+            port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://{host}:{port}"
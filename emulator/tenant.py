@@ -0,0 +1,302 @@
+"""
+Module: tenant.py
+Purpose:
+    Generates synthetic Verint tenants for the local API emulator.
+
+    Base collections (organizations, groups, roles, employees) are generated
+    up front; per-employee sub-resources (skills, UDFs, preferences, workspace,
+    ...) are derived on demand from a seeded RNG so that a 50k-employee tenant
+    stays small in memory and every response is reproducible across runs.
+"""
+
+import random
+from collections import defaultdict
+from datetime import date, timedelta
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Patel", "Okafor", "Novak", "Silva", "Kim", "Muller", "Haddad"]
+SKILL_NAMES = ["Billing", "Sales", "Retention", "Tech Support", "Spanish", "French", "Chat", "Email", "VIP", "Claims"]
+JOB_TITLES = ["Agent", "Senior Agent", "Supervisor", "Team Lead", "Analyst", "Trainer"]
+EMPLOYEE_TYPES = ["Agent", "Supervisor", "Administrator"]
+PREFERENCE_KEYS = ["UserTimezone", "UserLanguage", "UserDefaultPageRows", "UserRegionalFormat"]
+
+def _build_tree(count, depth, rng):
+    """
+    Returns (parent_index, level) pairs for `count` nodes forming a forest
+    no deeper than `depth` levels, in creation (parent-before-child) order.
+    """
+    nodes = []
+    eligible_parents = []
+    for i in range(count):
+        if i == 0 or not eligible_parents or rng.random() < 0.05:
+            nodes.append((None, 0))
+            level = 0
+        else:
+            parent = rng.choice(eligible_parents)
+            level = nodes[parent][1] + 1
+            nodes.append((parent, level))
+        if level < depth - 1:
+            eligible_parents.append(i)
+    return nodes
+
+class SyntheticTenant:
+    """
+    An in-memory synthetic Verint tenant.
+
+    Args:
+        employees (int): Number of employees.
+        orgs (int): Number of organizations.
+        org_depth (int): Maximum organization hierarchy depth.
+        groups (int): Number of groups.
+        group_depth (int): Maximum group hierarchy depth.
+        roles (int): Number of roles.
+        skills_per_employee (int): Skill assignments per employee.
+        items_per_org (int): Skills, UDFs and job titles defined on each organization.
+        datasources (int): Number of workspace data sources.
+        seed (int): RNG seed; identical arguments always produce identical tenants.
+    """
+
+    def __init__(self, employees=1000, orgs=50, org_depth=4, groups=100, group_depth=4,
+                 roles=20, skills_per_employee=5, items_per_org=2, datasources=5, seed=42):
+        self.seed = seed
+        self.skills_per_employee = skills_per_employee
+        self.items_per_org = items_per_org
+        self.datasource_count = datasources
+        rng = random.Random(seed)
+
+        # Organizations
+        self.organizations = []
+        for i, (parent, level) in enumerate(_build_tree(orgs, org_depth, rng)):
+            self.organizations.append({
+                "id": str(1000 + i),
+                "type": "organizations",
+                "attributes": {
+                    "name": f"Org {i} (L{level + 1})",
+                    "parentId": None if parent is None else 1000 + parent,
+                    "description": f"Synthetic organization {i}",
+                    "timeZone": "America/New_York",
+                    "weekStartDay": "Monday",
+                    "seatsNumber": rng.randint(5, 500),
+                    "location": "Remote",
+                },
+            })
+        self.org_by_id = {org["id"]: org for org in self.organizations}
+
+        # Groups
+        self.groups = []
+        for i, (parent, level) in enumerate(_build_tree(groups, group_depth, rng)):
+            self.groups.append({
+                "id": str(5000 + i),
+                "type": "groups",
+                "attributes": {
+                    "name": f"Group {i} (L{level + 1})",
+                    "parentId": None if parent is None else 5000 + parent,
+                    "description": f"Synthetic group {i}",
+                    "groupType": ["Workgroup"] if i % 2 else ["Workgroup", "Team"],
+                },
+            })
+        self.group_by_id = {group["id"]: group for group in self.groups}
+
+        # Roles with accessible organization and group scopes
+        self.roles = []
+        for i in range(roles):
+            owner = rng.choice(self.organizations)
+            scope_orgs = rng.sample(self.organizations, min(len(self.organizations), rng.randint(1, 10)))
+            scope_groups = rng.sample(self.groups, min(len(self.groups), rng.randint(0, 10)))
+            self.roles.append({
+                "id": str(9000 + i),
+                "type": "roles",
+                "attributes": {
+                    "name": f"Role {i}",
+                    "description": f"Synthetic role {i}",
+                    "isDefault": i == 0,
+                    "isAdminRole": i % 7 == 0,
+                },
+                "relationships": {
+                    "organization": {"data": self._ref(owner)},
+                    "organizations": {"data": [self._ref(o) for o in scope_orgs]},
+                    "groups": {"data": [self._ref(g) for g in scope_groups]},
+                },
+            })
+
+        # Employees and group membership
+        self.employees = []
+        self.group_members = defaultdict(list)
+        for i in range(employees):
+            emp_id = str(100000 + i)
+            org = rng.choice(self.organizations)
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            self.employees.append({
+                "id": emp_id,
+                "type": "employees",
+                "attributes": {
+                    "employeeNumber": f"E{i:07d}",
+                    "employeeType": rng.choice(EMPLOYEE_TYPES),
+                    "isSupervisor": i % 25 == 0,
+                    "isTeamLead": i % 10 == 0,
+                    "organizationId": int(org["id"]),
+                    "startTime": "2020-01-01T00:00:00Z",
+                    "endTime": None,
+                    "person": {
+                        "firstName": first,
+                        "middleInitial": chr(65 + i % 26),
+                        "lastName": last,
+                        "ssn": None,
+                        "birthDate": None,
+                        "contact": {
+                            "email": f"{first.lower()}.{last.lower()}{i}@example.com",
+                            "desktopMessagingUsername": None,
+                            "homePhone": None,
+                            "workPhone": f"555-{i % 10000:04d}",
+                            "cellPhone": None,
+                        },
+                        "address": {
+                            "addressLine1": f"{i} Main St",
+                            "addressLine2": None,
+                            "addressLine3": None,
+                            "city": "Springfield",
+                            "stateName": "IL",
+                            "zipCode": "62701",
+                            "country": "US",
+                        },
+                    },
+                    "user": {"username": f"user{i}", "status": "ACTIVE"},
+                },
+                "relationships": {"organization": {"data": self._ref(org)}},
+            })
+            if self.groups:
+                for group in rng.sample(self.groups, min(len(self.groups), rng.randint(1, 2))):
+                    self.group_members[group["id"]].append(emp_id)
+        self.employee_by_id = {emp["id"]: emp for emp in self.employees}
+
+    @staticmethod
+    def _ref(entity):
+        return {"id": entity["id"], "type": entity["type"], "meta": {"name": entity["attributes"]["name"]}}
+
+    def _rng(self, *key):
+        return random.Random(":".join(str(k) for k in (self.seed,) + key))
+
+    def _other_employee(self, emp_id, salt):
+        rng = self._rng(emp_id, salt)
+        return self.employees[rng.randrange(len(self.employees))]
+
+    def org_ancestry(self, org_id):
+        """
+        Returns the ids of an organization and all its ancestors, nearest first.
+        """
+        chain = []
+        while org_id is not None and org_id in self.org_by_id:
+            chain.append(org_id)
+            parent = self.org_by_id[org_id]["attributes"]["parentId"]
+            org_id = None if parent is None else str(parent)
+        return chain
+
+    # Employee sub-resources
+
+    def employee_job_title(self, emp_id):
+        rng = self._rng(emp_id, "job")
+        idx = rng.randrange(len(JOB_TITLES))
+        return {"data": {"id": str(700 + idx), "type": "jobTitles", "attributes": {"name": JOB_TITLES[idx]}}}
+
+    def employee_workspace(self, emp_id):
+        rng = self._rng(emp_id, "workspace")
+        assets = [
+            {"dataSourceID": 300 + ds, "loginName": f"login{emp_id}_{ds}"}
+            for ds in rng.sample(range(self.datasource_count), min(self.datasource_count, rng.randint(0, 2)))
+        ]
+        return {"data": {"attributes": {"assets": assets}}}
+
+    def employee_preferences(self, emp_id, keys=None):
+        rng = self._rng(emp_id, "prefs")
+        requested = keys or PREFERENCE_KEYS
+        return {"data": [
+            {"id": key, "attributes": {"value": None if rng.random() < 0.2 else f"{key}-value"}}
+            for key in requested
+        ]}
+
+    def employee_skills(self, emp_id):
+        rng = self._rng(emp_id, "skills")
+        today = date.today()
+        data = []
+        for n in range(self.skills_per_employee):
+            # Roughly one in five assignments has already ended
+            end = None
+            if rng.random() < 0.4:
+                end = (today + timedelta(days=rng.randint(-400, 400))).isoformat()
+            name = SKILL_NAMES[(n + rng.randrange(len(SKILL_NAMES))) % len(SKILL_NAMES)]
+            data.append({
+                "attributes": {
+                    "proficiency": rng.randint(1, 5),
+                    "priority": rng.randint(1, 10),
+                    "startDate": "2021-01-01",
+                    "endDate": end,
+                    "reserveLevel": rng.choice([None, 1, 2]),
+                },
+                "relationships": {"skill": {"data": {"id": str(800 + n), "meta": {"name": name}}}},
+            })
+        return {"data": data}
+
+    def employee_udfs(self, emp_id):
+        rng = self._rng(emp_id, "udfs")
+        return {"data": [
+            {"attributes": {"name": f"UDF {n}", "value": f"v{rng.randint(0, 99)}"}}
+            for n in range(rng.randint(0, 3))
+        ]}
+
+    def employee_supervisor(self, emp_id):
+        sup = self._other_employee(emp_id, "supervisor")
+        person = sup["attributes"]["person"]
+        return {"data": {"id": sup["id"], "attributes": {"firstName": person["firstName"],
+                                                         "lastName": person["lastName"]}}}
+
+    def employee_team_lead(self, emp_id):
+        lead = self._other_employee(emp_id, "teamLead")
+        person = lead["attributes"]["person"]
+        return {"data": {"id": lead["id"], "attributes": {"firstName": person["firstName"],
+                                                          "lastName": person["lastName"]}}}
+
+    def employee_roles(self, emp_id):
+        rng = self._rng(emp_id, "roles")
+        if not self.roles:
+            return {"data": []}
+        return {"data": rng.sample(self.roles, min(len(self.roles), rng.randint(1, 3)))}
+
+    def datasource(self, ds_id):
+        return {"data": [{"id": str(ds_id), "attributes": {"name": f"DataSource {ds_id}"}}]}
+
+    # Group and organization sub-resources
+
+    def group_employees(self, group_id):
+        data = []
+        for emp_id in self.group_members.get(group_id, []):
+            person = self.employee_by_id[emp_id]["attributes"]["person"]
+            data.append({"id": emp_id, "type": "employees", "attributes": {
+                "firstName": person["firstName"],
+                "lastName": person["lastName"],
+                "middleInitial": person["middleInitial"],
+            }})
+        return {"data": data}
+
+    def org_items(self, org_id, kind):
+        """
+        Returns skills, UDFs or job titles visible at an organization: those
+        defined on the organization itself plus those inherited from ancestors.
+        """
+        data = []
+        for owner_id in reversed(self.org_ancestry(org_id)):
+            for n in range(self.items_per_org):
+                item_id = f"{owner_id}-{kind}-{n}"
+                if kind == "skills":
+                    attributes = {"name": f"Skill {item_id}", "media": "Voice",
+                                  "description": "", "isActive": True}
+                elif kind == "user-defined-fields":
+                    attributes = {"name": f"UDF {item_id}", "description": "",
+                                  "udfType": "Text", "values": []}
+                else:
+                    attributes = {"name": f"Job {item_id}", "description": ""}
+                data.append({
+                    "id": item_id,
+                    "attributes": attributes,
+                    "relationships": {"organization": {"data": {"id": owner_id}}},
+                })
+        return {"data": data}
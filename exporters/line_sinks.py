@@ -0,0 +1,183 @@
+"""
+Module: line_sinks.py
+Purpose:
+    Streaming line-oriented exports (CSV and NDJSON) with the same interface
+    as WorkbookSink.
+
+    Every sheet opened on a sink becomes one file in the sink's directory,
+    named after the sheet ("Access Rights" -> access_rights.csv), optionally
+    gzip-compressed. Rows are encoded and written as soon as they are
+    appended, so memory does not grow with the number of rows and there is no
+    row limit. Files are written under a temporary name and moved into place
+    when the sink is closed, so readers never see a partial export.
+"""
+
+import csv
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+
+def sheet_slug(title):
+    """
+    Returns the identifier-safe name of a sheet, e.g. "Access Rights" -> "access_rights".
+    """
+    return re.sub(r"[^0-9a-z]+", "_", title.lower()).strip("_") or "sheet"
+
+def sheet_file_name(title, extension, compress=False):
+    """
+    Returns the file name used for a sheet, e.g. "Access Rights" -> "access_rights.csv.gz".
+    """
+    return f"{sheet_slug(title)}.{extension}" + (".gz" if compress else "")
+
+def _json_value(value):
+    """
+    Makes a cell value JSON-friendly: NaN becomes null and numpy scalars plain Python values.
+    """
+    if isinstance(value, float) and value != value:
+        return None
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        return value.item()
+    return value
+
+class LineSheetWriter:
+    """
+    Appends rows to one file of a line-oriented sink.
+    """
+
+    def __init__(self, sink, stream, encode_row):
+        self._sink = sink
+        self._stream = stream
+        self._encode_row = encode_row
+
+    def append(self, row):
+        """
+        Appends a single row (list or tuple of cell values).
+        """
+        with self._sink._lock:
+            self._encode_row(row)
+
+    def extend(self, rows):
+        """
+        Appends every row of an iterable.
+        """
+        for row in rows:
+            self.append(row)
+
+class LineSink:
+    """
+    Base class of the CSV and NDJSON sinks.
+
+    Args:
+        directory (str): Output directory (created if missing).
+        compress (bool): Gzip-compress each file.
+    """
+
+    extension = None
+
+    def __init__(self, directory, compress=False):
+        self.path = directory
+        self.compress = compress
+        self._files = {}
+        self._retired = set()
+        self._lock = threading.RLock()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _open(self, title):
+        os.makedirs(self.path, exist_ok=True)
+        final_path = os.path.join(self.path, sheet_file_name(title, self.extension, self.compress))
+        tmp_path = f"{final_path}.tmp"
+        if self.compress:
+            stream = gzip.open(tmp_path, "wt", encoding="utf-8", newline="")
+        else:
+            stream = open(tmp_path, "w", encoding="utf-8", newline="")
+        self._files[title] = (stream, tmp_path, final_path)
+        return stream
+
+    def sheet(self, title, headers=None, header_fill=None):
+        """
+        Creates the file of a sheet and returns a writer for it.
+
+        Args:
+            title (str): Sheet name; must not have been opened before on this sink.
+            headers (list[str], optional): Column names. When omitted, the first
+                appended row is taken as the header row.
+            header_fill (str, optional): Ignored; accepted for WorkbookSink compatibility.
+
+        Returns:
+            LineSheetWriter: Writer streaming rows into the file.
+        """
+        with self._lock:
+            if title in self._files:
+                raise ValueError(f"Sheet '{title}' was already written in this run")
+            stream = self._open(title)
+            return LineSheetWriter(self, stream, self._row_encoder(stream, headers))
+
+    def _row_encoder(self, stream, headers):
+        raise NotImplementedError
+
+    def retire(self, titles):
+        """
+        Marks sheets no longer produced; their files from earlier runs are removed on close.
+        """
+        with self._lock:
+            self._retired.update(titles)
+
+    def close(self):
+        """
+        Flushes every file, moves it into place and removes the files of
+        retired sheets. Safe to call more than once.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for stream, tmp_path, final_path in self._files.values():
+                stream.close()
+                os.replace(tmp_path, final_path)
+            for title in self._retired - set(self._files):
+                stale_path = os.path.join(self.path, sheet_file_name(title, self.extension, self.compress))
+                if os.path.exists(stale_path):
+                    os.remove(stale_path)
+                    logging.info(f"Removed {stale_path}: sheet no longer produced")
+
+class CsvSink(LineSink):
+    """
+    Writes each sheet as a CSV file with a header row.
+    """
+
+    extension = "csv"
+
+    def _row_encoder(self, stream, headers):
+        writer = csv.writer(stream)
+        if headers:
+            writer.writerow(headers)
+        return writer.writerow
+
+class NdjsonSink(LineSink):
+    """
+    Writes each sheet as newline-delimited JSON, one object per row keyed by column name.
+    """
+
+    extension = "ndjson"
+
+    def _row_encoder(self, stream, headers):
+        columns = list(headers) if headers else None
+
+        def encode(row):
+            nonlocal columns
+            if columns is None:
+                columns = [str(value) for value in row]
+                return
+            record = {column: _json_value(value) for column, value in zip(columns, row)}
+            stream.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+        return encode
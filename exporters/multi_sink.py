@@ -0,0 +1,102 @@
+"""
+Module: multi_sink.py
+Purpose:
+    Fans every sheet out to several export sinks at once, and builds the
+    run's sink from the configured export formats (xlsx, csv, ndjson) and,
+    when enabled, the SQLite snapshot they are generated from.
+"""
+
+from config import EXPORT_DIR, EXPORT_FORMATS, EXPORT_GZIP, SNAPSHOT_PATH
+
+EXPORT_FORMAT_CHOICES = ("xlsx", "csv", "ndjson")
+
+class MultiSheetWriter:
+    """
+    Appends every row to the matching sheet of each underlying sink.
+    """
+
+    def __init__(self, writers):
+        self._writers = writers
+
+    def append(self, row):
+        for writer in self._writers:
+            writer.append(row)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+class MultiSink:
+    """
+    Sink forwarding sheets and rows to several sinks.
+
+    Args:
+        sinks (list): Sinks exposing sheet() and close(), e.g. WorkbookSink and CsvSink.
+    """
+
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+        self.path = ", ".join(sink.path for sink in self.sinks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def sheet(self, title, headers=None, header_fill=None):
+        return MultiSheetWriter([sink.sheet(title, headers=headers, header_fill=header_fill)
+                                 for sink in self.sinks])
+
+    def retire(self, titles):
+        for sink in self.sinks:
+            sink.retire(titles)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+def create_run_sink(formats=None, directory=None, compress=None, sheet_order=None, snapshot_path=None):
+    """
+    Builds the export sink of a run.
+
+    Args:
+        formats (list[str], optional): Any of "xlsx", "csv", "ndjson"; defaults to VERINT_EXPORT_FORMATS.
+        directory (str, optional): Directory of the CSV / NDJSON files; defaults to VERINT_EXPORT_DIR.
+        compress (bool, optional): Gzip CSV / NDJSON files; defaults to VERINT_EXPORT_GZIP.
+        sheet_order (list[str], optional): Sheet order of the workbook.
+        snapshot_path (str, optional): SQLite snapshot the run writes into, the
+            exports being generated from it on close; defaults to
+            VERINT_SNAPSHOT_PATH, "" writes the exports directly.
+
+    Returns:
+        A SnapshotSink over the exports, or the single configured export sink,
+        or a MultiSink over all of them.
+    """
+    from exporters.line_sinks import CsvSink, NdjsonSink
+    from exporters.workbook_sink import WorkbookSink
+
+    formats = formats or EXPORT_FORMATS
+    directory = directory or EXPORT_DIR
+    compress = EXPORT_GZIP if compress is None else compress
+
+    unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMAT_CHOICES]
+    if unknown:
+        raise ValueError(f"Unknown export formats: {', '.join(unknown)}")
+
+    sinks = []
+    for fmt in dict.fromkeys(formats):
+        if fmt == "xlsx":
+            sinks.append(WorkbookSink(sheet_order=sheet_order))
+        elif fmt == "csv":
+            sinks.append(CsvSink(directory, compress=compress))
+        elif fmt == "ndjson":
+            sinks.append(NdjsonSink(directory, compress=compress))
+    exports = sinks[0] if len(sinks) == 1 else MultiSink(sinks)
+
+    snapshot_path = SNAPSHOT_PATH if snapshot_path is None else snapshot_path
+    if snapshot_path:
+        from exporters.snapshot_sink import SnapshotSink
+
+        return SnapshotSink(snapshot_path, exports=exports, sheet_order=sheet_order)
+    return exports
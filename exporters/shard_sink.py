@@ -0,0 +1,189 @@
+"""
+Module: shard_sink.py
+Purpose:
+    Shard files of a sharded extraction run and their deterministic merge.
+
+    A ShardSink writes the employee-keyed sheets (Employees, Employee Skills,
+    Access Rights) of one shard to <VERINT_SHARD_DIR>/shard-k-of-N/, one NDJSON
+    line [position, row] per row, where position is the employee's index in
+    the base employee list. Each shard writes its rows in list order, so every
+    shard file is already sorted by position and merge_shards rebuilds the
+    canonical order with a streaming k-way heap merge; memory stays bounded by
+    one row per shard.
+"""
+
+import heapq
+import hashlib
+import json
+import logging
+import os
+from operator import itemgetter
+from config import SHARD_DIR
+from exporters.line_sinks import LineSheetWriter, LineSink, sheet_file_name
+
+# Sheets whose rows are keyed by employee (Employee ID in the first column)
+SHARDED_SHEETS = ("Employees", "Employee Skills", "Access Rights")
+
+MANIFEST_FILE = "manifest.json"
+
+def population_digest(employee_ids):
+    """
+    Digest of the ordered base employee list; shards of one run must agree on it.
+    """
+    digest = hashlib.sha256()
+    for employee_id in employee_ids:
+        digest.update(str(employee_id).encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+class DiscardSheetWriter:
+    """
+    Writer of a sheet that is not part of the shard output (e.g. Group Hierarchy).
+    """
+
+    def append(self, row):
+        pass
+
+    def extend(self, rows):
+        pass
+
+class ShardSink(LineSink):
+    """
+    Sink of one shard, with the same interface as WorkbookSink.
+
+    Args:
+        shard (Shard): The shard being extracted.
+        employees (list): Full base employee list of the run (all shards).
+        directory (str, optional): Parent directory of the shard directories
+            (defaults to VERINT_SHARD_DIR).
+    """
+
+    extension = "ndjson"
+
+    def __init__(self, shard, employees, directory=None):
+        super().__init__(os.path.join(directory or SHARD_DIR, shard.name))
+        self.shard = shard
+        employee_ids = [emp.get("id") for emp in employees]
+        self._positions = {str(employee_id): position for position, employee_id in enumerate(employee_ids)}
+        self._digest = population_digest(employee_ids)
+        self._sheets = {}
+
+    def sheet(self, title, headers=None, header_fill=None):
+        """
+        Creates the shard file of an employee-keyed sheet and returns a writer
+        for it; rows of any other sheet are discarded.
+        """
+        if title not in SHARDED_SHEETS:
+            logging.info(f"Sheet '{title}' is not sharded; skipped in {self.shard.name}")
+            return DiscardSheetWriter()
+        with self._lock:
+            if title in self._files:
+                raise ValueError(f"Sheet '{title}' was already written in this run")
+            stream = self._open(title)
+            meta = self._sheets[title] = {"headers": list(headers) if headers else None,
+                                          "header_fill": header_fill, "rows": 0}
+            return LineSheetWriter(self, stream, self._position_encoder(stream, meta))
+
+    def _position_encoder(self, stream, meta):
+        positions = self._positions
+        unknown = len(positions)
+
+        def encode(row):
+            position = positions.get(str(row[0]), unknown)
+            stream.write(json.dumps([position, list(row)], ensure_ascii=False, default=str) + "\n")
+            meta["rows"] += 1
+
+        return encode
+
+    def close(self):
+        """
+        Moves the shard files into place and writes the shard manifest last,
+        so a manifest only exists for a completed shard.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            super().close()
+            manifest = {"index": self.shard.index, "count": self.shard.count,
+                        "population": len(self._positions), "population_digest": self._digest,
+                        "sheets": self._sheets}
+            os.makedirs(self.path, exist_ok=True)
+            tmp_path = os.path.join(self.path, f"{MANIFEST_FILE}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, os.path.join(self.path, MANIFEST_FILE))
+
+def load_manifests(directory=None):
+    """
+    Returns the manifests of the completed shards under a shard directory,
+    ordered by shard number, after checking that they form one complete run.
+
+    Raises:
+        ValueError: If shards are missing, duplicated, or disagree on the shard
+            count or the base employee list.
+    """
+    directory = directory or SHARD_DIR
+    manifests = []
+    for entry in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+        manifest_path = os.path.join(directory, entry, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            manifest["directory"] = os.path.join(directory, entry)
+            manifests.append(manifest)
+    if not manifests:
+        raise ValueError(f"No completed shards found in {directory}")
+
+    counts = {manifest["count"] for manifest in manifests}
+    if len(counts) > 1:
+        raise ValueError(f"Shards of different runs in {directory}: shard counts {sorted(counts)}")
+    if len({manifest["population_digest"] for manifest in manifests}) > 1:
+        raise ValueError(f"Shards in {directory} were extracted from different employee lists")
+    count = counts.pop()
+    indexes = sorted(manifest["index"] for manifest in manifests)
+    missing = sorted(set(range(1, count + 1)) - set(indexes))
+    if missing or len(indexes) != count:
+        raise ValueError(f"Incomplete shard set in {directory}: have {indexes} of {count}, "
+                         f"missing {missing}")
+    return sorted(manifests, key=itemgetter("index"))
+
+def _shard_rows(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+def merge_shards(sink, directory=None, sheet_order=None):
+    """
+    Merges the shard files of a run into a sink, restoring the order of the
+    base employee list.
+
+    Args:
+        sink: Destination sink (e.g. the run's workbook; other sheets of an
+            existing workbook are carried over).
+        directory (str, optional): Shard directory (defaults to VERINT_SHARD_DIR).
+        sheet_order (list[str], optional): Order in which sheets are written.
+
+    Returns:
+        dict: sheet title -> rows written
+    """
+    manifests = load_manifests(directory)
+    titles = list(dict.fromkeys(title for manifest in manifests for title in manifest["sheets"]))
+    if sheet_order:
+        rank = {title: index for index, title in enumerate(sheet_order)}
+        titles.sort(key=lambda title: rank.get(title, len(rank)))
+
+    written = {}
+    for title in titles:
+        shards = [manifest for manifest in manifests if title in manifest["sheets"]]
+        if len(shards) != len(manifests):
+            logging.warning(f"Sheet '{title}' is missing from {len(manifests) - len(shards)} shards")
+        meta = shards[0]["sheets"][title]
+        ws = sink.sheet(title, headers=meta["headers"], header_fill=meta["header_fill"])
+        streams = [_shard_rows(os.path.join(manifest["directory"], sheet_file_name(title, "ndjson")))
+                   for manifest in shards]
+        count = 0
+        for _, row in heapq.merge(*streams, key=itemgetter(0)):
+            ws.append(row)
+            count += 1
+        written[title] = count
+        logging.info(f"Merged {count} rows of '{title}' from {len(shards)} shards")
+    return written
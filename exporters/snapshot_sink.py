@@ -0,0 +1,362 @@
+"""
+Module: snapshot_sink.py
+Purpose:
+    Local SQLite snapshot of the extracted sheets, and the exports generated
+    from it.
+
+    A SnapshotSink has the same interface as WorkbookSink. Every sheet becomes
+    one table named after the sheet ("Access Rights" -> access_rights) with
+    one column per header ("Employee ID" -> employee_id) and a row_id keeping
+    the row order. Rows are buffered and bulk-inserted with executemany into
+    staging tables, and the whole run is a single transaction: when the sink
+    is closed the staging tables replace the previous ones, their indexes are
+    built and the transaction is committed, so an interrupted run leaves the
+    previous snapshot untouched. Tables of sheets a run did not write are
+    kept, so partial runs (e.g. roles only) update the snapshot in place.
+    Only the sheets the pipeline declares are exported: tables of sheets it no
+    longer produces (e.g. "Access Rights" after switching to the normalized
+    access rights mode) stay in the snapshot but are left out of the exports,
+    and their sheets / files from earlier runs are removed.
+
+    Indexes cover the lookups of the migration scripts (employees by
+    organization and username, skills by name, role assignments by employee
+    and role), and the employee_groups table lists group membership one row
+    per employee and group. The configured exports (workbook, CSV, NDJSON) are
+    then written from the snapshot by export_snapshot.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from config import SNAPSHOT_BATCH_SIZE
+from exporters.line_sinks import sheet_slug
+
+# Sheet title -> indexed column groups (by header)
+SNAPSHOT_INDEXES = {
+    "Employees": (("Employee ID",), ("Organization ID",), ("Username",)),
+    "Employee Skills": (("Skill Name", "Employee ID"), ("Employee ID",)),
+    "Access Rights": (("Employee ID",), ("Role Name",)),
+    "Employee Roles": (("Employee ID",), ("Role ID", "Role Variant")),
+    "Access Roles": (("Role ID", "Role Variant"),),
+    "Group Hierarchy": (("Group ID",),),
+    "Organization Hierarchy": (("Organization ID",),),
+    "Roles": (("Role Name",),),
+}
+
+META_TABLE = "snapshot_sheets"
+EMPLOYEE_GROUPS_TABLE = "employee_groups"
+STAGING_SUFFIX = "__staging"
+
+def table_name(title):
+    """
+    Returns the table of a sheet, e.g. "Access Rights" -> "access_rights".
+    """
+    name = sheet_slug(title)
+    if name in (META_TABLE, EMPLOYEE_GROUPS_TABLE) or name[0].isdigit():
+        name = f"sheet_{name}"
+    return name
+
+def column_names(headers):
+    """
+    Returns unique SQL column names for sheet headers, e.g. "Employee ID" -> "employee_id".
+    """
+    names = []
+    for header in headers:
+        base = re.sub(r"[^0-9a-z]+", "_", str(header).lower()).strip("_") or "column"
+        if base[0].isdigit() or base == "row_id":
+            base = f"c_{base}"
+        name, suffix = base, 2
+        while name in names:
+            name, suffix = f"{base}_{suffix}", suffix + 1
+        names.append(name)
+    return names
+
+def _sql_value(value):
+    """
+    Makes a cell value bindable by sqlite3 (numpy scalars become plain Python values).
+    """
+    if value is None or isinstance(value, (str, int, float, bytes)):
+        return value
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+class SnapshotTable:
+    """
+    Load state of one sheet's staging table.
+    """
+
+    def __init__(self, title, headers, header_fill):
+        self.title = title
+        self.name = table_name(title)
+        self.header_fill = header_fill
+        self.headers = None
+        self.columns = None
+        self.insert_sql = None
+        self.buffer = []
+        self.rows = 0
+        # Per column: None (only nulls so far), True (only bools) or False
+        self.bool_columns = None
+        if headers:
+            self.set_headers(headers)
+
+    def set_headers(self, headers):
+        self.headers = [str(header) for header in headers]
+        self.columns = column_names(self.headers)
+        self.bool_columns = [None] * len(self.columns)
+        staging = _quote(self.name + STAGING_SUFFIX)
+        self.insert_sql = (f"INSERT INTO {staging} ({', '.join(_quote(c) for c in self.columns)}) "
+                           f"VALUES ({', '.join('?' * len(self.columns))})")
+
+class SnapshotSheetWriter:
+    """
+    Appends rows to one table of a SnapshotSink.
+    """
+
+    def __init__(self, sink, table):
+        self._sink = sink
+        self._table = table
+
+    def append(self, row):
+        """
+        Appends a single row (list or tuple of cell values).
+        """
+        table = self._table
+        with self._sink._lock:
+            if table.columns is None:
+                # No headers given: the first row is the header row
+                table.set_headers(row)
+                self._sink._create_staging_locked(table)
+                return
+            width = len(table.columns)
+            values = [_sql_value(value) for value in row[:width]]
+            values += [None] * (width - len(values))
+            flags = table.bool_columns
+            for index, value in enumerate(values):
+                if value is not None and flags[index] is not False:
+                    flags[index] = type(value) is bool
+            table.buffer.append(values)
+            if len(table.buffer) >= self._sink.batch_size:
+                self._sink._flush_locked(table)
+
+    def extend(self, rows):
+        """
+        Appends every row of an iterable.
+        """
+        for row in rows:
+            self.append(row)
+
+class SnapshotSink:
+    """
+    SQLite snapshot that extractors stream their sheets into, optionally
+    rendered to the run's exports when closed.
+
+    Args:
+        path (str): SQLite database file (created if missing).
+        exports (optional): Sink the snapshot is exported to on close (e.g. the
+            run's WorkbookSink or MultiSink); closed afterwards.
+        sheet_order (list[str], optional): Sheets exported, in this order
+            (default: every sheet of the snapshot).
+        batch_size (int, optional): Rows buffered per sheet before each bulk
+            insert (defaults to VERINT_SNAPSHOT_BATCH_SIZE).
+    """
+
+    def __init__(self, path, exports=None, sheet_order=None, batch_size=None):
+        self.path = path
+        self.exports = exports
+        self.sheet_order = list(sheet_order or [])
+        self.batch_size = batch_size or SNAPSHOT_BATCH_SIZE
+        self._tables = {}
+        self._lock = threading.RLock()
+        self._closed = False
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # One connection shared by the extractor threads (under the lock) and
+        # one explicit transaction for the whole run
+        self._connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("BEGIN")
+        self._connection.execute(f"CREATE TABLE IF NOT EXISTS {META_TABLE} ("
+                                 "title TEXT PRIMARY KEY, table_name TEXT, headers TEXT, columns TEXT, "
+                                 "header_fill TEXT, bool_columns TEXT, rows INTEGER, updated_at TEXT)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def sheet(self, title, headers=None, header_fill=None):
+        """
+        Creates the staging table of a sheet and returns a writer for it.
+
+        Args:
+            title (str): Sheet name; must not have been opened before on this sink.
+            headers (list[str], optional): Column names. When omitted, the first
+                appended row is taken as the header row.
+            header_fill (str, optional): Header color, kept for the workbook export.
+
+        Returns:
+            SnapshotSheetWriter: Writer bulk-loading rows into the table.
+        """
+        with self._lock:
+            if title in self._tables:
+                raise ValueError(f"Sheet '{title}' was already written in this run")
+            table = self._tables[title] = SnapshotTable(title, headers, header_fill)
+            if table.columns is not None:
+                self._create_staging_locked(table)
+            return SnapshotSheetWriter(self, table)
+
+    def _create_staging_locked(self, table):
+        staging = _quote(table.name + STAGING_SUFFIX)
+        self._connection.execute(f"DROP TABLE IF EXISTS {staging}")
+        self._connection.execute(f"CREATE TABLE {staging} (row_id INTEGER PRIMARY KEY, "
+                                 f"{', '.join(_quote(c) for c in table.columns)})")
+
+    def _flush_locked(self, table):
+        if table.buffer:
+            self._connection.executemany(table.insert_sql, table.buffer)
+            table.rows += len(table.buffer)
+            table.buffer.clear()
+
+    def _publish_locked(self, table):
+        """
+        Replaces the sheet's table with its staging table and builds its indexes.
+        """
+        self._flush_locked(table)
+        name = _quote(table.name)
+        self._connection.execute(f"DROP TABLE IF EXISTS {name}")
+        self._connection.execute(f"ALTER TABLE {_quote(table.name + STAGING_SUFFIX)} RENAME TO {name}")
+        by_header = dict(zip(table.headers, table.columns))
+        for headers in SNAPSHOT_INDEXES.get(table.title, ()):
+            if all(header in by_header for header in headers):
+                columns = [by_header[header] for header in headers]
+                index = _quote(f"idx_{table.name}_{'_'.join(columns)}")
+                self._connection.execute(f"CREATE INDEX {index} ON {name} "
+                                         f"({', '.join(_quote(c) for c in columns)})")
+        bool_columns = [index for index, flag in enumerate(table.bool_columns) if flag]
+        self._connection.execute(
+            f"INSERT OR REPLACE INTO {META_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (table.title, table.name, json.dumps(table.headers), json.dumps(table.columns),
+             table.header_fill, json.dumps(bool_columns), table.rows,
+             datetime.now().isoformat(timespec="seconds")))
+
+    def _build_employee_groups_locked(self, table):
+        """
+        Rebuilds the employee_groups membership table from the Groups column of Employees.
+        """
+        by_header = dict(zip(table.headers, table.columns))
+        if "Employee ID" not in by_header or "Groups" not in by_header:
+            return
+        employee_id, groups = _quote(by_header["Employee ID"]), _quote(by_header["Groups"])
+        self._connection.execute(f"DROP TABLE IF EXISTS {EMPLOYEE_GROUPS_TABLE}")
+        self._connection.execute(f"CREATE TABLE {EMPLOYEE_GROUPS_TABLE} "
+                                 "(employee_id, group_id, group_name)")
+        self._connection.execute(
+            f"INSERT INTO {EMPLOYEE_GROUPS_TABLE} "
+            f"SELECT e.{employee_id}, json_extract(g.value, '$.id'), json_extract(g.value, '$.name') "
+            f"FROM {_quote(table.name)} AS e, json_each(e.{groups}) AS g "
+            f"WHERE json_valid(e.{groups}) ORDER BY e.row_id")
+        self._connection.execute(f"CREATE INDEX idx_{EMPLOYEE_GROUPS_TABLE}_group_id "
+                                 f"ON {EMPLOYEE_GROUPS_TABLE} (group_id)")
+        self._connection.execute(f"CREATE INDEX idx_{EMPLOYEE_GROUPS_TABLE}_employee_id "
+                                 f"ON {EMPLOYEE_GROUPS_TABLE} (employee_id)")
+
+    def close(self):
+        """
+        Publishes the sheets written in this run, commits the snapshot and
+        writes the exports from it. Safe to call more than once.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for table in self._tables.values():
+                if table.columns is None:
+                    continue
+                self._publish_locked(table)
+                if table.title == "Employees":
+                    self._build_employee_groups_locked(table)
+            self._connection.execute("COMMIT")
+            self._connection.close()
+            logging.info(f"Snapshot {self.path} updated: "
+                         + ", ".join(f"{table.name} ({table.rows} rows)" for table in self._tables.values()))
+
+        if self.exports is not None:
+            export_snapshot(self.path, self.exports, sheet_order=self.sheet_order)
+            self.exports.close()
+
+def snapshot_sheets(connection, sheet_order=None):
+    """
+    Returns the sheet metadata rows of a snapshot: those listed in sheet_order,
+    in that order, or every sheet by title when no order is given.
+    """
+    connection.row_factory = sqlite3.Row
+    sheets = list(connection.execute(f"SELECT * FROM {META_TABLE} ORDER BY title"))
+    connection.row_factory = None
+    if sheet_order:
+        rank = {title: index for index, title in enumerate(sheet_order)}
+        sheets = sorted((sheet for sheet in sheets if sheet["title"] in rank), key=lambda sheet: rank[sheet["title"]])
+    return sheets
+
+def read_sheet(connection, sheet):
+    """
+    Yields the rows of a snapshot sheet in their original order, with boolean columns restored.
+    """
+    columns = json.loads(sheet["columns"])
+    bool_columns = json.loads(sheet["bool_columns"])
+    cursor = connection.execute(f"SELECT {', '.join(_quote(c) for c in columns)} "
+                                f"FROM {_quote(sheet['table_name'])} ORDER BY row_id")
+    for row in cursor:
+        if bool_columns:
+            row = list(row)
+            for index in bool_columns:
+                if row[index] is not None:
+                    row[index] = bool(row[index])
+        yield row
+
+def export_snapshot(path, sink, sheet_order=None):
+    """
+    Writes the sheets of a snapshot into a sink (workbook, CSV / NDJSON files).
+
+    Args:
+        path (str): SQLite snapshot file.
+        sink: Destination sink; it is not closed.
+        sheet_order (list[str], optional): Sheets written, in this order; other
+            tables of the snapshot are logged, skipped and retired from the
+            sink's previous output (default: every sheet).
+
+    Returns:
+        dict: sheet title -> rows written
+    """
+    if not os.path.exists(path):
+        raise ValueError(f"No snapshot found at {path}")
+    connection = sqlite3.connect(path)
+    try:
+        written = {}
+        sheets = snapshot_sheets(connection, sheet_order)
+        # Sheets no stage of the pipeline produces any more are not exported
+        leftovers = sorted(set(row[0] for row in connection.execute(f"SELECT title FROM {META_TABLE}"))
+                           - set(sheet["title"] for sheet in sheets))
+        if leftovers:
+            logging.info(f"Snapshot sheets not exported (not produced by the pipeline): {', '.join(leftovers)}")
+            sink.retire(leftovers)
+        for sheet in sheets:
+            ws = sink.sheet(sheet["title"], headers=json.loads(sheet["headers"]),
+                            header_fill=sheet["header_fill"])
+            count = 0
+            for row in read_sheet(connection, sheet):
+                ws.append(row)
+                count += 1
+            written[sheet["title"]] = count
+    finally:
+        connection.close()
+    logging.info(f"Exported {len(written)} sheets from snapshot {path} to {sink.path}")
+    return written
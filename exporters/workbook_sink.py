@@ -0,0 +1,247 @@
+"""
+Module: workbook_sink.py
+Purpose:
+    Streaming Excel output shared by all extractors.
+
+    A single WorkbookSink is opened once per run in openpyxl write-only mode.
+    Each extractor opens its sheet on the sink and streams rows into it; the
+    workbook is serialized exactly once, when the sink is closed. Sheets of an
+    existing workbook that were not rewritten during the run are carried over,
+    so partial runs (e.g. roles only) keep the other sheets. A sheet longer
+    than Excel's row limit continues on "<title> (2)", "<title> (3)", ...
+    worksheets, so no row is lost when xlsx is the only export format.
+"""
+
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from copy import copy
+from config import WORKBOOK_PATH
+
+DEFAULT_WORKBOOK_PATH = WORKBOOK_PATH
+
+# Rows per worksheet supported by Excel (header row included)
+EXCEL_MAX_ROWS = 1048576
+
+# Title of the continuation worksheets of a long sheet, e.g. "Employees (2)"
+CONTINUATION_TITLE = re.compile(r"(.+) \((\d+)\)")
+
+def split_sheet_title(title):
+    """
+    Returns the sheet and part number of a worksheet title, e.g.
+    "Employees (2)" -> ("Employees", 2) and "Employees" -> ("Employees", 1).
+    """
+    match = CONTINUATION_TITLE.fullmatch(title)
+    return (match.group(1), int(match.group(2))) if match else (title, 1)
+
+class SheetWriter:
+    """
+    Appends rows to one sheet of a WorkbookSink. Rows beyond Excel's limit
+    continue on a new worksheet, "<title> (2)" and so on, starting with the
+    header row again.
+    """
+
+    def __init__(self, sink, title, header_row):
+        self._sink = sink
+        self.title = title
+        self._header_row = header_row
+        self.parts = 0
+        self.rows = 0
+        self._worksheet = None
+        self._worksheet_rows = 0
+        self._start_part()
+
+    def _start_part(self):
+        self.parts += 1
+        title = self.title if self.parts == 1 else f"{self.title} ({self.parts})"
+        self._worksheet = self._sink._workbook.create_sheet(title=title)
+        self._worksheet_rows = 0
+        header = self._header_row(self._worksheet)
+        if header:
+            self._worksheet.append(header)
+            self._worksheet_rows = 1
+
+    def append(self, row):
+        """
+        Appends a single row (list or tuple of cell values).
+        """
+        with self._sink._lock:
+            if self._worksheet_rows >= EXCEL_MAX_ROWS:
+                self._start_part()
+                logging.warning(f"Sheet '{self.title}' reached Excel's {EXCEL_MAX_ROWS} row limit; "
+                                f"continuing on '{self._worksheet.title}'")
+            self._worksheet.append(row)
+            self._worksheet_rows += 1
+            self.rows += 1
+
+    def extend(self, rows):
+        """
+        Appends every row of an iterable.
+        """
+        for row in rows:
+            self.append(row)
+
+class WorkbookSink:
+    """
+    Write-only workbook that extractors stream their sheets into.
+
+    Args:
+        path (str): Destination .xlsx file.
+        preserve_existing (bool): Copy sheets from an existing file at `path`
+            that were not written during this run. With a sheet_order, only
+            the listed sheets are copied; sheets no longer produced (e.g. after
+            a change of access rights mode) are dropped.
+        sheet_order (list[str], optional): Order of the listed sheets in the saved
+            workbook, whatever order they were written in; other sheets follow.
+            Continuation worksheets follow the sheet they continue.
+    """
+
+    def __init__(self, path=DEFAULT_WORKBOOK_PATH, preserve_existing=True, sheet_order=None):
+        from openpyxl import Workbook
+
+        self.path = path
+        self.preserve_existing = preserve_existing
+        self.sheet_order = list(sheet_order or [])
+        self._workbook = Workbook(write_only=True)
+        self._sheets = {}
+        self._retired = set()
+        self._lock = threading.RLock()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def sheet(self, title, headers=None, header_fill=None):
+        """
+        Creates a sheet and returns a writer for it.
+
+        Args:
+            title (str): Sheet name; must not have been opened before on this sink.
+            headers (list[str], optional): Header row written first.
+            header_fill (str, optional): RGB fill colour for a bold, centred header row.
+
+        Returns:
+            SheetWriter: Writer streaming rows into the sheet.
+        """
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Alignment
+
+        def header_row(worksheet):
+            # Written at the top of the sheet and of each continuation worksheet
+            if not headers:
+                return None
+            if not header_fill:
+                return list(headers)
+            header_cells = []
+            for header in headers:
+                cell = WriteOnlyCell(worksheet, value=header)
+                cell.fill = PatternFill(start_color=header_fill, end_color=header_fill, fill_type="solid")
+                cell.font = Font(bold=True)
+                cell.alignment = Alignment(horizontal="center")
+                header_cells.append(cell)
+            return header_cells
+
+        with self._lock:
+            if title in self._sheets:
+                raise ValueError(f"Sheet '{title}' was already written in this run")
+            writer = SheetWriter(self, title, header_row)
+            self._sheets[title] = writer
+            return writer
+
+    def _copy_untouched_sheets(self):
+        """
+        Streams sheets of the previous workbook that were not rewritten in this run.
+        """
+        from openpyxl import load_workbook
+        from openpyxl.cell import WriteOnlyCell
+
+        previous = load_workbook(self.path, read_only=True)
+        try:
+            dropped = []
+            for source in previous.worksheets:
+                # Continuation worksheets go with the sheet they continue
+                title, _ = split_sheet_title(source.title)
+                if title in self._sheets:
+                    continue
+                if title in self._retired or (self.sheet_order and title not in self.sheet_order):
+                    dropped.append(source.title)
+                    continue
+                target = self._workbook.create_sheet(title=source.title)
+                for row in source.iter_rows():
+                    cells = []
+                    for cell in row:
+                        out = WriteOnlyCell(target, value=getattr(cell, "value", None))
+                        if getattr(cell, "has_style", False):
+                            out.font = copy(cell.font)
+                            out.fill = copy(cell.fill)
+                            out.alignment = copy(cell.alignment)
+                            out.number_format = cell.number_format
+                        cells.append(out)
+                    target.append(cells)
+            if dropped:
+                logging.info(f"Dropped sheets no longer produced from {self.path}: {', '.join(dropped)}")
+        finally:
+            previous.close()
+
+    def retire(self, titles):
+        """
+        Marks sheets no longer produced; they are not copied from the previous workbook.
+        """
+        with self._lock:
+            self._retired.update(titles)
+
+    def close(self):
+        """
+        Finalizes the workbook and writes it to disk. Safe to call more than once.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            if self.preserve_existing and os.path.exists(self.path):
+                self._copy_untouched_sheets()
+
+            # A workbook needs at least one sheet to be valid
+            if not self._workbook.worksheets:
+                self._workbook.create_sheet(title="Sheet")
+
+            # Sheets written by concurrent extractors are put back in a stable order
+            if self.sheet_order:
+                rank = {title: i for i, title in enumerate(self.sheet_order)}
+
+                def position(ws):
+                    title, part = split_sheet_title(ws.title)
+                    return rank.get(title, len(rank)), part
+
+                titles = [ws.title for ws in sorted(self._workbook.worksheets, key=position)]
+                for index, title in enumerate(titles):
+                    current = self._workbook.sheetnames.index(title)
+                    self._workbook.move_sheet(title, index - current)
+
+            # Save next to the target and swap it in atomically
+            tmp_path = f"{self.path}.tmp"
+            self._workbook.save(tmp_path)
+            os.replace(tmp_path, self.path)
+
+@contextmanager
+def open_sink(sink=None):
+    """
+    Yields the run's shared sink, or a standalone sink for the configured
+    export formats that is saved on successful exit when an extractor is run
+    on its own.
+    """
+    from exporters.multi_sink import create_run_sink
+
+    if sink is not None:
+        yield sink
+        return
+    standalone = create_run_sink()
+    yield standalone
+    standalone.close()
@@ -4,99 +4,378 @@ Purpose:
     Extracts access rights data for each employee from the Verint API,
     including assigned roles, admin flags, default status, owning organization,
     and lists of accessible organizations and groups.
-    Outputs the data into an Excel sheet named 'Access Rights'.
+    Outputs the data into an Excel sheet named 'Access Rights', or in
+    normalized mode into a slim 'Employee Roles' fact sheet plus an
+    'Access Roles' dimension sheet holding each role's scopes once.
 """
 
-import os
 import json
-import pandas as pd
+import logging
 from datetime import datetime
-from verint_client import VerintClient
-
-def extract_access_rights():
-    client = VerintClient()
-
-    # Fetch all employees from Verint
-    emp_response = client.verint_call("wfo/user-mgmt-api/v1/employees")
-    employees = emp_response.get("data", [])
-
-    records = []  # Will store formatted access rights data for all employees
-    
-    for emp in employees:
-        emp_id = emp.get("id")
-        emp_name = emp.get("attributes", {}).get("user", {}).get("username", "")
-
-        try:
-            # Fetch all roles assigned to this employee
-            response = client.verint_call(f"wfo/user-mgmt-api/v1/employees/{emp_id}/roles")
-            roles = response.get("data", [])
-
-            for role in roles:
-                attr = role.get("attributes", {})
-                rel = role.get("relationships", {})
-
-                # Get organization that owns the role
-                org_creator = rel.get("organization", {}).get("data", {})
-                org_creator_name = org_creator.get("meta", {}).get("name", "")
-
-                # Gather accessible organizations under this role
-                accessible_orgs = [
-                    {
-                        "id": o.get("id"),
-                        "name": o.get("meta", {}).get("name")
-                    }
-                    for o in rel.get("organizations", {}).get("data", [])
-                ]
-
-                # Gather accessible groups under this role
-                accessible_groups = [
-                    {
-                        "id": g.get("id"),
-                        "name": g.get("meta", {}).get("name")
-                    }
-                    for g in rel.get("groups", {}).get("data", [])
-                ]
-
-                # Append consolidated access info for this role
-                records.append({
-                    "Employee ID": emp_id,
-                    "Username": emp_name,
-                    "Role Name": attr.get("name"),
-                    "Description": attr.get("description", ""),
-                    "Is Admin Role": attr.get("isAdminRole", False),
-                    "Is Default": attr.get("isDefault", False),
-                    "Owning Org Name": org_creator_name,
-                    "Accessible Orgs": json.dumps(accessible_orgs),
-                    "Accessible Groups": json.dumps(accessible_groups)
-                })
-
-        except Exception as e:
-            print(f"Access rights not found for Employee ID {emp_id} — skipping. Error: {e}")
-
-    # Write results into an Excel workbook under "Access Rights" sheet
-    from openpyxl import Workbook, load_workbook
-    from openpyxl.utils.dataframe import dataframe_to_rows
-
-    df = pd.DataFrame(records)
-    wb_path = "output/verint_full_export.xlsx"
-    os.makedirs("output", exist_ok=True)
-
-    if os.path.exists(wb_path):
-        wb = load_workbook(wb_path)
-    else:
-        wb = Workbook()
-        wb.remove(wb.active)
+from run_context import RunContext
+from progress import ProgressReporter, configure_logging
+from diagnostics import failure
+from exporters.workbook_sink import open_sink
+from checkpoint import CheckpointJournal
+from sharding import shard_state_name
+from config import ACCESS_RIGHTS_MODE
+
+# Column order of the Access Rights sheet; rows are tuples in this order
+ACCESS_RIGHTS_COLUMNS = (
+    "Employee ID",
+    "Username",
+    "Role Name",
+    "Description",
+    "Is Admin Role",
+    "Is Default",
+    "Owning Org Name",
+    "Accessible Orgs",
+    "Accessible Groups",
+)
+
+# Column order of the normalized "Employee Roles" fact sheet (one row per employee-role pair)
+EMPLOYEE_ROLE_COLUMNS = ("Employee ID", "Username", "Role ID", "Role Variant")
+
+# Column order of the normalized "Access Roles" dimension sheet (one row per
+# role and distinct set of attributes / scopes, numbered by Role Variant)
+ACCESS_ROLE_COLUMNS = (
+    "Role ID",
+    "Role Variant",
+    "Role Name",
+    "Description",
+    "Is Admin Role",
+    "Is Default",
+    "Owning Org Name",
+    "Accessible Orgs",
+    "Accessible Groups",
+    "Employee Count",
+)
+
+ACCESS_RIGHTS_MODES = ("flat", "normalized")
+
+class ScopeInterner:
+    """
+    Interns accessible organization / group lists. Each distinct list is
+    serialized once; every role assignment carrying the same list shares the
+    same JSON string instead of re-encoding it.
+    """
+
+    def __init__(self):
+        self._json = {}
+        self.lookups = 0
+
+    def json(self, refs):
+        """
+        Returns the shared JSON string of a list of {"id", "name"} references
+        given as (id, name) pairs.
+        """
+        key = tuple(refs)
+        self.lookups += 1
+        value = self._json.get(key)
+        if value is None:
+            value = self._json[key] = json.dumps([{"id": ref_id, "name": name} for ref_id, name in key])
+        return value
+
+    def __len__(self):
+        return len(self._json)
+
+def _refs(relationship):
+    return ((ref.get("id"), ref.get("meta", {}).get("name")) for ref in relationship.get("data", []))
+
+def parse_roles(response, interner=None):
+    """
+    Converts an employee roles response into role rows.
+
+    Args:
+        response (dict): Parsed response of employees/{id}/roles.
+        interner (ScopeInterner, optional): Shares the JSON of identical
+            accessible org / group lists across calls.
+
+    Returns:
+        list[tuple]: Role rows in ACCESS_ROLE_COLUMNS order, without Role
+        Variant and Employee Count.
+    """
+    if interner is None:
+        interner = ScopeInterner()
+    rows = []
+
+    for role in response.get("data", []):
+        attr = role.get("attributes", {})
+        rel = role.get("relationships", {})
+
+        # Get organization that owns the role
+        org_creator = rel.get("organization", {}).get("data", {})
+        org_creator_name = org_creator.get("meta", {}).get("name", "")
+
+        rows.append((
+            role.get("id") or attr.get("name"),
+            attr.get("name"),
+            attr.get("description", ""),
+            attr.get("isAdminRole", False),
+            attr.get("isDefault", False),
+            org_creator_name,
+            # Accessible organizations and groups under this role
+            interner.json(_refs(rel.get("organizations", {}))),
+            interner.json(_refs(rel.get("groups", {}))),
+        ))
+
+    return rows
+
+def flat_access_rights_rows(emp_id, emp_name, role_rows):
+    """
+    Returns the flat access rights rows (ACCESS_RIGHTS_COLUMNS order) of an
+    employee from its role rows.
+    """
+    return [(emp_id, emp_name) + role_row[1:] for role_row in role_rows]
+
+def parse_employee_roles(emp_id, emp_name, response, interner=None):
+    """
+    Converts an employee roles response into access rights rows, one per role.
+
+    Args:
+        emp_id (str): Employee id.
+        emp_name (str): Employee username.
+        response (dict): Parsed response of employees/{id}/roles.
+        interner (ScopeInterner, optional): Shares the JSON of identical scope lists.
+
+    Returns:
+        list[tuple]: Access rights rows (ACCESS_RIGHTS_COLUMNS order) for the employee.
+    """
+    return flat_access_rights_rows(emp_id, emp_name, parse_roles(response, interner))
+
+def as_access_rights_rows(stored):
+    """
+    Returns journaled access rights rows as tuples in ACCESS_RIGHTS_COLUMNS
+    order. Rows saved as column-keyed dicts by earlier versions are converted.
+    """
+    return [tuple(row.get(column) for column in ACCESS_RIGHTS_COLUMNS) if isinstance(row, dict) else tuple(row)
+            for row in stored]
+
+def access_rights_sheet(out):
+    """
+    Opens the "Access Rights" sheet on a sink, with the ACCESS_RIGHTS_COLUMNS header row.
+    """
+    return out.sheet("Access Rights", headers=list(ACCESS_RIGHTS_COLUMNS))
+
+def employee_roles_sheet(out):
+    """
+    Opens the normalized "Employee Roles" fact sheet on a sink.
+    """
+    return out.sheet("Employee Roles", headers=list(EMPLOYEE_ROLE_COLUMNS))
+
+def access_roles_sheet(out):
+    """
+    Opens the normalized "Access Roles" dimension sheet on a sink.
+    """
+    return out.sheet("Access Roles", headers=list(ACCESS_ROLE_COLUMNS))
 
-    if "Access Rights" in wb.sheetnames:
-        std = wb["Access Rights"]
-        wb.remove(std)
-    ws = wb.create_sheet(title="Access Rights")
+class RoleIndex:
+    """
+    Roles seen across employees, with the inverted index role id -> employee ids.
 
-    for r in dataframe_to_rows(df, index=False, header=True):
-        ws.append(r)
+    A role is normally assigned with the same attributes and scope lists to
+    every employee. When an assignment differs, it becomes a new variant of
+    the role rather than being folded into the first one, so the dimension is
+    keyed by (role id, variant) and holds everything flat mode would export.
+    """
 
-    wb.save(wb_path)
-    print(f"Access rights sheet written to {wb_path}")
+    def __init__(self):
+        self.variants = {}
+        self.counts = {}
+        self.members = {}
+
+    def add(self, emp_id, role_rows):
+        """
+        Records the role rows of one employee.
+
+        Returns:
+            list[int]: Variant number (1-based) of each role row.
+        """
+        numbers = []
+        for role_row in role_rows:
+            role_id = role_row[0]
+            variants = self.variants.get(role_id)
+            if variants is None:
+                variants = self.variants[role_id] = []
+                self.members[role_id] = []
+            # Scope lists are interned, so matching rows usually compare by identity
+            for number, variant in enumerate(variants, 1):
+                if variant == role_row:
+                    break
+            else:
+                variants.append(tuple(role_row))
+                number = len(variants)
+                if number == 2:
+                    logging.warning(f"Role {role_id} is assigned with different attributes or scopes; "
+                                    f"exported as separate Access Roles variants")
+            self.counts[(role_id, number)] = self.counts.get((role_id, number), 0) + 1
+            self.members[role_id].append(emp_id)
+            numbers.append(number)
+        return numbers
+
+    def __len__(self):
+        return len(self.variants)
+
+    def dimension_rows(self):
+        """
+        Yields one Access Roles row per role variant, in order of first appearance.
+        """
+        for role_id, variants in self.variants.items():
+            for number, role_row in enumerate(variants, 1):
+                yield (role_id, number) + role_row[1:] + (self.counts[(role_id, number)],)
+
+class AccessRightsWriter:
+    """
+    Streams the access rights of employees to a sink.
+
+    In "flat" mode every employee-role pair becomes an Access Rights row that
+    repeats the role's attributes and scope lists. In "normalized" mode the
+    pairs go to the slim Employee Roles fact sheet and each role is written
+    once, on close, to the Access Roles dimension sheet with its scopes and
+    employee count; the role -> employees index is kept in `role_employees`.
+    Either way identical scope lists are serialized only once.
+
+    Args:
+        out: Sink to write to.
+        mode (str, optional): "flat" or "normalized"; defaults to VERINT_ACCESS_RIGHTS_MODE.
+    """
+
+    def __init__(self, out, mode=None):
+        self.mode = mode or ACCESS_RIGHTS_MODE
+        if self.mode not in ACCESS_RIGHTS_MODES:
+            raise ValueError(f"Unknown access rights mode: {self.mode}")
+        self.interner = ScopeInterner()
+        self._out = out
+        self._index = RoleIndex() if self.normalized else None
+        self._ws = employee_roles_sheet(out) if self.normalized else access_rights_sheet(out)
+        self.assignments = 0
+
+    @property
+    def normalized(self):
+        return self.mode == "normalized"
+
+    @property
+    def journal_name(self):
+        """
+        Checkpoint journal name; the two modes journal different row shapes.
+        """
+        return "access_roles" if self.normalized else "access_rights"
+
+    @property
+    def role_employees(self):
+        """
+        Inverted index role id -> employee ids (normalized mode), else None.
+        """
+        return self._index.members if self._index is not None else None
+
+    def write(self, emp_id, emp_name, role_rows):
+        """
+        Writes the role rows of one employee.
+
+        Returns:
+            list: Journal entry of the employee (role rows when normalized,
+            flat Access Rights rows otherwise).
+        """
+        self.assignments += len(role_rows)
+        if self.normalized:
+            numbers = self._index.add(emp_id, role_rows)
+            self._ws.extend((emp_id, emp_name, role_row[0], number)
+                            for role_row, number in zip(role_rows, numbers))
+            return role_rows
+        rows = flat_access_rights_rows(emp_id, emp_name, role_rows)
+        self._ws.extend(rows)
+        return rows
+
+    def replay(self, emp_id, emp_name, entry):
+        """
+        Writes a journal entry recorded by write() in an interrupted run.
+        """
+        if self.normalized:
+            role_rows = [tuple(role_row) for role_row in entry]
+            self.assignments += len(role_rows)
+            numbers = self._index.add(emp_id, role_rows)
+            self._ws.extend((emp_id, emp_name, role_row[0], number)
+                            for role_row, number in zip(role_rows, numbers))
+        else:
+            rows = as_access_rights_rows(entry)
+            self.assignments += len(rows)
+            self._ws.extend(rows)
+
+    def close(self):
+        """
+        Writes the Access Roles dimension sheet (normalized mode) and logs totals.
+        """
+        if self.normalized:
+            access_roles_sheet(self._out).extend(self._index.dimension_rows())
+            logging.info(f"Access rights: {self.assignments} role assignments of {len(self._index)} "
+                         f"roles ({len(self._index.counts)} variants), {len(self.interner)} distinct scope lists")
+        else:
+            logging.info(f"Access rights: {self.assignments} role assignments, "
+                         f"{len(self.interner)} distinct scope lists of {self.interner.lookups}")
+
+def extract_access_rights(sink=None, resume=False, context=None, shard=None, mode=None):
+    """
+    Exports the roles of every employee, streaming rows to the sink employee
+    by employee: one Access Rights row per employee-role pair, or in
+    normalized mode Employee Roles / Access Roles sheets (see
+    AccessRightsWriter). Completed employees are appended to a checkpoint
+    journal; with resume=True, employees already in the journal of an
+    interrupted run are skipped and their rows reused. With a shard
+    (sharding.Shard), only the employees of that partition are exported.
+
+    Returns:
+        dict: Role id -> employee ids in normalized mode (also stored as
+        context.role_employees), else None.
+    """
+    context = context or RunContext()
+    client = context.client
+
+    # All employees of the run, shared with the other extractors
+    employees = context.employees()
+    if shard is not None:
+        employees = shard.select(employees)
+    progress = ProgressReporter("access_rights", total=len(employees))
+
+    with open_sink(sink) as out:
+        writer = AccessRightsWriter(out, mode)
+        journal = CheckpointJournal(shard_state_name(writer.journal_name, shard), resume=resume)
+
+        for emp in employees:
+            emp_id = emp.get("id")
+            emp_name = emp.get("attributes", {}).get("user", {}).get("username", "")
+
+            # Already completed before the previous run was interrupted
+            journaled = journal.get(emp_id)
+            if journaled is not None:
+                writer.replay(emp_id, emp_name, journaled)
+                progress.advance()
+                continue
+
+            try:
+                # Fetch all roles assigned to this employee
+                response = client.verint_call(f"wfo/user-mgmt-api/v1/employees/{emp_id}/roles")
+                role_rows = parse_roles(response, writer.interner)
+            except Exception as e:
+                failure("access_rights", "roles", emp_id, e, progress)
+            else:
+                # Sink and journal errors are not fetch failures: they stop the run
+                journal.record(emp_id, writer.write(emp_id, emp_name, role_rows))
+            progress.advance()
+
+        writer.close()
+
+    progress.finish()
+    if sink is None:
+        # Standalone run: open_sink has saved the exports
+        journal.finish()
+    else:
+        # The caller saves the shared sink and then finishes the journal
+        context.defer_journal(journal)
+    if writer.normalized:
+        context.role_employees = writer.role_employees
+    logging.info(f"Access rights sheet written to {out.path}")
+    return writer.role_employees
 
 if __name__ == "__main__":
+    configure_logging()
     extract_access_rights()
\ No newline at end of file
@@ -0,0 +1,264 @@
+"""
+Module: async_extractors.py
+Purpose:
+    Asyncio variants of the per-employee extractors. They reuse the parsing and
+    sheet-writing logic of employee_extractor.py and access_rights_extractor.py,
+    but drive all per-employee API calls through AsyncVerintClient so a single
+    event loop can keep hundreds of requests in flight. The base employee list
+    comes from the (synchronous) RunContext shared with the other extractors.
+
+Usage:
+    asyncio.run(extract_employees_async(employee_groups_map))
+    asyncio.run(extract_access_rights_async())
+"""
+
+import asyncio
+import logging
+from collections import deque
+from async_verint_client import AsyncVerintClient
+from run_context import RunContext
+from progress import ProgressReporter
+from diagnostics import failure
+from exporters.workbook_sink import open_sink
+from extractors.employee_extractor import (
+    PREFERENCE_KEYS,
+    parse_job_title,
+    parse_workspace_assets,
+    parse_data_source_name,
+    parse_person_ref,
+    build_employee_row,
+    employees_sheet,
+    employee_skills_sheet,
+)
+from extractors.normalization import employee_skill_rows, normalize_employee_details
+from config import NORMALIZE_BATCH_SIZE
+from extractors.access_rights_extractor import AccessRightsWriter, parse_roles
+
+async def fetch_job_title(client, employee_id, progress=None):
+    """
+    Job title details for employee.
+    """
+    try:
+        job_res = await client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/jobTitle")
+        return parse_job_title(job_res)
+    except Exception as e:
+        failure("employees", "job_title", employee_id, e, progress)
+        return None
+
+async def fetch_workspace_logins(client, employee_id, progress=None):
+    """
+    Workspace logins per data source: aggregate login names with data source names.
+    Data source lookups are memoized by the client across employees.
+    """
+    workspace_logins = []
+    try:
+        workspace_res = await client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/workspace")
+        for ds_id, login_name in parse_workspace_assets(workspace_res):
+            ds_res = await client.verint_call(f"api/em/v2/datasources/{ds_id}")
+            workspace_logins.append(f"{parse_data_source_name(ds_res, ds_id)} - {login_name}")
+    except Exception as e:
+        failure("employees", "workspace_logins", employee_id, e, progress)
+    return workspace_logins
+
+async def fetch_preferences(client, employee_id, progress=None):
+    """
+    Raw user preferences response (filtered to selected keys), or None if the fetch failed.
+    """
+    try:
+        return await client.verint_call(
+            f"wfo/user-mgmt-api/v1/employees/{employee_id}/preferences?keys={PREFERENCE_KEYS}"
+        )
+    except Exception as e:
+        failure("employees", "preferences", employee_id, e, progress)
+        return None
+
+async def fetch_skills(client, employee_id, progress=None):
+    """
+    Raw skill assignments response, or None if the fetch failed.
+    """
+    try:
+        return await client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/skills")
+    except Exception as e:
+        failure("employees", "skills", employee_id, e, progress)
+        return None
+
+async def fetch_udfs(client, employee_id, progress=None):
+    """
+    Raw user-defined fields (UDFs) response, or None if the fetch failed.
+    """
+    try:
+        return await client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/user-defined-fields")
+    except Exception as e:
+        failure("employees", "udfs", employee_id, e, progress)
+        return None
+
+async def fetch_supervisor(client, employee_id, progress=None):
+    """
+    Supervisor info: fetch and format as JSON object with id and full name.
+    """
+    try:
+        supervisor_res = await client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/supervisor")
+        return parse_person_ref(supervisor_res)
+    except Exception as e:
+        failure("employees", "supervisor", employee_id, e, progress)
+        return None
+
+async def fetch_team_lead(client, employee_id, progress=None):
+    """
+    Team Lead info: fetch and format as JSON object with id and full name.
+    """
+    try:
+        teamlead_res = await client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/teamLead")
+        return parse_person_ref(teamlead_res)
+    except Exception as e:
+        failure("employees", "team_lead", employee_id, e, progress)
+        return None
+
+async def fetch_employee_details(client, employee_id, progress=None):
+    """
+    Fetches all sub-resources of one employee concurrently.
+
+    Returns:
+        dict: Detail name -> parsed sub-resource value (raw payload for
+        preferences, skills and UDFs, which are normalized in batches).
+        Skipped sub-resources are counted as errors on `progress`.
+    """
+    names = ("job_title", "workspace_logins", "preferences", "skills",
+             "udfs", "supervisor", "team_lead")
+    values = await asyncio.gather(
+        fetch_job_title(client, employee_id, progress),
+        fetch_workspace_logins(client, employee_id, progress),
+        fetch_preferences(client, employee_id, progress),
+        fetch_skills(client, employee_id, progress),
+        fetch_udfs(client, employee_id, progress),
+        fetch_supervisor(client, employee_id, progress),
+        fetch_team_lead(client, employee_id, progress),
+    )
+    return dict(zip(names, values))
+
+async def extract_employees_async(employee_groups_map=None, max_concurrency=None, sink=None, context=None,
+                                  skills_table=True, shard=None):
+    """
+    Asyncio variant of extract_employees. Exports enriched employee metadata
+    to the "Employees" sheet, in the order of the base employee list.
+
+    Args:
+        employee_groups_map (dict, optional): Employee id -> list of group references
+            (defaults to the map collected by extract_groups in the run context).
+        max_concurrency (int, optional): Maximum in-flight requests (defaults to config).
+        sink (WorkbookSink, optional): Run's shared workbook (a standalone one if omitted).
+        context (RunContext, optional): Run's shared context (a new one if omitted).
+        skills_table (bool): Also write the long-format "Employee Skills" sheet.
+        shard (Shard, optional): Extract only this partition of the employees.
+    """
+    context = context or RunContext()
+    if employee_groups_map is None:
+        employee_groups_map = context.employee_groups_map
+
+    # Base employee list of the run (fetched once and saved for audit)
+    employees = context.employees()
+    if shard is not None:
+        employees = shard.select(employees)
+    progress = ProgressReporter("employees", total=len(employees))
+
+    with open_sink(sink) as out:
+        ws = employees_sheet(out)
+        skills_ws = employee_skills_sheet(out) if skills_table else None
+        batch = []
+
+        def flush_batch():
+            # Normalize skills, UDFs and preferences of the whole batch together
+            normalize_employee_details([details for _, details in batch])
+            for emp, details in batch:
+                ws.append(build_employee_row(emp, details, employee_groups_map))
+                if skills_ws:
+                    skills_ws.extend(employee_skill_rows(emp.get("id"), details["skills"]))
+            batch.clear()
+
+        async with AsyncVerintClient(max_concurrency=max_concurrency) as client:
+            # Keep a bounded window of employee tasks; drain it in list order
+            window_size = client.max_concurrency
+            pending = deque()
+
+            for emp in employees:
+                task = asyncio.ensure_future(fetch_employee_details(client, emp.get("id"), progress))
+                pending.append((emp, task))
+                if len(pending) >= window_size:
+                    done_emp, done_task = pending.popleft()
+                    batch.append((done_emp, await done_task))
+                    progress.advance()
+                    if len(batch) >= NORMALIZE_BATCH_SIZE:
+                        flush_batch()
+
+            while pending:
+                done_emp, done_task = pending.popleft()
+                batch.append((done_emp, await done_task))
+                progress.advance()
+            flush_batch()
+    progress.finish()
+    logging.info(f"Employee data sheet written to {out.path}")
+
+async def fetch_employee_access_rights(client, emp, interner=None, progress=None):
+    """
+    Fetches the roles of one employee.
+
+    Returns:
+        tuple: (employee id, username, role rows) with no role rows if the fetch failed.
+    """
+    emp_id = emp.get("id")
+    emp_name = emp.get("attributes", {}).get("user", {}).get("username", "")
+    try:
+        response = await client.verint_call(f"wfo/user-mgmt-api/v1/employees/{emp_id}/roles")
+        return emp_id, emp_name, parse_roles(response, interner)
+    except Exception as e:
+        failure("access_rights", "roles", emp_id, e, progress)
+        return emp_id, emp_name, []
+
+async def extract_access_rights_async(max_concurrency=None, sink=None, context=None, shard=None, mode=None):
+    """
+    Asyncio variant of extract_access_rights. Exports the roles of every
+    employee (flat Access Rights rows, or Employee Roles / Access Roles sheets
+    in normalized mode), in the order of the base employee list.
+
+    Args:
+        max_concurrency (int, optional): Maximum in-flight requests (defaults to config).
+        sink (WorkbookSink, optional): Run's shared workbook (a standalone one if omitted).
+        context (RunContext, optional): Run's shared context (a new one if omitted).
+        shard (Shard, optional): Export only this partition of the employees.
+        mode (str, optional): "flat" or "normalized"; defaults to VERINT_ACCESS_RIGHTS_MODE.
+
+    Returns:
+        dict: Role id -> employee ids in normalized mode, else None.
+    """
+    context = context or RunContext()
+
+    # All employees of the run, shared with the other extractors
+    employees = context.employees()
+    if shard is not None:
+        employees = shard.select(employees)
+    progress = ProgressReporter("access_rights", total=len(employees))
+
+    with open_sink(sink) as out:
+        writer = AccessRightsWriter(out, mode)
+
+        async with AsyncVerintClient(max_concurrency=max_concurrency) as client:
+            window_size = client.max_concurrency
+            pending = deque()
+
+            for emp in employees:
+                pending.append(asyncio.ensure_future(
+                    fetch_employee_access_rights(client, emp, writer.interner, progress)))
+                if len(pending) >= window_size:
+                    writer.write(*await pending.popleft())
+                    progress.advance()
+
+            while pending:
+                writer.write(*await pending.popleft())
+                progress.advance()
+
+        writer.close()
+    progress.finish()
+    if writer.normalized:
+        context.role_employees = writer.role_employees
+    logging.info(f"Access rights sheet written to {out.path}")
+    return writer.role_employees
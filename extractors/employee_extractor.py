@@ -8,290 +8,500 @@ Purpose:
 
 import os
 import json
-import pandas as pd
-from datetime import datetime
-from verint_client import VerintClient
-from extractors.group_extractor import extract_groups
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from config import MAX_WORKERS, STATE_DIR, NORMALIZE_BATCH_SIZE
+from fingerprint_store import FingerprintStore, fingerprint
+from sharding import shard_state_name
+from checkpoint import CheckpointJournal
+from run_context import RunContext
+from metrics import get_default_metrics
+from progress import ProgressReporter
+from diagnostics import failure
+from exporters.workbook_sink import open_sink
+from extractors.normalization import (
+    EMPLOYEE_SKILL_COLUMNS,
+    employee_skill_rows,
+    normalize_employee_details,
+    normalize_preferences,
+    normalize_skills,
+    normalize_udfs,
+)
 
 def parse_employee_skills(skill_json):
     """
-    Return a list of active skills for an employee.
+    Return a list of active skills for an employee ("" when there are none).
 
     A skill is considered active if its end_date is either:
     - missing, empty, None, or "null"
     - OR on or after today's UTC date
 
-    The function is tolerant of both snake_case and camelCase keys.
+    The function is tolerant of both snake_case and camelCase keys. Extraction
+    runs normalize whole batches with extractors.normalization instead.
     """
-    today = datetime.utcnow().date()
+    skills, _, _ = normalize_skills([skill_json])
+    return skills[0]
 
-    skill_assignments = skill_json.get("data", [])
-    active_skills: list[dict] = []
-    dropped = 0
+def parse_employee_udfs(udf_json):
+    """
+    Extracts and returns user-defined fields (UDFs) for an employee as a list of name-value pairs.
+    """
+    return normalize_udfs([udf_json])[0]
+
+# Preference keys requested for every employee
+PREFERENCE_KEYS = ",".join([
+    "UserTimezone", "UserLanguage", "UserDefaultPageRows",
+    "UserRegionalFormat", "UserAccessibilityComplianceMode",
+    "UserShowOrgListHierarchical", "UserRepeatHeaderInterval",
+    "UserLoginScreenName"
+])
+
+def parse_job_title(job_res):
+    """
+    Formats an employee jobTitle response as a compact JSON object with id and name.
+    """
+    job_data = job_res.get("data", {})
+    job_id = job_data.get("id")
+    job_name = job_data.get("attributes", {}).get("name")
+    return json.dumps({"id": job_id, "name": job_name}) if job_id and job_name else None
 
-    # Iterate over all skill assignments to filter active ones
-    for item in skill_assignments:
-        attr = item.get("attributes", {}) or {}
-        skill_meta = (
-            item.get("relationships", {})
-                .get("skill", {})
-                .get("data", {})
-                .get("meta", {})
+def parse_workspace_assets(workspace_res):
+    """
+    Returns (dataSourceID, loginName) pairs from an employee workspace response.
+    """
+    assets = workspace_res.get("data", {}).get("attributes", {}).get("assets", [])
+    return [(str(asset.get("dataSourceID")), asset.get("loginName") or "null") for asset in assets]
+
+def parse_data_source_name(ds_res, ds_id):
+    """
+    Returns the display name of a data source, falling back to its id.
+    """
+    return ds_res.get("data", [{}])[0].get("attributes", {}).get("name", ds_id)
+
+def parse_employee_preferences(prefs_res):
+    """
+    Parses preferences into name-value pairs, ignoring null values.
+    """
+    return normalize_preferences([prefs_res])[0]
+
+def parse_person_ref(person_res):
+    """
+    Formats a supervisor / team lead response as a JSON object with id and full name.
+    """
+    ref_data = person_res.get("data", {})
+    ref_attr = ref_data.get("attributes", {})
+    ref_name = f"{ref_attr.get('firstName', '').strip()} {ref_attr.get('lastName', '').strip()}".strip()
+    return json.dumps({"id": ref_data.get("id"), "name": ref_name}) if ref_data.get("id") else None
+
+def note_failure(failures, name, employee_id, error):
+    """
+    Records a skipped sub-resource fetch in the diagnostics log, and in
+    `failures` when the caller tracks them.
+    """
+    failure("employees", name, employee_id, error)
+    if failures is not None:
+        failures.append(name)
+
+def fetch_job_title(client, employee_id, failures=None):
+    """
+    Job title details for employee.
+    """
+    try:
+        job_res = client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/jobTitle")
+        return parse_job_title(job_res)
+    except Exception as e:
+        note_failure(failures, "job_title", employee_id, e)
+        return None
+
+def fetch_workspace_logins(client, employee_id, failures=None):
+    """
+    Workspace logins per data source: aggregate login names with data source names.
+    Data source lookups are memoized by the client across employees and worker threads.
+    """
+    workspace_logins = []
+    try:
+        workspace_res = client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/workspace")
+        for ds_id, login_name in parse_workspace_assets(workspace_res):
+            ds_res = client.verint_call(f"api/em/v2/datasources/{ds_id}")
+            workspace_logins.append(f"{parse_data_source_name(ds_res, ds_id)} - {login_name}")
+    except Exception as e:
+        note_failure(failures, "workspace_logins", employee_id, e)
+    return workspace_logins
+
+def fetch_preferences(client, employee_id, failures=None):
+    """
+    Raw user preferences response (filtered to selected keys), or None if the
+    fetch failed. Normalized in batches by normalize_employee_details.
+    """
+    try:
+        return client.verint_call(
+            f"wfo/user-mgmt-api/v1/employees/{employee_id}/preferences?keys={PREFERENCE_KEYS}"
         )
+    except Exception as e:
+        note_failure(failures, "preferences", employee_id, e)
+        return None
 
-        # Handle snake/camel case for dates
-        end_raw = attr.get("end_date") or attr.get("endDate") or ""
-        start_raw = attr.get("start_date") or attr.get("startDate") or ""
-
-        # Decide if we keep this assignment based on end date
-        keep = False
-        if not end_raw or str(end_raw).lower() == "null":
-            keep = True
-        else:
-            try:
-                end_dt = datetime.strptime(end_raw[:10], "%Y-%m-%d").date()
-                keep = end_dt >= today
-            except Exception:
-                keep = True
-
-        if keep:
-            active_skills.append({
-                "name": skill_meta.get("name", "null"),
-                "proficiency": attr.get("proficiency", "null"),
-                "priority": attr.get("priority", "null"),
-                "start_date": start_raw,
-                "end_date": end_raw,
-                "reserve_level": (
-                    attr.get("reserveLevel")
-                    or attr.get("reserve_level")
-                    or "null"
-                ),
-            })
-        else:
-            dropped += 1
-
-    # Debug summary of skills kept vs dropped
-    if skill_assignments:
-        print(f"    kept {len(active_skills)} / {len(skill_assignments)} skills "
-              f"(dropped {dropped})")
-
-    return active_skills if active_skills else ""
+def fetch_skills(client, employee_id, failures=None):
+    """
+    Raw skill assignments response, or None if the fetch failed. Filtered to
+    active skills in batches by normalize_employee_details.
+    """
+    try:
+        return client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/skills")
+    except Exception as e:
+        note_failure(failures, "skills", employee_id, e)
+        return None
 
-def parse_employee_udfs(udf_json):
+def fetch_udfs(client, employee_id, failures=None):
     """
-    Extracts and returns user-defined fields (UDFs) for an employee as a list of name-value pairs.
+    Raw user-defined fields (UDFs) response, or None if the fetch failed.
+    Normalized in batches by normalize_employee_details.
     """
-    udf_entries = udf_json.get("data", [])
-    parsed_udfs = []
+    try:
+        return client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/user-defined-fields")
+    except Exception as e:
+        note_failure(failures, "udfs", employee_id, e)
+        return None
 
-    # Parse each UDF entry into a simple dict
-    for item in udf_entries:
-        attr = item.get("attributes", {})
-        parsed_udfs.append({
-            "name": attr.get("name", "null"),
-            "value": attr.get("value", "null")
-        })
-    return parsed_udfs if parsed_udfs else ""
+def fetch_supervisor(client, employee_id, failures=None):
+    """
+    Supervisor info: fetch and format as JSON object with id and full name.
+    """
+    try:
+        supervisor_res = client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/supervisor")
+        return parse_person_ref(supervisor_res)
+    except Exception as e:
+        note_failure(failures, "supervisor", employee_id, e)
+        return None
+
+def fetch_team_lead(client, employee_id, failures=None):
+    """
+    Team Lead info: fetch and format as JSON object with id and full name.
+    """
+    try:
+        teamlead_res = client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/teamLead")
+        return parse_person_ref(teamlead_res)
+    except Exception as e:
+        note_failure(failures, "team_lead", employee_id, e)
+        return None
+
+# Column order of the Employees sheet; rows are tuples in this order
+EMPLOYEE_COLUMNS = (
+    "Employee ID",
+    "Username",
+    "User Status",
+    "Employee Number",
+    "Employee Type",
+    "Job Title",
+    "Is Supervisor",
+    "Is Team Lead",
+    "Organization ID",
+    "Organization Name",
+    "First Name",
+    "Middle Initial",
+    "Last Name",
+    "Email",
+    "Desktop Messaging Username",
+    "Supervisor",
+    "Team Lead",
+    "Home Phone",
+    "Work Phone",
+    "Cell Phone",
+    "Start Time",
+    "End Time",
+    "SSN",
+    "Birth Date",
+    "Address Line 1",
+    "Address Line 2",
+    "Address Line 3",
+    "City",
+    "State",
+    "Zip Code",
+    "Country",
+    "Workspace Logins (dataSourceName - loginName)",
+    "Preferences",
+    "User Defined Fields",
+    "Skills",
+    "Groups",
+)
+GROUPS_COLUMN = EMPLOYEE_COLUMNS.index("Groups")
+SKILLS_COLUMN = EMPLOYEE_COLUMNS.index("Skills")
+
+def format_groups(employee_id, employee_groups_map):
+    """
+    Formats the group references of an employee as a JSON list.
+    """
+    return json.dumps(employee_groups_map.get(employee_id, [])) or None
 
-def extract_employees(employee_groups_map):
+def build_employee_row(emp, details, employee_groups_map):
     """
-    Connects to Verint API and exports enriched employee metadata to an Excel sheet.
-    Accepts a prebuilt employee_groups_map to include group info for each employee.
-    """
-    client = VerintClient()
-
-    # Fetch base employee list and save raw data for audit
-    response = client.verint_call("wfo/user-mgmt-api/v1/employees")
-    employees = response.get("data", [])
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    os.makedirs("json_dump", exist_ok=True)
-    with open(f"json_dump/employee_response_{timestamp}.json", "w") as f:
-        json.dump(response, f, indent=4)
-
-    records = []
-    data_source_cache = {}
-    employee_types = set()
-
-    # Process each employee record individually
-    for emp in employees:
-        attr = emp.get("attributes", {}) or {}
-        person = attr.get("person") or {}
-        contact = person.get("contact") or {}
-        address = person.get("address") or {}
-        user = attr.get("user") or {}
-        org_data = emp.get("relationships", {}).get("organization", {}).get("data") or {}
-        org_meta = org_data.get("meta") or {}
-        emp_type = attr.get("employeeType")
-        if emp_type:
-            employee_types.add(emp_type)
-
-        employee_id = emp.get("id")
-        organization_id = attr.get("organizationId")
-
-        # Job title details for employee
-        try:
-            job_res = client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/jobTitle")
-            job_data = job_res.get("data", {})
-            job_id = job_data.get("id")
-            job_name = job_data.get("attributes", {}).get("name")
-            job_title_json = json.dumps({"id": job_id, "name": job_name}) if job_id and job_name else None
-        except Exception as e:
-            print(f"Job title fetch failed for Employee ID {employee_id} — skipping. Error: {e}")
-            job_title_json = None
-
-        # Workspace logins per data source: aggregate login names with data source names
-        workspace_logins = []
-        try:
-            workspace_res = client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/workspace")
-            assets = workspace_res.get("data", {}).get("attributes", {}).get("assets", [])
-            for asset in assets:
-                ds_id = str(asset.get("dataSourceID"))
-                login_name = asset.get("loginName") or "null"
-                if ds_id not in data_source_cache:
-                    ds_res = client.verint_call(f"api/em/v2/datasources/{ds_id}")
-                    ds_name = ds_res.get("data", [{}])[0].get("attributes", {}).get("name", ds_id)
-                    data_source_cache[ds_id] = ds_name
-                workspace_logins.append(f"{data_source_cache[ds_id]} - {login_name}")
-        except Exception as e:
-            print(f"Workspace fetch failed for Employee ID {employee_id} — skipping. Error: {e}")
-
-        # User preferences (filtered to selected keys)
-        pref_keys = ",".join([
-            "UserTimezone", "UserLanguage", "UserDefaultPageRows",
-            "UserRegionalFormat", "UserAccessibilityComplianceMode",
-            "UserShowOrgListHierarchical", "UserRepeatHeaderInterval",
-            "UserLoginScreenName"
-        ])
-
-        parsed_preferences = []
-
-        try:
-            prefs_res = client.verint_call(
-                f"wfo/user-mgmt-api/v1/employees/{employee_id}/preferences?keys={pref_keys}"
-            )
-            # Parse preferences into name-value pairs, ignoring null values
-            for pref in prefs_res.get("data", []):
-                key = pref.get("id")
-                value = pref.get("attributes", {}).get("value")
-                if value is not None and value != "null":
-                    parsed_preferences.append({
-                        "name": key,
-                        "value": value
-                    })
-        except Exception as e:
-            print(f"Preferences not found for Employee ID {employee_id} — skipping. Error: {e}")
-            parsed_preferences = []
-
-        # Skill assignments (active only)
-        try:
-            skills_res = client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/skills")
-            employee_skills = parse_employee_skills(skills_res)
-            total_skills = len(skills_res.get("data", []))
-            kept_skills = len(employee_skills) if employee_skills else 0
-            print(f"Employee {employee_id}: kept {kept_skills} of {total_skills} skills after end‑date filter")
-        except Exception as e:
-            print(f"Skill fetch failed for Employee ID {employee_id} — skipping. Error: {e}")
-            employee_skills = ""
-
-        # User-defined fields (UDFs)
-        try:
-            udf_res = client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/user-defined-fields")
-            employee_udfs = parse_employee_udfs(udf_res)
-        except Exception as e:
-            print(f"UDF fetch failed for Employee ID {employee_id} — skipping. Error: {e}")
-            employee_udfs = ""
-
-        # Build compact JSON for the employee's active skills
-        if employee_skills:
-            skills_json = json.dumps(employee_skills, separators=(",", ":"))
-        else:
-            skills_json = None
-
-        # Supervisor info: fetch and format as JSON object with id and full name
-        supervisor_obj = None
-        try:
-            supervisor_res = client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/supervisor")
-            sup_data = supervisor_res.get("data", {})
-            sup_attr = sup_data.get("attributes", {})
-            sup_name = f"{sup_attr.get('firstName', '').strip()} {sup_attr.get('lastName', '').strip()}".strip()
-            supervisor_obj = json.dumps({"id": sup_data.get("id"), "name": sup_name}) if sup_data.get("id") else None
-        except Exception as e:
-            print(f"Supervisor fetch failed for Employee ID {employee_id} — skipping. Error: {e}")
-
-        # Team Lead info: fetch and format as JSON object with id and full name
-        teamlead_obj = None
-        try:
-            teamlead_res = client.verint_call(f"wfo/user-mgmt-api/v1/employees/{employee_id}/teamLead")
-            tl_data = teamlead_res.get("data", {})
-            tl_attr = tl_data.get("attributes", {})
-            tl_name = f"{tl_attr.get('firstName', '').strip()} {tl_attr.get('lastName', '').strip()}".strip()
-            teamlead_obj = json.dumps({"id": tl_data.get("id"), "name": tl_name}) if tl_data.get("id") else None
-        except Exception as e:
-            print(f"Team lead fetch failed for Employee ID {employee_id} — skipping. Error: {e}")
-
-        # Assemble record with all collected employee metadata
-        record = {
-            "Employee ID": employee_id,
-            "Username": user.get("username"),
-            "User Status": user.get("status"),
-            "Employee Number": attr.get("employeeNumber"),
-            "Employee Type": attr.get("employeeType"),
-            "Job Title": job_title_json,
-            "Is Supervisor": attr.get("isSupervisor"),
-            "Is Team Lead": attr.get("isTeamLead"),
-            "Organization ID": organization_id,
-            "Organization Name": org_meta.get("name"),
-            "First Name": person.get("firstName"),
-            "Middle Initial": person.get("middleInitial"),
-            "Last Name": person.get("lastName"),
-            "Email": contact.get("email"),
-            "Desktop Messaging Username": contact.get("desktopMessagingUsername"),
-            "Supervisor": supervisor_obj,
-            "Team Lead": teamlead_obj,
-            "Home Phone": contact.get("homePhone"),
-            "Work Phone": contact.get("workPhone"),
-            "Cell Phone": contact.get("cellPhone"),
-            "Start Time": attr.get("startTime"),
-            "End Time": attr.get("endTime"),
-            "SSN": person.get("ssn"),
-            "Birth Date": person.get("birthDate"),
-            "Address Line 1": address.get("addressLine1"),
-            "Address Line 2": address.get("addressLine2"),
-            "Address Line 3": address.get("addressLine3"),
-            "City": address.get("city"),
-            "State": address.get("stateName"),
-            "Zip Code": address.get("zipCode"),
-            "Country": address.get("country"),
-            "Workspace Logins (dataSourceName - loginName)": ", ".join(workspace_logins),
-            "Preferences": json.dumps(parsed_preferences) if parsed_preferences else None,
-            "User Defined Fields": json.dumps(employee_udfs) if employee_udfs != "" else None,
-            "Skills": skills_json,
-            "Groups": json.dumps(employee_groups_map.get(employee_id, [])) or None
-        }
-
-        records.append(record)
-
-    # Convert list of employee records to DataFrame for export
-    df = pd.DataFrame(records)
-
-    # Write output to shared workbook
-    from openpyxl import Workbook, load_workbook
-    from openpyxl.utils.dataframe import dataframe_to_rows
-    wb_path = "output/verint_full_export.xlsx"
-    os.makedirs("output", exist_ok=True)
-
-    if os.path.exists(wb_path):
-        wb = load_workbook(wb_path)
+    Assembles the export row for one employee from its base attributes and
+    the enriched sub-resource details (job title, workspace, preferences, skills,
+    UDFs, supervisor and team lead).
+
+    Returns:
+        tuple: Cell values in EMPLOYEE_COLUMNS order.
+    """
+    attr = emp.get("attributes", {}) or {}
+    person = attr.get("person") or {}
+    contact = person.get("contact") or {}
+    address = person.get("address") or {}
+    user = attr.get("user") or {}
+    org_data = emp.get("relationships", {}).get("organization", {}).get("data") or {}
+    org_meta = org_data.get("meta") or {}
+
+    employee_id = emp.get("id")
+    employee_skills = details["skills"]
+    employee_udfs = details["udfs"]
+    parsed_preferences = details["preferences"]
+
+    # Build compact JSON for the employee's active skills
+    if employee_skills:
+        skills_json = json.dumps(employee_skills, separators=(",", ":"))
     else:
-        wb = Workbook()
-        wb.remove(wb.active)
+        skills_json = None
+
+    # Assemble the row with all collected employee metadata, in EMPLOYEE_COLUMNS order
+    return (
+        employee_id,  # Employee ID
+        user.get("username"),  # Username
+        user.get("status"),  # User Status
+        attr.get("employeeNumber"),  # Employee Number
+        attr.get("employeeType"),  # Employee Type
+        details["job_title"],  # Job Title
+        attr.get("isSupervisor"),  # Is Supervisor
+        attr.get("isTeamLead"),  # Is Team Lead
+        attr.get("organizationId"),  # Organization ID
+        org_meta.get("name"),  # Organization Name
+        person.get("firstName"),  # First Name
+        person.get("middleInitial"),  # Middle Initial
+        person.get("lastName"),  # Last Name
+        contact.get("email"),  # Email
+        contact.get("desktopMessagingUsername"),  # Desktop Messaging Username
+        details["supervisor"],  # Supervisor
+        details["team_lead"],  # Team Lead
+        contact.get("homePhone"),  # Home Phone
+        contact.get("workPhone"),  # Work Phone
+        contact.get("cellPhone"),  # Cell Phone
+        attr.get("startTime"),  # Start Time
+        attr.get("endTime"),  # End Time
+        person.get("ssn"),  # SSN
+        person.get("birthDate"),  # Birth Date
+        address.get("addressLine1"),  # Address Line 1
+        address.get("addressLine2"),  # Address Line 2
+        address.get("addressLine3"),  # Address Line 3
+        address.get("city"),  # City
+        address.get("stateName"),  # State
+        address.get("zipCode"),  # Zip Code
+        address.get("country"),  # Country
+        ", ".join(details["workspace_logins"]),  # Workspace Logins (dataSourceName - loginName)
+        json.dumps(parsed_preferences) if parsed_preferences else None,  # Preferences
+        json.dumps(employee_udfs) if employee_udfs != "" else None,  # User Defined Fields
+        skills_json,  # Skills
+        format_groups(employee_id, employee_groups_map),  # Groups
+    )
+
+def submit_employee_details(executor, client, employee_id, failures=None):
+    """
+    Schedules all sub-resource fetches of one employee on the executor.
+    Names of skipped sub-resources are appended to `failures` if given.
+
+    Returns:
+        dict: Detail name -> Future resolving to the parsed sub-resource value.
+    """
+    return {
+        "job_title": executor.submit(fetch_job_title, client, employee_id, failures),
+        "workspace_logins": executor.submit(fetch_workspace_logins, client, employee_id, failures),
+        "preferences": executor.submit(fetch_preferences, client, employee_id, failures),
+        "skills": executor.submit(fetch_skills, client, employee_id, failures),
+        "udfs": executor.submit(fetch_udfs, client, employee_id, failures),
+        "supervisor": executor.submit(fetch_supervisor, client, employee_id, failures),
+        "team_lead": executor.submit(fetch_team_lead, client, employee_id, failures),
+    }
+
+def as_employee_row(stored):
+    """
+    Returns a stored or journaled employee row as a tuple in EMPLOYEE_COLUMNS
+    order. Rows saved as column-keyed dicts by earlier versions are converted.
+    """
+    if isinstance(stored, dict):
+        return tuple(stored.get(column) for column in EMPLOYEE_COLUMNS)
+    return tuple(stored)
+
+def with_groups(row, employee_id, employee_groups_map):
+    """
+    Returns a copy of an employee row with its Groups column refreshed from the map.
+    """
+    return row[:GROUPS_COLUMN] + (format_groups(employee_id, employee_groups_map),) + row[GROUPS_COLUMN + 1:]
 
-    if "Employees" in wb.sheetnames:
-        del wb["Employees"]
-    ws = wb.create_sheet(title="Employees")
+def employees_sheet(out):
+    """
+    Opens the "Employees" sheet on a sink, with the EMPLOYEE_COLUMNS header row.
+    """
+    return out.sheet("Employees", headers=list(EMPLOYEE_COLUMNS))
 
-    for r in dataframe_to_rows(df, index=False, header=True):
-        ws.append(r)
+def employee_skills_sheet(out):
+    """
+    Opens the long-format "Employee Skills" sheet on a sink.
+    """
+    return out.sheet("Employee Skills", headers=list(EMPLOYEE_SKILL_COLUMNS))
 
-    wb.save(wb_path)
-    print(f"Employee data sheet written to {wb_path}")
\ No newline at end of file
+def row_skills(row):
+    """
+    Returns the active skills stored in the Skills column of an employee row.
+    """
+    return json.loads(row[SKILLS_COLUMN]) if row[SKILLS_COLUMN] else []
+
+def extract_employees(employee_groups_map=None, max_workers=None, sink=None, incremental=False,
+                      full_refresh=False, resume=False, context=None, skills_table=True, shard=None):
+    """
+    Connects to Verint API and exports enriched employee metadata to an Excel sheet.
+    Accepts a prebuilt employee_groups_map to include group info for each employee;
+    by default the map collected by extract_groups in the same run context is used.
+
+    Sub-resource calls are issued on a bounded thread pool of max_workers
+    threads, both within an employee and across employees. At most a small
+    window of employees is in flight at a time and records are assembled in
+    the order of the base employee list, so output is deterministic.
+
+    Drained employees are collected into batches of NORMALIZE_BATCH_SIZE whose
+    skills, UDFs and preferences are normalized together. Rows are fixed-schema
+    tuples (EMPLOYEE_COLUMNS) streamed to the sink batch by batch, so memory
+    stays bounded by the window and batch, not the tenant. Active skills are
+    also written one row per assignment to the "Employee Skills" sheet.
+
+    In incremental mode a fingerprint of each employee's base record is stored
+    with the row it produced. On the next run, employees with an unchanged
+    fingerprint reuse their stored row (with refreshed group membership) and
+    only new or changed employees have their sub-resources fetched. Rows with
+    skipped sub-resources are not stored, so they are retried next time.
+
+    Completed rows are also appended to a checkpoint journal as the run goes.
+    With resume=True, employees already in the journal of an interrupted run
+    are skipped and their rows are taken from it.
+
+    With a shard, only the employees hashing to that shard are extracted;
+    checkpoint journal and incremental state are kept per shard.
+
+    Args:
+        employee_groups_map (dict, optional): Employee id -> list of group references.
+        max_workers (int, optional): Worker threads (defaults to config MAX_WORKERS).
+        sink (WorkbookSink, optional): Run's shared workbook (a standalone one if omitted).
+        incremental (bool): Reuse stored rows of unchanged employees.
+        full_refresh (bool): In incremental mode, re-fetch every employee and rebuild the state.
+        resume (bool): Continue from the checkpoint journal of an interrupted run.
+        context (RunContext, optional): Run's shared context (a new one if omitted).
+        skills_table (bool): Also write the long-format "Employee Skills" sheet.
+        shard (Shard, optional): Extract only this partition of the employees.
+    """
+    context = context or RunContext()
+    client = context.client
+    if employee_groups_map is None:
+        employee_groups_map = context.employee_groups_map
+    max_workers = max(1, max_workers or MAX_WORKERS)
+
+    # Base employee list of the run (fetched once and saved for audit)
+    employees = context.employees()
+    if shard is not None:
+        employees = shard.select(employees)
+
+    # Fingerprints and rows of the previous run (incremental mode only)
+    state_name = shard_state_name("employees", shard)
+    store = FingerprintStore(os.path.join(STATE_DIR, f"{state_name}.json")) if incremental else None
+    reused = 0
+
+    # Journal of completed employees for resuming an interrupted run
+    journal = CheckpointJournal(state_name, resume=resume)
+
+    # Drained employees waiting for batch normalization, and skill filter totals
+    batch = []
+    skill_counts = [0, 0]
+
+    def flush_batch():
+        """
+        Normalizes the fetched employees of the batch together, then builds,
+        records and streams the rows of the whole batch in list order.
+        """
+        fetched = [details for _, _, details, failures in batch if failures is not None]
+        with get_default_metrics().timer("transform:normalize_employees"):
+            kept, seen = normalize_employee_details(fetched)
+        skill_counts[0] += kept
+        skill_counts[1] += seen
+
+        for emp, emp_fingerprint, details, failures in batch:
+            employee_id = emp.get("id")
+            if failures is None:
+                # Unchanged or journaled employee: stored row with current group membership
+                row = with_groups(as_employee_row(details), employee_id, employee_groups_map)
+                skills = row_skills(row) if skills_ws else None
+            else:
+                row = build_employee_row(emp, details, employee_groups_map)
+                skills = details["skills"]
+                if not failures:
+                    journal.record(employee_id, row)
+            if store is not None and not failures:
+                store.record(employee_id, emp_fingerprint, row)
+            ws.append(row)
+            if skills_ws:
+                skills_ws.extend(employee_skill_rows(employee_id, skills))
+        batch.clear()
+
+    def drain_one():
+        """
+        Waits for the oldest in-flight employee and queues it for normalization.
+        """
+        emp, emp_fingerprint, details, failures = pending.popleft()
+        if failures is not None:
+            details = {name: future.result() for name, future in details.items()}
+            for name in failures:
+                progress.error(name)
+        progress.advance()
+        batch.append((emp, emp_fingerprint, details, failures))
+        if len(batch) >= NORMALIZE_BATCH_SIZE:
+            flush_batch()
+
+    # Keep a bounded window of employees in flight; drain it in list order
+    # and stream rows to the sink batch by batch
+    window_size = max_workers * 2
+    pending = deque()
+    progress = ProgressReporter("employees", total=len(employees))
+
+    with open_sink(sink) as out, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        ws = employees_sheet(out)
+        skills_ws = employee_skills_sheet(out) if skills_table else None
+        for emp in employees:
+            employee_id = emp.get("id")
+            emp_fingerprint = fingerprint(emp) if store is not None else None
+            stored = journal.get(employee_id)
+            if stored is None and store is not None and not full_refresh:
+                stored = store.lookup(employee_id, emp_fingerprint)
+
+            if stored is not None:
+                reused += 1
+                pending.append((emp, emp_fingerprint, stored, None))
+            else:
+                failures = []
+                details = submit_employee_details(executor, client, employee_id, failures)
+                pending.append((emp, emp_fingerprint, details, failures))
+
+            if len(pending) >= window_size:
+                drain_one()
+
+        while pending:
+            drain_one()
+        flush_batch()
+
+    progress.finish()
+    if sink is None:
+        # Standalone run: open_sink has saved the exports
+        journal.finish()
+    else:
+        # The caller saves the shared sink and then finishes the journal
+        context.defer_journal(journal)
+    logging.info(f"Skills end-date filter: kept {skill_counts[0]} of {skill_counts[1]} fetched assignments")
+    if store is not None:
+        store.save()
+        logging.info(f"Incremental run: reused {reused} of {len(employees)} employees, "
+                     f"fetched {len(employees) - reused}")
+    logging.info(f"Employee data sheet written to {out.path}")
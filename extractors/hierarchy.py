@@ -0,0 +1,37 @@
+"""
+Module: hierarchy.py
+Purpose:
+    Helpers shared by the hierarchical extractors (groups and organizations):
+    building parent/children maps and walking a hierarchy without recursion.
+"""
+
+from collections import defaultdict
+
+# Minimum number of "Level N" columns in hierarchy sheets
+LEVEL_COLUMNS = 10
+
+def walk_hierarchy(roots, children_map):
+    """
+    Iterative pre-order walk of a hierarchy.
+
+    Yields (node_id, level) in the same order as a recursive depth-first walk
+    that visits each node before its children, without being bounded by
+    Python's recursion limit.
+    """
+    stack = [(root_id, 0) for root_id in reversed(roots)]
+    while stack:
+        node_id, level = stack.pop()
+        yield node_id, level
+        for child_id in reversed(children_map.get(node_id, [])):
+            stack.append((child_id, level + 1))
+
+def build_children_map(entities):
+    """
+    Maps each parent id (as a string) to the ids of its children, in list order.
+    """
+    children_map = defaultdict(list)
+    for entity in entities:
+        parent_id = entity["attributes"].get("parentId")
+        if parent_id is not None:
+            children_map[str(parent_id)].append(entity["id"])
+    return children_map
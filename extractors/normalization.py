@@ -0,0 +1,150 @@
+"""
+Module: normalization.py
+Purpose:
+    Batch normalization of employee sub-resource payloads (skills, UDFs and
+    preferences).
+
+    Raw payloads are collected across a batch of employees and processed
+    kind by kind with plain list comprehensions over the whole batch: all
+    skill assignments of the batch are flattened into one list, filtered
+    against today's date by comparing ISO date strings (datetime parsing is
+    only needed for dates that may not exist), and regrouped per employee. The
+    kept skills also feed the long-format "Employee Skills" table, one row per
+    employee-skill assignment.
+"""
+
+import re
+from datetime import datetime
+
+# Column order of the long-format Employee Skills sheet
+EMPLOYEE_SKILL_COLUMNS = ("Employee ID", "Skill Name", "Proficiency", "Priority",
+                          "Start Date", "End Date", "Reserve Level")
+
+ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+def _coalesce(attr, snake, camel):
+    return attr.get(snake) or attr.get(camel)
+
+def _end_date_key(end_raw):
+    """
+    Returns an end date as a comparable "YYYY-MM-DD" string, or None when the
+    assignment has no usable end date (missing, "null" or unparseable) and is
+    therefore kept.
+    """
+    if not end_raw or not isinstance(end_raw, str) or end_raw.lower() == "null":
+        return None
+    head = end_raw[:10]
+    # Dates that exist in every month compare as strings; days 29-31, invalid
+    # dates ("2025-02-30", "2025-13-01") and non-padded dates ("2025-1-31")
+    # go through the parser, so only real dates are filtered on
+    if ISO_DATE.fullmatch(head) and "01" <= head[5:7] <= "12" and "01" <= head[8:10] <= "28":
+        return head
+    try:
+        return datetime.strptime(head, "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        return None
+
+def normalize_skills(payloads, today=None):
+    """
+    Filters the skill assignments of many employees down to active ones.
+
+    An assignment is active when its end date (end_date or endDate) is
+    missing, "null", unparseable, or on or after today's UTC date.
+
+    Args:
+        payloads (list): Raw skills responses, one per employee (None for a failed fetch).
+        today (date, optional): Reference date (defaults to today's UTC date).
+
+    Returns:
+        tuple: (list of per-employee active skill lists, or "" when none,
+                assignments kept, assignments seen)
+    """
+    today_key = (today or datetime.utcnow().date()).isoformat()
+
+    # Flatten every assignment of the batch, remembering its employee
+    owners = []
+    items = []
+    for index, payload in enumerate(payloads):
+        for item in (payload or {}).get("data", []):
+            owners.append(index)
+            items.append(item)
+
+    # Filter the whole batch against today's date
+    end_keys = [_end_date_key(_coalesce(item.get("attributes") or {}, "end_date", "endDate") or "")
+                for item in items]
+    keep = [key is None or key >= today_key for key in end_keys]
+
+    # Regroup kept assignments per employee, in their original order
+    results = [[] for _ in payloads]
+    for index, item, kept in zip(owners, items, keep):
+        if not kept:
+            continue
+        attr = item.get("attributes") or {}
+        skill_meta = item.get("relationships", {}).get("skill", {}).get("data", {}).get("meta", {})
+        results[index].append({
+            "name": skill_meta.get("name", "null"),
+            "proficiency": attr.get("proficiency", "null"),
+            "priority": attr.get("priority", "null"),
+            "start_date": _coalesce(attr, "start_date", "startDate") or "",
+            "end_date": _coalesce(attr, "end_date", "endDate") or "",
+            "reserve_level": attr.get("reserveLevel") or attr.get("reserve_level") or "null",
+        })
+
+    kept_count = sum(keep)
+    return [skills or "" for skills in results], kept_count, len(items)
+
+def normalize_udfs(payloads):
+    """
+    Flattens the user-defined fields of many employees into name-value pairs.
+
+    Returns:
+        list: Per-employee lists of {"name", "value"}, or "" when an employee has none.
+    """
+    return [[{"name": (item.get("attributes") or {}).get("name", "null"),
+              "value": (item.get("attributes") or {}).get("value", "null")}
+             for item in (payload or {}).get("data", [])] or ""
+            for payload in payloads]
+
+def normalize_preferences(payloads):
+    """
+    Flattens the preferences of many employees into name-value pairs,
+    ignoring null values.
+
+    Returns:
+        list: Per-employee lists of {"name", "value"}.
+    """
+    results = []
+    for payload in payloads:
+        parsed = []
+        for pref in (payload or {}).get("data", []):
+            value = (pref.get("attributes") or {}).get("value")
+            if value is not None and value != "null":
+                parsed.append({"name": pref.get("id"), "value": value})
+        results.append(parsed)
+    return results
+
+def normalize_employee_details(batch, today=None):
+    """
+    Replaces the raw skills, UDF and preferences payloads of a batch of
+    employee detail dicts with their normalized values, in place.
+
+    Returns:
+        tuple: (skill assignments kept, skill assignments seen)
+    """
+    skills, kept, seen = normalize_skills([details["skills"] for details in batch], today)
+    udfs = normalize_udfs([details["udfs"] for details in batch])
+    preferences = normalize_preferences([details["preferences"] for details in batch])
+    for details, employee_skills, employee_udfs, employee_preferences in zip(batch, skills, udfs, preferences):
+        details["skills"] = employee_skills
+        details["udfs"] = employee_udfs
+        details["preferences"] = employee_preferences
+    return kept, seen
+
+def employee_skill_rows(employee_id, skills):
+    """
+    Returns the long-format Employee Skills rows (EMPLOYEE_SKILL_COLUMNS order)
+    of one employee's active skills.
+    """
+    return [(employee_id, skill.get("name"), skill.get("proficiency"), skill.get("priority"),
+             skill.get("start_date"), skill.get("end_date"), skill.get("reserve_level"))
+            for skill in skills or []]
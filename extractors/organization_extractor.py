@@ -3,160 +3,236 @@ Module: organization_extractor.py
 Purpose: Extracts hierarchical organization data from the Verint API,
 including directly assigned skills, user-defined fields (UDFs), and job titles,
 then exports it into a structured Excel sheet.
+
+Skills, UDFs and job titles returned for an organization include the ones it
+inherits from its ancestors. In "per_org" mode each organization's collections
+are fetched and filtered down to the items it owns. In "bulk" mode they are
+fetched only at leaf organizations, whose responses already carry every item
+of their ancestor chain, and bucketed by owning organization in one pass.
 """
 
-import os
 import json
-import pandas as pd
-from datetime import datetime
-from collections import defaultdict
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from verint_client import VerintClient
-from openpyxl import load_workbook
-
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from config import MAX_WORKERS, ORG_FETCH_MODE
+from run_context import RunContext
+from progress import ProgressReporter, configure_logging
+from diagnostics import failure
+from extractors.hierarchy import LEVEL_COLUMNS, build_children_map, walk_hierarchy
+from exporters.workbook_sink import open_sink
+
+FETCH_MODES = ("per_org", "bulk")
+
+def parse_skill(sattr):
+    return {
+        "name": sattr.get("name", ""),
+        "media": sattr.get("media", ""),
+        "description": sattr.get("description", ""),
+        "isActive": sattr.get("isActive", False)
+    }
+
+def parse_udf(uattr):
+    return {
+        "name": uattr.get("name", ""),
+        "description": uattr.get("description", ""),
+        "udfType": uattr.get("udfType", ""),
+        "values": uattr.get("values", []) if "values" in uattr else []
+    }
+
+def parse_job_title(jattr):
+    return {
+        "name": jattr.get("name", ""),
+        "description": jattr.get("description", "")
+    }
+
+# Collection key (also the error kind in progress and diagnostics) -> (endpoint suffix, attribute parser)
+ORG_COLLECTIONS = {
+    "skills": ("skills", parse_skill),
+    "udfs": ("user-defined-fields", parse_udf),
+    "jobs": ("jobTitles", parse_job_title),
+}
+
+def owner_id(item):
+    """
+    Returns the id of the organization an item is defined on, as a string.
+    """
+    return str(item.get("relationships", {}).get("organization", {}).get("data", {}).get("id"))
 
-def extract_organizations():
+def fetch_org_items(client, org_id, key):
     """
-    Connects to Verint API to fetch and export organization hierarchy and metadata.
+    Fetches one collection (skills, UDFs or job titles) visible at an organization.
     """
-    client = VerintClient()
-
-    # Call organizations API and save response to disk for traceability
-    org_response = client.verint_call("wfo/user-mgmt-api/v1/organizations")
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    os.makedirs("json_dump", exist_ok=True)
-    with open(f"json_dump/org_response_{timestamp}.json", "w") as f:
-        json.dump(org_response, f, indent=4)
-
-    # Flatten org data and build lookup and children map
-    orgs = org_response.get("data", [])
-    org_by_id = {org["id"]: org for org in orgs}
-    children_map = defaultdict(list)
-    for org in orgs:
-        parent_id = org["attributes"].get("parentId")
-        if parent_id is not None:
-            children_map[str(parent_id)].append(org["id"])
+    suffix = ORG_COLLECTIONS[key][0]
+    response = client.verint_call(f"wfo/user-mgmt-api/v1/organizations/{org_id}/{suffix}")
+    return response.get("data", [])
 
-    rows_hierarchy = []
+def fetch_direct_items(client, org_id, key, progress=None):
+    """
+    Returns the items of one collection assigned directly to an organization.
 
-    def add_org_and_skills(org_id, level):
-        """
-        Recursively appends an organization and its children to the export rows,
-        including its skills, UDFs, and job titles.
-        """
-        org = org_by_id[org_id]
-        attr = org["attributes"]
+    Skills failures propagate; UDF and job title failures are recorded in the
+    diagnostics log (and counted on `progress`) and yield an empty list.
+    """
+    parse = ORG_COLLECTIONS[key][1]
+    try:
+        items = fetch_org_items(client, org_id, key)
+    except Exception as e:
+        if key == "skills":
+            raise
+        failure("organizations", key, org_id, e, progress)
+        return []
+    # Ensure it's directly assigned
+    return [parse(item.get("attributes", {})) for item in items if owner_id(item) == str(org_id)]
+
+def fetch_per_org(client, org_ids, max_workers):
+    """
+    Fetches skills, UDFs and job titles of every organization, one call per
+    organization and collection.
 
-        # Initialize row with name placed at the correct level column
-        row = [''] * 10
-        org_id_str = str(org_id)
-        row[level] = attr.get("name", "")
+    Returns:
+        dict: org id -> {"skills": [...], "udfs": [...], "jobs": [...]}
+    """
+    progress = ProgressReporter("organizations", total=len(org_ids))
 
-        # Capture general metadata
-        description = attr.get("description", "")
-        timezone = attr.get("timeZone", "")
-        week_start = attr.get("weekStartDay", "")
-        seats = attr.get("seatsNumber", "")
-        location = attr.get("location", "")
-
-        # Get skills assigned directly to this org
-        skill_response = client.verint_call(f"wfo/user-mgmt-api/v1/organizations/{org_id}/skills")
-        skills = skill_response.get("data", [])
-        direct_skills = []
-        for skill in skills:
-            org_ref_id = skill.get("relationships", {}).get("organization", {}).get("data", {}).get("id")
-            if str(org_ref_id) == str(org_id):  # Ensure it’s directly assigned
-                sattr = skill.get("attributes", {})
-                direct_skills.append({
-                    "name": sattr.get("name", ""),
-                    "media": sattr.get("media", ""),
-                    "description": sattr.get("description", ""),
-                    "isActive": sattr.get("isActive", False)
-                })
-
-        # Get UDFs assigned directly to this org
-        try:
-            udf_response = client.verint_call(f"wfo/user-mgmt-api/v1/organizations/{org_id}/user-defined-fields")
-            udfs = udf_response.get("data", [])
-            udf_list = []
-            for udf in udfs:
-                org_ref_id = udf.get("relationships", {}).get("organization", {}).get("data", {}).get("id")
-                if str(org_ref_id) == str(org_id):
-                    uattr = udf.get("attributes", {})
-                    udf_list.append({
-                        "name": uattr.get("name", ""),
-                        "description": uattr.get("description", ""),
-                        "udfType": uattr.get("udfType", ""),
-                        "values": uattr.get("values", []) if "values" in uattr else []
-                    })
-        except Exception as e:
-            print(f"UDF fetch failed for Org ID {org_id} — skipping. Error: {e}")
-            udf_list = []
+    def fetch_org(org_id):
+        items = {key: fetch_direct_items(client, org_id, key, progress) for key in ORG_COLLECTIONS}
+        progress.advance()
+        return items
 
-        # Get Job Titles assigned directly to this org
-        try:
-            job_response = client.verint_call(f"wfo/user-mgmt-api/v1/organizations/{org_id}/jobTitles")
-            jobs = job_response.get("data", [])
-            job_list = []
-            for job in jobs:
-                org_ref_id = job.get("relationships", {}).get("organization", {}).get("data", {}).get("id")
-                if str(org_ref_id) == str(org_id):
-                    jattr = job.get("attributes", {})
-                    job_list.append({
-                        "name": jattr.get("name", ""),
-                        "description": jattr.get("description", "")
-                    })
-        except Exception as e:
-            print(f"Job Title fetch failed for Org ID {org_id} — skipping. Error: {e}")
-            job_list = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        items_by_org = dict(zip(org_ids, executor.map(fetch_org, org_ids)))
+    progress.finish()
+    return items_by_org
 
-        row += [description, timezone, week_start, seats, location,
-                json.dumps(direct_skills), json.dumps(udf_list), json.dumps(job_list)]
-        rows_hierarchy.append(row[:10] + [org_id_str] + row[10:])
+def fetch_bulk(client, org_ids, children_map, parent_of, max_workers):
+    """
+    Fetches skills, UDFs and job titles at leaf organizations only and buckets
+    the items by owning organization.
 
-        # Recurse into children
-        for child_id in children_map.get(org_id, []):
-            add_org_and_skills(child_id, level + 1)
+    Every organization is a leaf or an ancestor of one, so the leaf responses
+    together contain every item exactly where per-org fetches would find it.
+    Items repeated across sibling leaves are kept once, in first-seen order.
+    Organizations left uncovered because a leaf fetch failed fall back to
+    per-org fetches.
 
-    # Start hierarchy traversal from root organizations
-    for org in orgs:
-        if org["attributes"].get("parentId") is None:
-            add_org_and_skills(org["id"], 0)
+    Returns:
+        dict: org id -> {"skills": [...], "udfs": [...], "jobs": [...]}
+    """
+    leaves = [org_id for org_id in org_ids if not children_map.get(str(org_id))]
+    tasks = [(leaf_id, key) for leaf_id in leaves for key in ORG_COLLECTIONS]
+    progress = ProgressReporter("organizations (bulk)", total=len(tasks))
 
-    # Create or load Excel workbook
-    wb_path = "output/verint_full_export.xlsx"
-    os.makedirs("output", exist_ok=True)
+    def fetch_leaf(args):
+        leaf_id, key = args
+        try:
+            return fetch_org_items(client, leaf_id, key)
+        except Exception as e:
+            failure("organizations", f"bulk_{key}", leaf_id, e, progress)
+            return None
+        finally:
+            progress.advance()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        responses = list(executor.map(fetch_leaf, tasks))
+    progress.finish()
+
+    items_by_org = {str(org_id): {key: [] for key in ORG_COLLECTIONS} for org_id in org_ids}
+    seen = {key: set() for key in ORG_COLLECTIONS}
+    covered = {key: set() for key in ORG_COLLECTIONS}
+
+    for (leaf_id, key), items in zip(tasks, responses):
+        if items is None:
+            continue
+        parse = ORG_COLLECTIONS[key][1]
+        for item in items:
+            owner = owner_id(item)
+            item_key = (owner, item.get("id") or json.dumps(item, sort_keys=True))
+            if owner in items_by_org and item_key not in seen[key]:
+                seen[key].add(item_key)
+                items_by_org[owner][key].append(parse(item.get("attributes", {})))
+
+        # The leaf and all of its ancestors are now complete for this collection
+        org_id = str(leaf_id)
+        while org_id is not None and org_id not in covered[key]:
+            covered[key].add(org_id)
+            org_id = parent_of.get(org_id)
+
+    # Organizations whose covering leaves all failed are fetched one by one
+    missing = [(str(org_id), key) for org_id in org_ids for key in ORG_COLLECTIONS
+               if str(org_id) not in covered[key]]
+    if missing:
+        logging.warning(f"Falling back to per-org fetches for {len(missing)} organization collections")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            fallback = list(executor.map(lambda task: fetch_direct_items(client, *task, progress), missing))
+        for (org_id, key), items in zip(missing, fallback):
+            items_by_org[org_id][key] = items
+
+    return {org_id: items_by_org[str(org_id)] for org_id in org_ids}
+
+def extract_organizations(sink=None, context=None, max_workers=None, fetch_mode=None):
+    """
+    Connects to Verint API to fetch and export organization hierarchy and metadata.
 
-    if os.path.exists(wb_path):
-        wb = load_workbook(wb_path)
+    Args:
+        sink (WorkbookSink, optional): Workbook of the run.
+        context (RunContext, optional): Shared state of the run.
+        max_workers (int, optional): Concurrent skills/UDF/job title fetches.
+        fetch_mode (str, optional): "per_org" or "bulk"; defaults to VERINT_ORG_FETCH_MODE.
+    """
+    context = context or RunContext()
+    client = context.client
+    max_workers = max(1, max_workers or MAX_WORKERS)
+    fetch_mode = fetch_mode or ORG_FETCH_MODE
+    if fetch_mode not in FETCH_MODES:
+        raise ValueError(f"Unknown organization fetch mode: {fetch_mode}")
+
+    # Organizations collection of the run (fetched once and saved for traceability)
+    orgs = context.organizations()
+
+    # Build lookup and children map
+    org_by_id = context.index("organizations")
+    children_map = build_children_map(orgs)
+
+    # Walk order starting from root organizations
+    roots = [org["id"] for org in orgs if org["attributes"].get("parentId") is None]
+    walk = list(walk_hierarchy(roots, children_map))
+    org_ids = [org_id for org_id, _ in walk]
+
+    if fetch_mode == "bulk":
+        parent_of = {}
+        for org in orgs:
+            parent_id = org["attributes"].get("parentId")
+            parent_of[str(org["id"])] = None if parent_id is None else str(parent_id)
+        items_by_org = fetch_bulk(client, org_ids, children_map, parent_of, max_workers)
     else:
-        wb = Workbook()
-        wb.remove(wb.active)
+        items_by_org = fetch_per_org(client, org_ids, max_workers)
 
-    # Overwrite existing "Organization Hierarchy" sheet if present
-    if "Organization Hierarchy" in wb.sheetnames:
-        std = wb["Organization Hierarchy"]
-        wb.remove(std)
-    ws = wb.create_sheet(title="Organization Hierarchy")
+    rows_hierarchy = []
+    level_columns = max([LEVEL_COLUMNS] + [level + 1 for _, level in walk])
+
+    for org_id, level in walk:
+        attr = org_by_id[org_id]["attributes"]
+        items = items_by_org[org_id]
 
-    headers = [f"Level {i+1}" for i in range(10)] + ["Organization ID"] + [
+        # Initialize row with name placed at the correct level column
+        row = [''] * level_columns
+        row[level] = attr.get("name", "")
+        row += [str(org_id),
+                attr.get("description", ""), attr.get("timeZone", ""), attr.get("weekStartDay", ""),
+                attr.get("seatsNumber", ""), attr.get("location", ""),
+                json.dumps(items["skills"]), json.dumps(items["udfs"]), json.dumps(items["jobs"])]
+        rows_hierarchy.append(row)
+
+    # Stream the Organization Hierarchy sheet into the run's workbook
+    headers = [f"Level {i+1}" for i in range(level_columns)] + ["Organization ID"] + [
         "Description", "TimeZone", "WeekStartDay", "SeatsNumber", "Location",
         "Skills (Direct Only)", "User Defined Fields (Direct Only)", "Job Titles (Direct Only)"
     ]
-    ws.append(headers)
-
-    for col in ws.iter_cols(min_row=1, max_row=1, min_col=1, max_col=len(headers)):
-        for cell in col:
-            cell.fill = PatternFill(start_color="FBE4D5", end_color="FBE4D5", fill_type="solid")
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal="center")
-
-    for row in rows_hierarchy:
-        ws.append(row)
-
-    wb.save(wb_path)
-    print(f"Organization hierarchy sheet written to {wb_path}")
+    with open_sink(sink) as out:
+        ws = out.sheet("Organization Hierarchy", headers=headers, header_fill="FBE4D5")
+        ws.extend(rows_hierarchy)
+    logging.info(f"Organization hierarchy sheet written to {out.path}")
 
 if __name__ == "__main__":
-    extract_organizations()
\ No newline at end of file
+    configure_logging()
+    extract_organizations()
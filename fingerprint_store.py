@@ -0,0 +1,72 @@
+"""
+Module: fingerprint_store.py
+Purpose: Persists per-entity fingerprints and the rows produced from them,
+so incremental runs can skip entities whose source record has not changed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+def fingerprint(record):
+    """
+    Returns a stable SHA-256 fingerprint of a JSON-serializable record.
+    """
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class FingerprintStore:
+    """
+    JSON-file store mapping entity id -> (fingerprint, row).
+
+    The store read at construction time describes the previous run; entries
+    recorded during the current run are kept separately and replace the file
+    on save(), so entities that disappeared from the source are dropped.
+
+    Args:
+        path (str): Location of the state file.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self._previous = {}
+        self._current = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    state = json.load(f)
+                if state.get("version") == self.VERSION:
+                    self._previous = state.get("entries", {})
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable state file {path}: {e}")
+
+    def __len__(self):
+        return len(self._previous)
+
+    def lookup(self, entity_id, entity_fingerprint):
+        """
+        Returns the stored row for an entity if its fingerprint is unchanged, else None.
+        """
+        entry = self._previous.get(str(entity_id))
+        if entry and entry.get("fingerprint") == entity_fingerprint:
+            return entry.get("row")
+        return None
+
+    def record(self, entity_id, entity_fingerprint, row):
+        """
+        Records the row produced for an entity during the current run.
+        """
+        self._current[str(entity_id)] = {"fingerprint": entity_fingerprint, "row": row}
+
+    def save(self):
+        """
+        Atomically replaces the state file with the entries of the current run.
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": self.VERSION, "entries": self._current}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
@@ -50,6 +50,8 @@ class VerintHmac(AuthBase):
     def __init__(self, api_key, secret_key):
         self.api_key = api_key
         self.secret_key = secret_key
+        # Decode the secret once so the signer can be reused across requests
+        self._decoded_secret_key = base64url_decode(secret_key) if secret_key else b''
 
     def __call__(self, request):
         """
@@ -77,11 +79,11 @@ class VerintHmac(AuthBase):
         Generates and adds the HMAC Authorization header to the request.
 
         Args:
-            request (requests.PreparedRequest): The request object.
+            request (requests.PreparedRequest | httpx.Request): The request object.
             timestamp (str): The current UTC timestamp.
         """
         method = request.method
-        url_components = urlsplit(request.url)
+        url_components = urlsplit(str(request.url))
         path = url_components.path
 
         # Generate a cryptographically secure random salt
@@ -109,11 +111,8 @@ class VerintHmac(AuthBase):
         Returns:
             str: base64 URL-encoded HMAC signature.
         """
-        # Decode the base64 URL-safe secret key
-        decoded_secret_key = base64url_decode(self.secret_key)
-
-        # Sign the string using HMAC-SHA256
-        hash = hmac.new(decoded_secret_key, string_to_sign.encode('utf-8'), sha256)
+        # Sign the string using HMAC-SHA256 with the pre-decoded secret key
+        hash = hmac.new(self._decoded_secret_key, string_to_sign.encode('utf-8'), sha256)
 
         # Return the URL-safe base64 encoded signature
         return base64url_encode(hash.digest())
\ No newline at end of file
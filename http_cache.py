@@ -0,0 +1,183 @@
+"""
+Module: http_cache.py
+Purpose: Persistent on-disk cache of Verint GET responses.
+
+Entries are keyed by method and URL. When the server sent an ETag or
+Last-Modified validator, the cached entry is revalidated with a conditional
+request (If-None-Match / If-Modified-Since) and a 304 answer is served from
+disk. Entries without validators are served directly while younger than the
+configured TTL. The cache is bounded in size and evicts least recently used
+entries first.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from config import CACHE_DIR, CACHE_TTL, CACHE_MAX_BYTES
+
+class CacheEntry:
+    """
+    A cached response body with its validators.
+    """
+
+    __slots__ = ("key", "body", "etag", "last_modified", "stored_at")
+
+    def __init__(self, key, body, etag=None, last_modified=None, stored_at=None):
+        self.key = key
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at or time.time()
+
+    @property
+    def has_validators(self):
+        return bool(self.etag or self.last_modified)
+
+class ResponseCache:
+    """
+    Thread-safe, size-bounded response cache stored under a directory.
+
+    Args:
+        directory (str): Cache directory (created if missing).
+        ttl (float): Seconds an entry without validators is served without a request.
+        max_bytes (int): Upper bound on the total size of cached bodies.
+    """
+
+    def __init__(self, directory, ttl=None, max_bytes=None):
+        self.directory = directory
+        self.ttl = CACHE_TTL if ttl is None else ttl
+        self.max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        # Size and last-use index rebuilt from the files on disk
+        self._index = {}
+        for name in os.listdir(directory):
+            if name.endswith(".body"):
+                path = os.path.join(directory, name)
+                stat = os.stat(path)
+                self._index[name[:-5]] = [stat.st_size, stat.st_mtime]
+        self._total_bytes = sum(size for size, _ in self._index.values())
+
+    @staticmethod
+    def make_key(method, url):
+        return hashlib.sha256(f"{method.upper()} {url}".encode("utf-8")).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return f"{base}.body", f"{base}.json"
+
+    def get(self, method, url):
+        """
+        Returns the cached entry for a request, or None.
+        """
+        key = self.make_key(method, url)
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            if key in self._index:
+                self._index[key][1] = time.time()
+        return CacheEntry(key, body, meta.get("etag"), meta.get("last_modified"), meta.get("stored_at"))
+
+    def is_fresh(self, entry):
+        """
+        True if an entry without validators is still within its TTL.
+        """
+        return not entry.has_validators and (time.time() - entry.stored_at) < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry):
+        """
+        Returns If-None-Match / If-Modified-Since headers for revalidating an entry.
+        """
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def _write_meta(self, entry):
+        _, meta_path = self._paths(entry.key)
+        tmp_path = f"{meta_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"etag": entry.etag, "last_modified": entry.last_modified,
+                       "stored_at": entry.stored_at}, f)
+        os.replace(tmp_path, meta_path)
+
+    def touch(self, entry):
+        """
+        Marks an entry as revalidated (e.g. after a 304 response).
+        """
+        entry.stored_at = time.time()
+        self._write_meta(entry)
+
+    def store(self, method, url, body, headers):
+        """
+        Stores a response body with the validators found in its headers.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Full request URL.
+            body (bytes): Raw response body.
+            headers (Mapping): Response headers.
+        """
+        if len(body) > self.max_bytes:
+            return
+        key = self.make_key(method, url)
+        entry = CacheEntry(key, body, headers.get("ETag"), headers.get("Last-Modified"))
+        body_path, _ = self._paths(key)
+        tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, body_path)
+        self._write_meta(entry)
+
+        with self._lock:
+            previous = self._index.get(key)
+            if previous:
+                self._total_bytes -= previous[0]
+            self._index[key] = [len(body), time.time()]
+            self._total_bytes += len(body)
+            self._evict_locked()
+
+    def _evict_locked(self):
+        """
+        Removes least recently used entries until the cache fits in max_bytes.
+        """
+        if self._total_bytes <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            del self._index[key]
+            self._total_bytes -= size
+            if self._total_bytes <= self.max_bytes:
+                break
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_default_response_cache():
+    """
+    Returns the process-wide ResponseCache configured by VERINT_CACHE_DIR,
+    or None when caching is disabled.
+    """
+    global _default_cache
+    if not CACHE_DIR:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache(CACHE_DIR)
+        return _default_cache
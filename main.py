@@ -1,37 +1,319 @@
 """
 Main execution script for Verint Migration Toolkit.
 
-This script sequentially runs all necessary data extractors to retrieve
-and process configuration data from the legacy Verint instance.
+This script runs the data extractors that retrieve and process configuration
+data from the legacy Verint instance. Extractors run as a dependency-aware
+pipeline: each one starts as soon as its inputs are ready, and independent
+extractors run concurrently.
 
 Extractors:
-- Organizations
-- Groups
-- Employees (requires groups for mapping)
-- Roles
-- Access Rights
+- organizations
+- groups
+- employees (requires groups for mapping)
+- roles
+- access_rights
 
 This script is the entry point for orchestrating the Verint data extraction pipeline.
+
+Usage:
+    python main.py                                  # every extractor
+    python main.py roles                            # one extractor
+    python main.py employees access_rights --max-workers 16 --formats xlsx,csv
+    python main.py --list
+    python main.py --shard 3/8                      # employees / access_rights of shard 3 of 8
+    python main.py --merge-shards                   # merge all shards into the exports
+    python main.py --from-snapshot                  # regenerate the exports from the SQLite snapshot
+    python main.py --diff legacy.sqlite target.sqlite   # compare two extractions entity by entity
+
+Extractors the selected ones depend on are added automatically. Output,
+concurrency and cache options override the matching VERINT_* environment
+variables for this run. The toolkit itself (HTTP clients, extractors,
+openpyxl) is only imported after the arguments are parsed, and each extractor
+module only when its stage runs, so --help and targeted runs start quickly.
 """
 
-from extractors.employee_extractor import extract_employees
-from extractors.group_extractor import extract_groups
-from extractors.organization_extractor import extract_organizations
-from extractors.role_extractor import extract_roles
-from extractors.access_rights_extractor import extract_access_rights
+import argparse
+import logging
+import os
 
-if __name__ == "__main__":
-    # Extract all organization units
-    #extract_organizations()
+# Command-line option -> environment variable read by config.py
+ENV_OPTIONS = {
+    "workbook": "VERINT_WORKBOOK_PATH",
+    "formats": "VERINT_EXPORT_FORMATS",
+    "export_dir": "VERINT_EXPORT_DIR",
+    "max_workers": "VERINT_MAX_WORKERS",
+    "rate_limit": "VERINT_RATE_LIMIT_RPS",
+    "cache_dir": "VERINT_CACHE_DIR",
+    "cache_ttl": "VERINT_CACHE_TTL",
+    "org_fetch_mode": "VERINT_ORG_FETCH_MODE",
+    "access_rights_mode": "VERINT_ACCESS_RIGHTS_MODE",
+    "shard_dir": "VERINT_SHARD_DIR",
+    "snapshot": "VERINT_SNAPSHOT_PATH",
+}
+
+def build_parser():
+    """
+    Returns the argument parser of the toolkit's command line.
+    """
+    parser = argparse.ArgumentParser(description="Verint Migration Toolkit")
+    parser.add_argument("extractors", nargs="*", metavar="EXTRACTOR",
+                        help="Extractors to run: organizations, groups, employees, roles, "
+                             "access_rights (default: all)")
+    parser.add_argument("--stages", default=None,
+                        help="Comma-separated extractors to run (same as the positional arguments)")
+    parser.add_argument("--list", action="store_true",
+                        help="List the extractors, their dependencies and sheets, then exit")
+
+    output = parser.add_argument_group("output")
+    output.add_argument("--workbook", default=None,
+                        help="Workbook path (default: output/verint_full_export.xlsx)")
+    output.add_argument("--formats", default=None,
+                        help="Comma-separated export formats: xlsx, csv, ndjson (default: xlsx)")
+    output.add_argument("--export-dir", default=None, help="Directory of the CSV / NDJSON files")
+    output.add_argument("--gzip", action="store_true", help="Gzip-compress CSV / NDJSON files")
+    output.add_argument("--no-archive", action="store_true",
+                        help="Do not archive raw API responses under json_dump/")
+    output.add_argument("--snapshot", default=None,
+                        help="SQLite snapshot the run writes into and the exports are generated from "
+                             "(default: output/verint_snapshot.sqlite)")
+    output.add_argument("--no-snapshot", action="store_true",
+                        help="Write the exports directly, without updating the snapshot")
+    output.add_argument("--from-snapshot", action="store_true",
+                        help="Regenerate the exports from the snapshot without calling the API")
+
+    concurrency = parser.add_argument_group("concurrency")
+    concurrency.add_argument("--max-workers", type=int, default=None,
+                             help="Worker threads for sub-resource fetches")
+    concurrency.add_argument("--max-parallel", type=int, default=None,
+                             help="Maximum number of extractors running concurrently (default: no limit)")
+    concurrency.add_argument("--rate-limit", type=float, default=None,
+                             help="Client-side request rate limit in requests/second (0 = unlimited)")
+
+    cache = parser.add_argument_group("cache")
+    cache.add_argument("--cache-dir", default=None, help="Enable the on-disk GET response cache in this directory")
+    cache.add_argument("--cache-ttl", type=float, default=None,
+                       help="Seconds a cached response is served without revalidation")
+    cache.add_argument("--no-cache", action="store_true", help="Disable the response cache for this run")
+
+    extractors = parser.add_argument_group("extractor options")
+    extractors.add_argument("--resume", action="store_true",
+                            help="Resume employees / access_rights from checkpoint journals of an interrupted run")
+    extractors.add_argument("--incremental", action="store_true",
+                            help="employees: only fetch sub-resources of new or changed employees")
+    extractors.add_argument("--full-refresh", action="store_true",
+                            help="employees: with --incremental, re-fetch everyone and rebuild the state")
+    extractors.add_argument("--no-skills-table", action="store_true",
+                            help="employees: do not write the long-format Employee Skills sheet")
+    extractors.add_argument("--org-fetch-mode", choices=("per_org", "bulk"), default=None,
+                            help="organizations: fetch skills/UDFs/job titles per org or once per leaf org")
+    extractors.add_argument("--access-rights-mode", choices=("flat", "normalized"), default=None,
+                            help="access_rights: one row per employee-role pair (flat) or Employee Roles "
+                                 "plus Access Roles sheets (normalized)")
+
+    sharding = parser.add_argument_group("sharding")
+    sharding.add_argument("--shard", default=None, metavar="K/N",
+                          help="Extract only shard K of N of the employees (employees, access_rights) "
+                               "into the shard directory; uses VERINT_SHARD_<K>_API_KEY_ID/_SECRET if set")
+    sharding.add_argument("--shard-dir", default=None, help="Directory of the shard files (default: shards)")
+    sharding.add_argument("--merge-shards", action="store_true",
+                          help="Merge the shard files of a sharded run into the exports, in canonical order")
+
+    diff = parser.add_argument_group("verification")
+    diff.add_argument("--diff", nargs=2, metavar=("LEFT", "RIGHT"), default=None,
+                      help="Compare two extractions (snapshot .sqlite, .xlsx workbook or CSV / NDJSON "
+                           "export directory) and report added, removed and changed entities; "
+                           "exits with status 1 if they differ")
+    diff.add_argument("--diff-sheets", default=None,
+                      help="Comma-separated sheets to compare (default: Employees, Group Hierarchy, "
+                           "Organization Hierarchy, Access Rights)")
+    diff.add_argument("--diff-key", action="append", default=None, metavar="SHEET=COLUMN[+COLUMN]",
+                      help="Key columns of a sheet, e.g. 'Employees=Username' across tenants (repeatable)")
+    diff.add_argument("--diff-ignore", action="append", default=None, metavar="COLUMN",
+                      help="Column left out of the comparison, e.g. 'Employee ID' (repeatable)")
+    diff.add_argument("--diff-report", default=None,
+                      help="NDJSON report of the differences (default: diffs/diff_<timestamp>.ndjson)")
+
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument("-v", "--verbose", action="store_true",
+                           help="Log every API call and skipped fetch (DEBUG)")
+    verbosity.add_argument("-q", "--quiet", action="store_true",
+                           help="Log warnings and errors only")
+    return parser
+
+def apply_environment(args):
+    """
+    Exports command-line overrides as VERINT_* environment variables. Must
+    run before config.py is imported.
+    """
+    for option, variable in ENV_OPTIONS.items():
+        value = getattr(args, option)
+        if value is not None:
+            os.environ[variable] = str(value)
+    if args.gzip:
+        os.environ["VERINT_EXPORT_GZIP"] = "true"
+    if args.no_archive:
+        os.environ["VERINT_ARCHIVE"] = "false"
+    if args.no_cache:
+        os.environ["VERINT_CACHE_DIR"] = ""
+    if args.no_snapshot:
+        os.environ["VERINT_SNAPSHOT_PATH"] = ""
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.no_cache and args.cache_dir:
+        parser.error("--cache-dir and --no-cache are mutually exclusive")
+    if args.merge_shards and (args.shard or args.extractors or args.stages):
+        parser.error("--merge-shards does not extract; run it without extractors or --shard")
+    if args.no_snapshot and (args.snapshot or args.from_snapshot):
+        parser.error("--no-snapshot cannot be combined with --snapshot or --from-snapshot")
+    if args.from_snapshot and (args.shard or args.merge_shards or args.extractors or args.stages):
+        parser.error("--from-snapshot does not extract; run it without extractors, --shard or --merge-shards")
+    if args.diff and (args.shard or args.merge_shards or args.from_snapshot or args.extractors or args.stages):
+        parser.error("--diff compares existing extractions; run it without extractors or other modes")
+    apply_environment(args)
+
+    # The toolkit reads its configuration on import
+    from progress import configure_logging
+    from config import ACCESS_RIGHTS_MODE
+    from pipeline import SHARDED_STAGES, build_extraction_pipeline
+    from sharding import parse_shard
+
+    configure_logging("DEBUG" if args.verbose else "WARNING" if args.quiet else None)
+
+    if args.diff:
+        from snapshot_diff import diff_extractions, parse_diff_keys
+
+        try:
+            sheets = [name.strip() for name in args.diff_sheets.split(",")] if args.diff_sheets else None
+            summaries, report_path = diff_extractions(*args.diff, sheets=sheets,
+                                                      keys=parse_diff_keys(args.diff_key),
+                                                      ignore=args.diff_ignore or (),
+                                                      report_path=args.diff_report)
+        except ValueError as e:
+            parser.error(str(e))
+        differs = any(summary["status"] == "missing" or summary["added"] or summary["removed"]
+                      or summary["changed"] for summary in summaries)
+        logging.info(f"[diff] {'differences' if differs else 'no differences'} written to {report_path}")
+        return 1 if differs else 0
 
-    # Extract group structure; map is needed for linking employees
-    #employee_groups_map = extract_groups()
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    pipeline = build_extraction_pipeline(resume=args.resume, incremental=args.incremental,
+                                         full_refresh=args.full_refresh,
+                                         skills_table=not args.no_skills_table, shard=shard)
 
-    # Extract employee details using group map
-    #extract_employees(employee_groups_map)
+    if args.list:
+        for stage in pipeline.stages:
+            requires = ", ".join(sorted(pipeline.dependencies(stage.name))) or "-"
+            print(f"{stage.name:<15} requires: {requires:<10} sheets: {', '.join(stage.sheets)}")
+        return
 
-    # Extract roles information
-    extract_roles()
+    stages = list(args.extractors)
+    if args.stages:
+        stages += [name.strip() for name in args.stages.split(",") if name.strip()]
+    unknown = [name for name in stages if name not in pipeline.names()]
+    if unknown:
+        parser.error(f"Unknown extractors: {', '.join(unknown)} (choose from {', '.join(pipeline.names())})")
+    if shard is not None:
+        stages = stages or list(SHARDED_STAGES)
+        unsharded = [name for name in stages if name not in SHARDED_STAGES]
+        if unsharded:
+            parser.error(f"Only {', '.join(SHARDED_STAGES)} can be sharded; run "
+                         f"{', '.join(unsharded)} without --shard")
+        if "access_rights" in stages and ACCESS_RIGHTS_MODE == "normalized":
+            parser.error("--shard needs the flat access rights mode: role dimension rows "
+                         "cannot be split by employee")
 
-    # Extract access rights
-    extract_access_rights()
\ No newline at end of file
+    from diagnostics import get_diagnostics
+    from exporters.multi_sink import create_run_sink
+    from metrics import get_default_metrics
+    from run_context import RunContext
+
+    if args.from_snapshot:
+        from config import SNAPSHOT_PATH
+        from exporters.snapshot_sink import export_snapshot
+
+        # Exports only; the snapshot itself is left as it is
+        sink = create_run_sink(sheet_order=pipeline.sheet_order(), snapshot_path="")
+        try:
+            export_snapshot(SNAPSHOT_PATH, sink, sheet_order=pipeline.sheet_order())
+        except ValueError as e:
+            parser.error(str(e))
+        sink.close()
+        return
+
+    if args.merge_shards:
+        from exporters.shard_sink import merge_shards
+
+        # Shard files are merged into the configured exports; other sheets of
+        # an existing workbook are carried over
+        sink = create_run_sink(sheet_order=pipeline.sheet_order())
+        try:
+            merge_shards(sink, sheet_order=pipeline.sheet_order())
+        except ValueError as e:
+            parser.error(str(e))
+        sink.close()
+        logging.info(f"Shards merged into {sink.path}")
+        return
+
+    if shard is not None:
+        from sharding import shard_credentials
+        from verint_client import VerintClient
+
+        # Each shard may run under its own API key
+        api_key_id, api_key_secret = shard_credentials(shard)
+        context = RunContext(client=VerintClient(api_key_id=api_key_id, api_key_secret=api_key_secret))
+    else:
+        # Base collections are fetched once and shared by every extractor
+        context = RunContext()
+
+    try:
+        if shard is not None:
+            from exporters.shard_sink import ShardSink
+
+            # Rows go to the shard's files, positioned by the full base employee list
+            sink = ShardSink(shard, context.employees())
+            logging.info(f"Shard {shard}: {len(shard.select(context.employees()))} of "
+                         f"{len(context.employees())} employees")
+        else:
+            # One streaming sink for the whole run (workbook and/or CSV / NDJSON
+            # files as configured), finalized once at the end
+            sink = create_run_sink(sheet_order=pipeline.sheet_order())
+
+        pipeline.run(context, sink, names=stages or None, max_parallel=args.max_parallel)
+
+        metrics = get_default_metrics()
+        with metrics.timer("export:close"):
+            sink.close()
+
+        # The rows are saved: checkpoint journals of the run are no longer needed
+        context.finish_journals()
+    finally:
+        # Release the pooled connections and the response archive files
+        context.client.close()
+
+    # Per-endpoint latency / throughput / error summary of the run
+    for line in metrics.report_lines():
+        logging.info(f"[metrics] {line}")
+    json_path, prom_path = metrics.write()
+    logging.info(f"[metrics] written to {json_path} and {prom_path}")
+
+    # Repeated lookups answered by the client's in-memory memo
+    memo = context.client.memo.stats()
+    if memo["hits"] or memo["shared"]:
+        logging.info(f"[memo] {memo['misses']} requests, {memo['hits']} served from memory, "
+                     f"{memo['shared']} shared in flight, {memo['evictions']} evicted")
+
+    # Per-entity details (skipped fetches, retries) of the run
+    diagnostics = get_diagnostics()
+    if diagnostics.events:
+        diagnostics.flush()
+        logging.info(f"[diagnostics] {diagnostics.events} events written to {diagnostics.path}")
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,201 @@
+"""
+Module: memo_cache.py
+Purpose: In-memory memoization and request coalescing of Verint GET calls.
+
+Lookups that many entities share, such as the data source behind every
+workspace login, are answered once per run. Each configured endpoint pattern
+gets its own bounded LRU of parsed responses, and concurrent identical GETs
+are coalesced ("single flight"): the first caller performs the request and
+every caller arriving while it is in flight waits for and shares its result.
+Failures are passed to the waiting callers but never memoized, so the next
+call retries.
+
+Patterns are matched against endpoint templates (see metrics.endpoint_template),
+with shell-style wildcards, e.g. "api/em/v2/datasources/{id}" or
+"wfo/user-mgmt-api/v1/organizations/{id}/*". Memoized responses are shared
+between callers and must be treated as read-only.
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from config import MEMO_ENDPOINTS
+from metrics import endpoint_template
+
+def parse_memo_rules(spec):
+    """
+    Parses a memoization spec "pattern=max_entries,pattern=max_entries".
+
+    Returns:
+        list[tuple[str, int]]: (endpoint template pattern, LRU size) pairs.
+
+    Raises:
+        ValueError: If an entry is malformed.
+    """
+    rules = []
+    for entry in (spec or "").split(","):
+        if not entry.strip():
+            continue
+        pattern, _, size = entry.strip().rpartition("=")
+        size = size.strip()
+        if not pattern.strip() or not size.isdigit() or int(size) < 1:
+            raise ValueError(f"Invalid memoization rule '{entry.strip()}': expected pattern=max_entries")
+        rules.append((pattern.strip().strip("/"), int(size)))
+    return rules
+
+class _Flight:
+    """
+    A request in flight and its outcome, shared by the callers waiting for it.
+    """
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self, done):
+        self.done = done
+        self.value = None
+        self.error = None
+
+class ResponseMemo:
+    """
+    Thread-safe single-flight LRU memo of parsed GET responses, per endpoint pattern.
+
+    Args:
+        rules (list[tuple[str, int]], optional): (pattern, max entries) pairs;
+            defaults to VERINT_MEMO_ENDPOINTS. The first matching pattern applies.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = parse_memo_rules(MEMO_ENDPOINTS) if rules is None else list(rules)
+        self.hits = 0
+        self.shared = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = [OrderedDict() for _ in self.rules]
+        self._flights = {}
+        self._async_flights = {}
+        self._lock = threading.Lock()
+
+    def rule_for(self, method, endpoint):
+        """
+        Returns the index of the rule memoizing a call, or None if the call is not memoized.
+        """
+        if method.upper() != "GET" or not self.rules:
+            return None
+        template = endpoint_template(endpoint)
+        for index, (pattern, _) in enumerate(self.rules):
+            if fnmatchcase(template, pattern):
+                return index
+        return None
+
+    def _lookup_locked(self, rule, key):
+        entries = self._entries[rule]
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return True, entries[key]
+        return False, None
+
+    def _store_locked(self, rule, key, value):
+        entries = self._entries[rule]
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.rules[rule][1]:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def call(self, rule, endpoint, fetch):
+        """
+        Returns the memoized response of an endpoint, waits for an identical
+        request in flight, or performs the request with fetch().
+
+        Args:
+            rule (int): Rule index returned by rule_for.
+            endpoint (str): Endpoint relative to the base URL (the memo key).
+            fetch (callable): Performs the request and returns the parsed response.
+
+        Returns:
+            tuple: (response, source) where source is "memo" (served from
+            memory), "shared" (result of a concurrent identical request) or
+            None (fetched by this call).
+        """
+        key = endpoint.strip("/")
+        with self._lock:
+            found, value = self._lookup_locked(rule, key)
+            if found:
+                return value, "memo"
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight(threading.Event())
+                self.misses += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, "shared"
+
+        try:
+            flight.value = fetch()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None:
+                    self._store_locked(rule, key, flight.value)
+                del self._flights[key]
+            flight.done.set()
+        return flight.value, None
+
+    async def call_async(self, rule, endpoint, fetch):
+        """
+        Asyncio counterpart of call(); fetch is a coroutine function. Requests
+        are coalesced between tasks of the running event loop.
+        """
+        key = endpoint.strip("/")
+        with self._lock:
+            found, value = self._lookup_locked(rule, key)
+            if found:
+                return value, "memo"
+            flight = self._async_flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._async_flights[key] = _Flight(asyncio.Event())
+                self.misses += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            await flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, "shared"
+
+        try:
+            flight.value = await fetch()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None:
+                    self._store_locked(rule, key, flight.value)
+                del self._async_flights[key]
+            flight.done.set()
+        return flight.value, None
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(entries) for entries in self._entries)
+
+    def stats(self):
+        """
+        Returns the hit / shared / miss / eviction counters and memoized entry count.
+        """
+        with self._lock:
+            return {"hits": self.hits, "shared": self.shared, "misses": self.misses,
+                    "evictions": self.evictions, "entries": sum(len(entries) for entries in self._entries)}
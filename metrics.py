@@ -0,0 +1,314 @@
+"""
+Module: metrics.py
+Purpose: Per-endpoint request metrics and stage timings for extraction runs.
+
+Every API call is recorded under its endpoint template, the endpoint with
+ids replaced by placeholders (employees/100123/skills ->
+employees/{id}/skills). For each template the registry keeps call counts
+per status, retries, response bytes and a latency histogram from which
+p50 / p95 / p99 are estimated. Named timers measure pipeline stages,
+transforms and the final export. At the end of a run the registry is
+written as a JSON summary and as a Prometheus textfile (for the
+node_exporter textfile collector).
+"""
+
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from config import METRICS_DIR
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75,
+                   1.0, 1.5, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Statuses of calls answered without a request (on-disk cache, in-memory
+# memo, or an identical request in flight)
+LOCAL_STATUSES = ("cache", "memo", "shared")
+
+# Path segments that contain digits but are not ids ("v1", "v2", ...)
+VERSION_SEGMENT = re.compile(r"v\d+")
+
+def endpoint_template(endpoint):
+    """
+    Returns the endpoint with its query string dropped and id segments (any
+    segment containing a digit, except API versions) replaced by {id}, e.g.
+    "wfo/user-mgmt-api/v1/employees/42/skills" -> "wfo/user-mgmt-api/v1/employees/{id}/skills".
+    """
+    path = endpoint.split("?", 1)[0].strip("/")
+    return "/".join("{id}" if any(c.isdigit() for c in segment) and not VERSION_SEGMENT.fullmatch(segment)
+                    else segment for segment in path.split("/"))
+
+class Histogram:
+    """
+    Fixed-bucket histogram with quantile estimates.
+    """
+
+    __slots__ = ("bounds", "counts", "total", "count", "max")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """
+        Estimates a quantile by linear interpolation inside its bucket.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / bucket_count, self.max)
+            seen += bucket_count
+        return self.max
+
+class EndpointStats:
+    """
+    Counters of one endpoint template.
+    """
+
+    __slots__ = ("calls", "local", "retries", "bytes", "statuses", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.local = 0
+        self.retries = 0
+        self.bytes = 0
+        self.statuses = {}
+        self.latency = Histogram()
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of request metrics and named timers of one run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._timers = {}
+        self.started_at = time.time()
+
+    def _stats_locked(self, method, endpoint):
+        key = (method.upper(), endpoint_template(endpoint))
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = EndpointStats()
+        return stats
+
+    def observe_request(self, method, endpoint, status, seconds, nbytes=0):
+        """
+        Records one HTTP attempt of an endpoint.
+
+        Args:
+            method (str): HTTP method.
+            endpoint (str): Endpoint relative to the base URL.
+            status (int | str): HTTP status, or "error" for a connection failure.
+            seconds (float): Attempt latency.
+            nbytes (int): Response body size.
+        """
+        with self._lock:
+            stats = self._stats_locked(method, endpoint)
+            stats.calls += 1
+            stats.bytes += nbytes
+            stats.statuses[str(status)] = stats.statuses.get(str(status), 0) + 1
+            stats.latency.observe(seconds)
+
+    def observe_local(self, method, endpoint, source):
+        """
+        Records a call answered without an HTTP attempt. It is counted under its
+        own status but kept out of the call count and latency histogram, which
+        describe requests actually sent.
+
+        Args:
+            method (str): HTTP method.
+            endpoint (str): Endpoint relative to the base URL.
+            source (str): "cache" for a fresh on-disk cache hit, "memo" for the
+                in-memory memo, or "shared" for the result of an identical
+                request in flight.
+        """
+        with self._lock:
+            stats = self._stats_locked(method, endpoint)
+            stats.local += 1
+            stats.statuses[source] = stats.statuses.get(source, 0) + 1
+
+    def observe_retry(self, method, endpoint):
+        """
+        Records that an attempt of an endpoint is being retried.
+        """
+        with self._lock:
+            self._stats_locked(method, endpoint).retries += 1
+
+    def add_time(self, name, seconds):
+        """
+        Adds a measured duration to a named timer.
+        """
+        with self._lock:
+            timer = self._timers.setdefault(name, {"count": 0, "seconds": 0.0, "max": 0.0})
+            timer["count"] += 1
+            timer["seconds"] += seconds
+            timer["max"] = max(timer["max"], seconds)
+
+    @contextmanager
+    def timer(self, name):
+        """
+        Times the enclosed block under a named timer, e.g. "stage:employees".
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def summary(self):
+        """
+        Returns the metrics of the run as a JSON-serializable dict.
+        """
+        with self._lock:
+            endpoints = []
+            for (method, template), stats in sorted(self._endpoints.items(),
+                                                    key=lambda item: -item[1].latency.total):
+                latency = stats.latency
+                endpoints.append({
+                    "method": method,
+                    "endpoint": template,
+                    "calls": stats.calls,
+                    "local": stats.local,
+                    "retries": stats.retries,
+                    "bytes": stats.bytes,
+                    "statuses": dict(stats.statuses),
+                    "latency_seconds": {
+                        "total": round(latency.total, 3),
+                        "mean": round(latency.total / latency.count, 4) if latency.count else None,
+                        "p50": _round(latency.quantile(0.50)),
+                        "p95": _round(latency.quantile(0.95)),
+                        "p99": _round(latency.quantile(0.99)),
+                        "max": round(latency.max, 4),
+                    },
+                })
+            timers = {name: {"count": timer["count"], "seconds": round(timer["seconds"], 3),
+                             "max": round(timer["max"], 3)}
+                      for name, timer in self._timers.items()}
+        return {"started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="seconds"),
+                "elapsed_seconds": round(time.time() - self.started_at, 3),
+                "endpoints": endpoints, "timers": timers}
+
+    def prometheus_text(self):
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        lines = [
+            "# HELP verint_api_requests_total Verint API requests by endpoint template and status.",
+            "# TYPE verint_api_requests_total counter",
+        ]
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            timers = sorted(self._timers.items())
+            for (method, template), stats in endpoints:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(f'verint_api_requests_total{{{_labels(method, template)},status="{status}"}} {count}')
+
+            lines += ["# HELP verint_api_retries_total Retried Verint API attempts.",
+                      "# TYPE verint_api_retries_total counter"]
+            for (method, template), stats in endpoints:
+                lines.append(f"verint_api_retries_total{{{_labels(method, template)}}} {stats.retries}")
+
+            lines += ["# HELP verint_api_response_bytes_total Response body bytes received.",
+                      "# TYPE verint_api_response_bytes_total counter"]
+            for (method, template), stats in endpoints:
+                lines.append(f"verint_api_response_bytes_total{{{_labels(method, template)}}} {stats.bytes}")
+
+            lines += ["# HELP verint_api_request_duration_seconds Verint API attempt latency.",
+                      "# TYPE verint_api_request_duration_seconds histogram"]
+            for (method, template), stats in endpoints:
+                labels = _labels(method, template)
+                cumulative = 0
+                for bound, count in zip(stats.latency.bounds, stats.latency.counts):
+                    cumulative += count
+                    lines.append(f'verint_api_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'verint_api_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.latency.count}')
+                lines.append(f"verint_api_request_duration_seconds_sum{{{labels}}} {stats.latency.total:.6f}")
+                lines.append(f"verint_api_request_duration_seconds_count{{{labels}}} {stats.latency.count}")
+
+            lines += ["# HELP verint_timer_seconds_total Time spent in stages, transforms and exports.",
+                      "# TYPE verint_timer_seconds_total counter"]
+            for name, timer in timers:
+                lines.append(f'verint_timer_seconds_total{{name="{name}"}} {timer["seconds"]:.6f}')
+            lines += ["# HELP verint_timer_count_total Completed timed blocks.",
+                      "# TYPE verint_timer_count_total counter"]
+            for name, timer in timers:
+                lines.append(f'verint_timer_count_total{{name="{name}"}} {timer["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def report_lines(self, limit=10):
+        """
+        Returns a short human-readable summary of the slowest endpoints and timers.
+        """
+        summary = self.summary()
+        lines = []
+        for entry in summary["endpoints"][:limit]:
+            latency = entry["latency_seconds"]
+            errors = sum(count for status, count in entry["statuses"].items()
+                         if not status.startswith(("2", "3")) and status not in LOCAL_STATUSES)
+            lines.append(f"{entry['method']} {entry['endpoint']}: {entry['calls']} calls, "
+                         f"p50 {_ms(latency['p50'])} p95 {_ms(latency['p95'])} p99 {_ms(latency['p99'])}, "
+                         f"{entry['bytes'] / 1e6:.1f} MB, {entry['retries']} retries, {errors} errors"
+                         + (f", {entry['local']} answered locally" if entry["local"] else ""))
+        for name, timer in summary["timers"].items():
+            lines.append(f"{name}: {timer['seconds']:.2f}s ({timer['count']}x)")
+        return lines
+
+    def write(self, directory=None):
+        """
+        Writes run_<timestamp>.json and verint_extract.prom under the metrics directory.
+
+        Returns:
+            tuple: (JSON summary path, Prometheus textfile path)
+        """
+        directory = directory or METRICS_DIR
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.fromtimestamp(self.started_at).strftime("%Y%m%d_%H%M%S")
+        json_path = os.path.join(directory, f"run_{stamp}.json")
+        prom_path = os.path.join(directory, "verint_extract.prom")
+        _atomic_write(json_path, json.dumps(self.summary(), indent=2))
+        _atomic_write(prom_path, self.prometheus_text())
+        return json_path, prom_path
+
+def _round(value):
+    return None if value is None else round(value, 4)
+
+def _ms(value):
+    return "-" if value is None else f"{value * 1000:.0f}ms"
+
+def _labels(method, template):
+    return f'method="{method}",endpoint="{template}"'
+
+def _atomic_write(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+_default_metrics = MetricsRegistry()
+
+def get_default_metrics():
+    """
+    Returns the process-wide metrics registry shared by every client of the run.
+    """
+    return _default_metrics
@@ -0,0 +1,239 @@
+"""
+Module: pipeline.py
+Purpose: Dependency-aware scheduler for the extraction stages.
+
+Each stage declares the artifacts it needs (inputs) and the ones it produces
+(outputs). A stage starts as soon as every stage producing its inputs has
+finished, and independent stages run concurrently, so a run takes as long as
+its critical path rather than the sum of all stages.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from config import ACCESS_RIGHTS_MODE
+from metrics import get_default_metrics
+
+class Stage:
+    """
+    One step of the extraction pipeline.
+
+    Args:
+        name (str): Stage name used on the command line and in reports.
+        run (callable): Called as run(context, sink).
+        inputs (tuple[str]): Artifacts that must exist before the stage starts.
+        outputs (tuple[str]): Artifacts available once the stage has finished.
+        sheets (tuple[str]): Workbook sheets the stage writes, in display order.
+    """
+
+    def __init__(self, name, run, inputs=(), outputs=(), sheets=()):
+        self.name = name
+        self.run = run
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.sheets = tuple(sheets)
+
+class Pipeline:
+    """
+    A set of stages wired together by their inputs and outputs.
+
+    Args:
+        stages (list[Stage]): Stages in their preferred (report and sheet) order.
+    """
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+        self._by_name = {}
+        self._producer = {}
+        for stage in self.stages:
+            if stage.name in self._by_name:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            self._by_name[stage.name] = stage
+            for artifact in stage.outputs:
+                if artifact in self._producer:
+                    raise ValueError(f"Artifact '{artifact}' is produced by both "
+                                     f"{self._producer[artifact]} and {stage.name}")
+                self._producer[artifact] = stage.name
+        for stage in self.stages:
+            for artifact in stage.inputs:
+                if artifact not in self._producer:
+                    raise ValueError(f"No stage produces '{artifact}' needed by {stage.name}")
+        # Resolving every stage rejects dependency cycles up front
+        self.resolve(self.names())
+
+    def names(self):
+        return [stage.name for stage in self.stages]
+
+    def dependencies(self, name):
+        """
+        Returns the names of the stages a stage directly depends on.
+        """
+        return {self._producer[artifact] for artifact in self._by_name[name].inputs}
+
+    def resolve(self, names):
+        """
+        Returns the requested stages plus every stage they depend on, in
+        pipeline order.
+        """
+        unknown = [name for name in names if name not in self._by_name]
+        if unknown:
+            raise ValueError(f"Unknown stages: {', '.join(unknown)}")
+
+        selected = set()
+        visiting = set()
+
+        def visit(name):
+            if name in selected:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through stage {name}")
+            visiting.add(name)
+            for dependency in self.dependencies(name):
+                visit(dependency)
+            visiting.discard(name)
+            selected.add(name)
+
+        for name in names:
+            visit(name)
+        return [stage for stage in self.stages if stage.name in selected]
+
+    def sheet_order(self):
+        """
+        Returns the sheets written by all stages, in pipeline order.
+        """
+        return [sheet for stage in self.stages for sheet in stage.sheets]
+
+    def run(self, context, sink, names=None, max_parallel=None):
+        """
+        Runs the selected stages (and their dependencies) as soon as their
+        inputs are ready.
+
+        If a stage fails, no further stages are started; stages already
+        running are allowed to finish and the first error is re-raised.
+
+        Args:
+            context (RunContext): Shared state of the run.
+            sink (WorkbookSink): Workbook of the run.
+            names (list[str], optional): Stages to run; defaults to all of them.
+            max_parallel (int, optional): Upper bound on concurrently running stages.
+
+        Returns:
+            dict: stage name -> {"start": seconds after pipeline start, "seconds": duration}
+        """
+        stages = self.resolve(names or self.names())
+        requested = set(names or self.names())
+        for stage in stages:
+            if stage.name not in requested:
+                logging.info(f"[pipeline] adding {stage.name} (required by the selected stages)")
+
+        pending = list(stages)
+        available = set()
+        running = {}
+        timings = {}
+        error = None
+        pipeline_start = time.perf_counter()
+
+        def timed(stage):
+            start = time.perf_counter()
+            logging.info(f"[pipeline] {stage.name}: started")
+            stage.run(context, sink)
+            seconds = time.perf_counter() - start
+            get_default_metrics().add_time(f"stage:{stage.name}", seconds)
+            return start - pipeline_start, seconds
+
+        with ThreadPoolExecutor(max_workers=max(1, max_parallel or len(stages) or 1)) as executor:
+            while pending or running:
+                # Start every stage whose inputs are available
+                if error is None:
+                    for stage in list(pending):
+                        if max_parallel and len(running) >= max_parallel:
+                            break
+                        if all(artifact in available for artifact in stage.inputs):
+                            pending.remove(stage)
+                            running[executor.submit(timed, stage)] = stage
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        start, seconds = future.result()
+                    except Exception as e:
+                        logging.error(f"[pipeline] {stage.name}: failed: {e}")
+                        error = error or e
+                        continue
+                    timings[stage.name] = {"start": round(start, 3), "seconds": round(seconds, 3)}
+                    available.update(stage.outputs)
+                    logging.info(f"[pipeline] {stage.name}: finished in {seconds:.2f}s")
+
+        if error is not None:
+            skipped = [stage.name for stage in pending]
+            if skipped:
+                logging.info(f"[pipeline] not started: {', '.join(skipped)}")
+            raise error
+
+        total = time.perf_counter() - pipeline_start
+        for stage in stages:
+            entry = timings[stage.name]
+            logging.info(f"[pipeline] {stage.name:<15} start +{entry['start']:.2f}s  took {entry['seconds']:.2f}s")
+        stage_sum = sum(entry["seconds"] for entry in timings.values())
+        logging.info(f"[pipeline] total {total:.2f}s (sum of stages {stage_sum:.2f}s)")
+        return timings
+
+# Stages that can be split across shards (--shard k/N); their sheets are keyed by employee
+SHARDED_STAGES = ("employees", "access_rights")
+
+def build_extraction_pipeline(resume=False, incremental=False, full_refresh=False, skills_table=True,
+                              shard=None, access_rights_mode=None):
+    """
+    Returns the toolkit's extraction pipeline. Extractor modules are imported
+    when their stage runs, so configuration can be changed before that and
+    targeted runs only load what their stages need.
+
+    Args:
+        resume (bool): Resume employee / access rights extraction from checkpoint journals.
+        incremental (bool): Reuse stored rows of unchanged employees.
+        full_refresh (bool): In incremental mode, re-fetch every employee and rebuild the state.
+        skills_table (bool): Also write the long-format "Employee Skills" sheet.
+        shard (Shard, optional): Extract only this partition of the employees
+            (employees and access_rights stages).
+        access_rights_mode (str, optional): "flat" or "normalized"; defaults to
+            VERINT_ACCESS_RIGHTS_MODE.
+    """
+    access_rights_mode = access_rights_mode or ACCESS_RIGHTS_MODE
+    if access_rights_mode == "normalized":
+        access_rights_sheets = ("Employee Roles", "Access Roles")
+    else:
+        access_rights_sheets = ("Access Rights",)
+    employee_sheets = ("Employees", "Employee Skills") if skills_table else ("Employees",)
+
+    def organizations(context, sink):
+        from extractors.organization_extractor import extract_organizations
+        extract_organizations(sink, context=context)
+
+    def groups(context, sink):
+        from extractors.group_extractor import extract_groups
+        extract_groups(sink, context=context)
+
+    def employees(context, sink):
+        from extractors.employee_extractor import extract_employees
+        extract_employees(sink=sink, incremental=incremental, full_refresh=full_refresh,
+                          resume=resume, context=context, skills_table=skills_table, shard=shard)
+
+    def roles(context, sink):
+        from extractors.role_extractor import extract_roles
+        extract_roles(sink, context=context)
+
+    def access_rights(context, sink):
+        from extractors.access_rights_extractor import extract_access_rights
+        extract_access_rights(sink, resume=resume, context=context, shard=shard, mode=access_rights_mode)
+
+    return Pipeline([
+        Stage("organizations", organizations, sheets=("Organization Hierarchy",)),
+        # Group membership feeds the employee sheet's Groups column
+        Stage("groups", groups, outputs=("employee_groups_map",), sheets=("Group Hierarchy",)),
+        Stage("employees", employees, inputs=("employee_groups_map",), sheets=employee_sheets),
+        Stage("roles", roles, sheets=("Roles",)),
+        Stage("access_rights", access_rights, sheets=access_rights_sheets),
+    ])
@@ -0,0 +1,111 @@
+"""
+Module: progress.py
+Purpose: Low-overhead progress reporting for long extraction loops.
+
+A ProgressReporter counts completed entities and errors per kind (e.g. per
+sub-resource endpoint) and logs at most one line per interval: entities
+done / total, current throughput, ETA and error counts. Counting is a
+locked increment, so reporters can be advanced from worker threads.
+Per-entity details go to the diagnostics log instead (see diagnostics.py).
+"""
+
+import logging
+import threading
+import time
+from config import LOG_LEVEL, PROGRESS_INTERVAL
+
+def configure_logging(level=None):
+    """
+    Configures root logging for command-line runs.
+
+    Args:
+        level (str | int, optional): Log level; defaults to VERINT_LOG_LEVEL.
+    """
+    level = level or LOG_LEVEL
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    logging.basicConfig(level=level, format="%(asctime)s %(levelname)s %(message)s", force=True)
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+class ProgressReporter:
+    """
+    Rate-limited progress and ETA reporter for one extractor loop.
+
+    Args:
+        name (str): Label of the loop, e.g. "employees".
+        total (int, optional): Expected number of entities, for percentage and ETA.
+        interval (float, optional): Minimum seconds between progress lines
+            (defaults to VERINT_PROGRESS_INTERVAL).
+    """
+
+    def __init__(self, name, total=None, interval=None):
+        self.name = name
+        self.total = total
+        self.interval = PROGRESS_INTERVAL if interval is None else interval
+        self.done = 0
+        self.errors = {}
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._last_time = self._start
+        self._last_done = 0
+        self._next_report = self._start + self.interval
+
+    def advance(self, count=1):
+        """
+        Marks entities as completed, logging a progress line when the interval has elapsed.
+        """
+        with self._lock:
+            self.done += count
+            now = time.monotonic()
+            if now < self._next_report:
+                return
+            line = self._line_locked(now)
+        logging.info(line)
+
+    def error(self, kind):
+        """
+        Counts an error of a kind, e.g. the sub-resource whose fetch failed.
+        """
+        with self._lock:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def finish(self):
+        """
+        Logs the final totals of the loop.
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._start
+            rate = self.done / elapsed if elapsed else 0.0
+            line = f"{self.name}: done {self.done} in {format_duration(elapsed)} ({rate:.1f}/s)"
+            line += self._errors_locked()
+        logging.info(line)
+
+    def _errors_locked(self):
+        if not self.errors:
+            return ""
+        return " errors: " + ", ".join(f"{kind}={count}" for kind, count in sorted(self.errors.items()))
+
+    def _line_locked(self, now):
+        # Throughput since the previous line; ETA from the average rate of the run
+        window = now - self._last_time
+        rate = (self.done - self._last_done) / window if window else 0.0
+        elapsed = now - self._start
+        line = f"{self.name}: {self.done}"
+        if self.total:
+            line += f"/{self.total} ({100.0 * self.done / self.total:.1f}%)"
+        line += f" {rate:.1f}/s"
+        if self.total and self.done and self.done < self.total:
+            line += f" ETA {format_duration((self.total - self.done) * elapsed / self.done)}"
+        line += self._errors_locked()
+
+        self._last_time = now
+        self._last_done = self.done
+        self._next_report = now + self.interval
+        return line
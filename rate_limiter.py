@@ -0,0 +1,146 @@
+"""
+Module: rate_limiter.py
+Purpose: Client-side request throttling and retry policy for the Verint API.
+
+Provides a token-bucket rate limiter that can be shared by threads and asyncio
+tasks, and a retry policy with jittered exponential backoff that honours the
+server's Retry-After header on 429/503 responses.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from config import RATE_LIMIT_RPS, RATE_LIMIT_BURST, MAX_RETRIES, RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing `rate` requests per second on average
+    with bursts of up to `burst` requests.
+
+    Callers reserve a token under a lock and then sleep outside it, so the
+    same bucket can be shared by worker threads (acquire) and asyncio tasks
+    (acquire_async). A rate of 0 or None disables throttling.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate or 0)
+        self.burst = float(burst or max(1.0, self.rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """
+        Takes one token and returns how long the caller must wait before using it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            pause = max(0.0, self._blocked_until - now)
+            if self.rate <= 0:
+                return pause
+
+            # Refill according to elapsed time, capped at the burst size
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Tokens may go negative: later callers queue up behind earlier ones
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, pause)
+
+    def acquire(self):
+        """
+        Blocks the calling thread until a request may be sent.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """
+        Suspends the calling task until a request may be sent.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds):
+        """
+        Holds back every caller for the given number of seconds, e.g. after
+        the server answered 429 with a Retry-After header.
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+def parse_retry_after(value):
+    """
+    Parses a Retry-After header value.
+
+    Args:
+        value (str): Either delay-seconds or an HTTP-date.
+
+    Returns:
+        float | None: Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class RetryPolicy:
+    """
+    Decides whether a failed call is retried and how long to wait before it.
+    """
+
+    RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+    def __init__(self, max_retries=None, backoff_base=None, backoff_max=None):
+        self.max_retries = MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = RETRY_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = RETRY_BACKOFF_MAX if backoff_max is None else backoff_max
+
+    def should_retry(self, attempt, status=None):
+        """
+        Returns True if the given attempt (0-based) may be retried. A status of
+        None stands for a connection-level failure.
+        """
+        if attempt >= self.max_retries:
+            return False
+        return status is None or status in self.RETRY_STATUSES
+
+    def backoff(self, attempt, retry_after=None):
+        """
+        Returns the delay before the next attempt: the server's Retry-After
+        if given, otherwise full-jitter exponential backoff.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+_default_limiter = None
+_default_limiter_lock = threading.Lock()
+
+def get_default_rate_limiter():
+    """
+    Returns the process-wide TokenBucket configured from the environment,
+    shared by every client that is not given its own limiter.
+    """
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = TokenBucket(RATE_LIMIT_RPS, RATE_LIMIT_BURST)
+        return _default_limiter
@@ -0,0 +1,130 @@
+"""
+Module: response_archive.py
+Purpose: Append-only, compressed archive of the raw Verint API responses of a run.
+
+Every response body is stored exactly as received (no parse / re-serialize
+round trip) as its own gzip member appended to <run>/responses.gz; the
+concatenation is itself a valid gzip stream. A line per response is appended
+to <run>/index.ndjson with the endpoint, status and the member's offset and
+length, so a single response can be read back without decompressing the
+whole archive. Archiving covers every call made through VerintClient,
+sub-resources included, and is switched off with VERINT_ARCHIVE=false.
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from config import ARCHIVE_ENABLED, ARCHIVE_DIR, ARCHIVE_COMPRESSLEVEL
+
+class ResponseArchive:
+    """
+    Archive of one run, stored in its own directory.
+
+    Args:
+        directory (str): Run directory holding responses.gz and index.ndjson.
+        compresslevel (int): gzip level of each member (1 = fastest).
+    """
+
+    DATA_FILE = "responses.gz"
+    INDEX_FILE = "index.ndjson"
+
+    def __init__(self, directory, compresslevel=None):
+        self.directory = directory
+        self.compresslevel = ARCHIVE_COMPRESSLEVEL if compresslevel is None else compresslevel
+        self._lock = threading.Lock()
+        self._data = None
+        self._index = None
+
+    def _open_locked(self):
+        if self._data is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._data = open(os.path.join(self.directory, self.DATA_FILE), "ab")
+            self._index = open(os.path.join(self.directory, self.INDEX_FILE), "a", encoding="utf-8")
+
+    def record(self, method, endpoint, status, body, cached=False):
+        """
+        Appends one raw response body to the archive.
+
+        Args:
+            method (str): HTTP method.
+            endpoint (str): Endpoint relative to the base URL.
+            status (int): HTTP status of the response.
+            body (bytes): Raw response body as received.
+            cached (bool): The body was served from the response cache.
+        """
+        member = gzip.compress(body, compresslevel=self.compresslevel)
+        entry = {"method": method.upper(), "endpoint": endpoint.lstrip("/"), "status": status,
+                 "bytes": len(body), "cached": cached, "time": round(time.time(), 3)}
+        with self._lock:
+            self._open_locked()
+            entry["offset"] = self._data.tell()
+            entry["length"] = len(member)
+            self._data.write(member)
+            self._data.flush()
+            # The index line goes out after its data, so it never points past the archive
+            self._index.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._index.flush()
+
+    def close(self):
+        """
+        Flushes and closes the archive files. Recording again reopens them.
+        """
+        with self._lock:
+            if self._data is not None:
+                self._data.close()
+                self._index.close()
+                self._data = self._index = None
+
+    def entries(self, endpoint=None):
+        """
+        Yields the index entries of the archive, optionally only those whose
+        endpoint starts with the given prefix.
+        """
+        index_path = os.path.join(self.directory, self.INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+        prefix = endpoint.lstrip("/") if endpoint else None
+        with open(index_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash
+                    break
+                if prefix is None or entry["endpoint"].startswith(prefix):
+                    yield entry
+
+    def read(self, entry):
+        """
+        Returns the raw body of an index entry.
+        """
+        with open(os.path.join(self.directory, self.DATA_FILE), "rb") as f:
+            f.seek(entry["offset"])
+            return gzip.decompress(f.read(entry["length"]))
+
+    def load(self, entry):
+        """
+        Returns the parsed JSON body of an index entry.
+        """
+        return json.loads(self.read(entry))
+
+_default_archive = None
+_default_archive_lock = threading.Lock()
+
+def get_default_response_archive():
+    """
+    Returns the archive of the current run under VERINT_ARCHIVE_DIR, or None
+    when archiving is disabled. The run directory is named after the time the
+    archive was first used.
+    """
+    global _default_archive
+    if not ARCHIVE_ENABLED:
+        return None
+    with _default_archive_lock:
+        if _default_archive is None:
+            run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+            _default_archive = ResponseArchive(os.path.join(ARCHIVE_DIR, run_id))
+        return _default_archive
@@ -0,0 +1,101 @@
+"""
+Module: run_context.py
+Purpose: Run-scoped store of the base Verint collections shared by extractors.
+
+Each base collection (employees, groups, organizations, roles) is fetched at
+most once per run, indexed by id and handed to every extractor that needs it.
+The raw responses are kept for audit by the client's response archive.
+
+Data derived by one extractor for another, such as the employee-to-group
+membership built by extract_groups, also lives here instead of in
+module-level globals, as do the checkpoint journals of completed extractors,
+which are only removed once the run's sink is saved.
+"""
+
+import threading
+from collections import defaultdict
+from verint_client import VerintClient
+
+class RunContext:
+    """
+    Shared state of one extraction run.
+
+    Args:
+        client (VerintClient, optional): Client shared by all extractors of the run.
+    """
+
+    # Collection name -> endpoint
+    COLLECTIONS = {
+        "employees": "wfo/user-mgmt-api/v1/employees",
+        "groups": "wfo/user-mgmt-api/v1/groups",
+        "organizations": "wfo/user-mgmt-api/v1/organizations",
+        "roles": "wfo/user-mgmt-api/v1/roles",
+    }
+
+    def __init__(self, client=None):
+        self.client = client or VerintClient()
+        self.employee_groups_map = defaultdict(list)
+        # Role id -> employee ids, built by extract_access_rights in normalized mode
+        self.role_employees = None
+        self._journals = []
+        self._journal_lock = threading.Lock()
+        self._responses = {}
+        self._indexes = {}
+        self._locks = {name: threading.Lock() for name in self.COLLECTIONS}
+
+    def response(self, name):
+        """
+        Returns the raw response of a base collection, fetching it on first use.
+        Concurrent callers asking for the same collection share one request.
+        """
+        with self._locks[name]:
+            if name not in self._responses:
+                self._responses[name] = self.client.verint_call(self.COLLECTIONS[name])
+            return self._responses[name]
+
+    def collection(self, name):
+        """
+        Returns the list of entities of a base collection.
+        """
+        return self.response(name).get("data", [])
+
+    def index(self, name):
+        """
+        Returns a base collection indexed by entity id.
+        """
+        entities = self.collection(name)
+        with self._locks[name]:
+            if name not in self._indexes:
+                self._indexes[name] = {entity["id"]: entity for entity in entities}
+            return self._indexes[name]
+
+    def defer_journal(self, journal):
+        """
+        Closes the checkpoint journal of a completed extractor whose rows went
+        to the shared sink; it is kept until finish_journals() is called.
+        """
+        journal.close()
+        with self._journal_lock:
+            self._journals.append(journal)
+
+    def finish_journals(self):
+        """
+        Removes the deferred checkpoint journals. Call once the shared sink has
+        been closed successfully, so a failed save can still be resumed.
+        """
+        with self._journal_lock:
+            journals, self._journals = self._journals, []
+        for journal in journals:
+            journal.finish()
+
+    def employees(self):
+        return self.collection("employees")
+
+    def groups(self):
+        return self.collection("groups")
+
+    def organizations(self):
+        return self.collection("organizations")
+
+    def roles(self):
+        return self.collection("roles")
@@ -0,0 +1,89 @@
+"""
+Module: sharding.py
+Purpose: Stable hash partitioning of employees across extraction shards.
+
+A shard spec "k/N" selects the employees whose id hashes to partition k of N
+(1-based). The hash is a BLAKE2b digest of the id, so every process and host
+assigns an employee to the same shard regardless of list order or Python's
+hash seed. Each shard can run with its own API key, taken from
+VERINT_SHARD_<k>_API_KEY_ID / VERINT_SHARD_<k>_API_KEY_SECRET when set.
+"""
+
+import hashlib
+import os
+import config
+
+class Shard:
+    """
+    One partition of the employee population.
+
+    Args:
+        index (int): Shard number, 1..count.
+        count (int): Total number of shards.
+    """
+
+    def __init__(self, index, count):
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f"Invalid shard {index}/{count}: expected 1 <= k <= N")
+        self.index = index
+        self.count = count
+
+    def __str__(self):
+        return f"{self.index}/{self.count}"
+
+    @property
+    def name(self):
+        """
+        File-system friendly name, e.g. "shard-3-of-8".
+        """
+        return f"shard-{self.index}-of-{self.count}"
+
+    def contains(self, entity_id):
+        """
+        Returns True if an entity id belongs to this shard.
+        """
+        return shard_of(entity_id, self.count) == self.index
+
+    def select(self, entities):
+        """
+        Returns the entities (dicts with an "id") that belong to this shard, in list order.
+        """
+        return [entity for entity in entities if self.contains(entity.get("id"))]
+
+def parse_shard(spec):
+    """
+    Parses a shard spec such as "3/8".
+
+    Raises:
+        ValueError: If the spec is malformed or out of range.
+    """
+    try:
+        index, count = (int(part) for part in str(spec).split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard spec '{spec}': expected k/N, e.g. 3/8") from None
+    return Shard(index, count)
+
+def shard_of(entity_id, count):
+    """
+    Returns the 1-based shard of an entity id among `count` shards.
+    """
+    digest = hashlib.blake2b(str(entity_id).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+def shard_state_name(name, shard=None):
+    """
+    Returns the checkpoint / state name of an extractor, suffixed with the
+    shard so concurrent shards never share a journal ("employees.shard-3-of-8").
+    """
+    return name if shard is None else f"{name}.{shard.name}"
+
+def shard_credentials(shard):
+    """
+    Returns the (API key id, secret) of a shard: VERINT_SHARD_<k>_API_KEY_ID /
+    _SECRET when both are set, else the default key of the configuration.
+    """
+    key_id = os.getenv(f"VERINT_SHARD_{shard.index}_API_KEY_ID")
+    secret = os.getenv(f"VERINT_SHARD_{shard.index}_API_KEY_SECRET")
+    if key_id and secret:
+        return key_id, secret
+    return config.API_KEY_ID, config.API_KEY_SECRET
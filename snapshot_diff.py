@@ -0,0 +1,397 @@
+"""
+Module: snapshot_diff.py
+Purpose: Entity-level comparison of two extractions, e.g. legacy vs migrated tenant.
+
+Each side is a SQLite snapshot, an exported workbook or a directory of CSV /
+NDJSON exports. Rows are keyed per sheet by their entity id columns (see
+DIFF_KEYS) and normalized before comparison: empty cells and missing columns
+are null, numbers and booleans are compared by their text, and JSON cells are
+re-serialized with sorted keys and their list elements in sorted order, so
+the order in which the API returned nested items does not matter.
+
+Every sheet is compared with a streaming hash join in time linear in the
+number of rows: the left side is read once into a map of entity key -> 16
+byte BLAKE2b digest of the normalized row, the right side is streamed against
+it, and the left side is read a second time only to collect the fields of
+removed and changed entities. Memory is one digest per entity plus the
+changed entities. Differences are written one JSON object per line: added,
+removed (with their fields) and changed entities (with old and new value of
+each differing field), followed by a summary per sheet.
+"""
+
+import csv
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from config import DIFF_DIR
+from exporters.line_sinks import sheet_file_name
+from exporters.workbook_sink import split_sheet_title
+
+# Sheet title -> columns identifying one entity (row) of the sheet
+DIFF_KEYS = {
+    "Employees": ("Employee ID",),
+    "Employee Skills": ("Employee ID", "Skill Name"),
+    "Group Hierarchy": ("Group ID",),
+    "Organization Hierarchy": ("Organization ID",),
+    "Access Rights": ("Employee ID", "Role Name"),
+    "Employee Roles": ("Employee ID", "Role ID"),
+    "Access Roles": ("Role ID", "Role Variant"),
+    "Roles": ("Role Name",),
+}
+
+# Sheets compared when none are selected
+DEFAULT_DIFF_SHEETS = ("Employees", "Group Hierarchy", "Organization Hierarchy", "Access Rights")
+
+def parse_diff_keys(specs):
+    """
+    Parses key overrides such as "Employees=Username" or
+    "Access Rights=Username+Role Name".
+
+    Raises:
+        ValueError: If a spec is malformed.
+    """
+    keys = {}
+    for spec in specs or ():
+        title, _, columns = spec.partition("=")
+        columns = tuple(column.strip() for column in columns.split("+") if column.strip())
+        if not title.strip() or not columns:
+            raise ValueError(f"Invalid diff key '{spec}': expected SHEET=COLUMN[+COLUMN...]")
+        keys[title.strip()] = columns
+    return keys
+
+def _canonical(value):
+    """
+    Encodes parsed JSON with sorted object keys and list elements in sorted
+    order, each element encoded once.
+    """
+    if isinstance(value, dict):
+        return "{" + ", ".join(json.dumps(key, ensure_ascii=False) + ": " + _canonical(value[key])
+                               for key in sorted(value)) + "}"
+    if isinstance(value, list):
+        return "[" + ", ".join(sorted(_canonical(item) for item in value)) + "]"
+    return json.dumps(value, ensure_ascii=False)
+
+@lru_cache(maxsize=65536)
+def _canonical_json(text):
+    # Many JSON cells repeat across rows (shared scope lists, skills, groups)
+    try:
+        return _canonical(json.loads(text))
+    except ValueError:
+        return text
+
+def normalize_value(value):
+    """
+    Returns the comparison form of a cell: None for empty cells, the text of
+    numbers and booleans (1.0 -> "1"), canonical JSON for JSON cells.
+    """
+    if type(value) is not str:
+        if value is None:
+            return None
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value)
+    text = value.strip()
+    if not text:
+        return None
+    if text[0] in "[{":
+        return _canonical_json(text)
+    return text
+
+def _digest(fields):
+    encoded = "\x1e".join(f"{field}\x1f{value}" for field, value in sorted(fields.items()))
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).digest()
+
+def field_changes(old, new):
+    """
+    Returns {field: {"old": ..., "new": ...}} for the fields of two normalized
+    rows that differ; JSON list fields also list their added and removed elements.
+    """
+    changes = {}
+    for field in sorted(set(old) | set(new)):
+        before, after = old.get(field), new.get(field)
+        if before == after:
+            continue
+        change = {"old": before, "new": after}
+        if before and after and before[0] == "[" and after[0] == "[":
+            try:
+                old_items = Counter(json.dumps(item, sort_keys=True) for item in json.loads(before))
+                new_items = Counter(json.dumps(item, sort_keys=True) for item in json.loads(after))
+                change["added"] = [json.loads(item) for item in (new_items - old_items).elements()]
+                change["removed"] = [json.loads(item) for item in (old_items - new_items).elements()]
+            except ValueError:
+                pass
+        changes[field] = change
+    return changes
+
+class SnapshotSource:
+    """
+    Sheets of a SQLite snapshot (see exporters/snapshot_sink.py).
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def sheets(self):
+        connection = sqlite3.connect(self.path)
+        try:
+            return [row[0] for row in connection.execute("SELECT title FROM snapshot_sheets")]
+        finally:
+            connection.close()
+
+    def read(self, title):
+        from exporters.snapshot_sink import read_sheet, snapshot_sheets
+
+        connection = sqlite3.connect(self.path)
+        try:
+            sheet = next(sheet for sheet in snapshot_sheets(connection) if sheet["title"] == title)
+            yield json.loads(sheet["headers"])
+            yield from read_sheet(connection, sheet)
+        finally:
+            connection.close()
+
+class WorkbookSource:
+    """
+    Sheets of an exported workbook; the first row of each sheet is its header
+    row. Continuation worksheets of long sheets ("Employees (2)") are read as
+    part of the sheet they continue.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def sheets(self):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(self.path, read_only=True)
+        try:
+            return [title for title in workbook.sheetnames if split_sheet_title(title)[1] == 1]
+        finally:
+            workbook.close()
+
+    def read(self, title):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(self.path, read_only=True)
+        try:
+            yield from workbook[title].iter_rows(values_only=True)
+            part = 2
+            while f"{title} ({part})" in workbook.sheetnames:
+                # Skip the repeated header row
+                yield from workbook[f"{title} ({part})"].iter_rows(min_row=2, values_only=True)
+                part += 1
+        finally:
+            workbook.close()
+
+class ExportDirectorySource:
+    """
+    Sheets of a directory of CSV or NDJSON exports (optionally gzipped), for
+    the sheets listed in DIFF_KEYS.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _file(self, title):
+        for extension in ("csv", "ndjson"):
+            for compress in (False, True):
+                path = os.path.join(self.path, sheet_file_name(title, extension, compress))
+                if os.path.exists(path):
+                    return path, extension, compress
+        return None
+
+    def sheets(self):
+        return [title for title in DIFF_KEYS if self._file(title)]
+
+    def read(self, title):
+        path, extension, compress = self._file(title)
+        opener = gzip.open if compress else open
+        with opener(path, "rt", encoding="utf-8", newline="") as f:
+            if extension == "csv":
+                yield from csv.reader(f)
+                return
+            headers = None
+            for line in f:
+                record = json.loads(line)
+                if headers is None:
+                    headers = list(record)
+                    yield headers
+                yield [record.get(header) for header in headers]
+
+def open_source(path):
+    """
+    Returns the reader of an extraction: a .sqlite/.db snapshot, an .xlsx
+    workbook or a directory of CSV / NDJSON exports.
+
+    Raises:
+        ValueError: If the path does not exist or is of an unknown kind.
+    """
+    if os.path.isdir(path):
+        return ExportDirectorySource(path)
+    if not os.path.exists(path):
+        raise ValueError(f"Extraction not found: {path}")
+    if path.endswith(".xlsx"):
+        return WorkbookSource(path)
+    if path.endswith((".sqlite", ".sqlite3", ".db")):
+        return SnapshotSource(path)
+    raise ValueError(f"Unknown extraction format: {path} (expected .sqlite, .xlsx or an export directory)")
+
+def _entities(source, title, key_columns, ignore):
+    """
+    Yields (key, normalized fields) of every row of a sheet. Repeated keys
+    get an occurrence number so that every row stays a separate entity.
+    """
+    rows = source.read(title)
+    headers = [str(header) if header is not None else "" for header in next(rows, [])]
+    missing = [column for column in key_columns if column not in headers]
+    if missing:
+        raise ValueError(f"Sheet '{title}' of {source.path} has no key column {', '.join(missing)}")
+    key_indexes = [headers.index(column) for column in key_columns]
+    skipped = set(key_columns) | set(ignore) | {""}
+    value_indexes = [(index, header) for index, header in enumerate(headers) if header not in skipped]
+    occurrences = {}
+    for row in rows:
+        row = list(row) + [None] * (len(headers) - len(row))
+        key = tuple(normalize_value(row[index]) for index in key_indexes)
+        count = occurrences.get(key, 0)
+        occurrences[key] = count + 1
+        if count:
+            key += (f"#{count + 1}",)
+        fields = {}
+        for index, header in value_indexes:
+            value = normalize_value(row[index])
+            if value is not None:
+                fields[header] = value
+        yield key, fields
+
+class DiffReport:
+    """
+    NDJSON report of the differences found, one JSON object per line.
+
+    Args:
+        path (str): Report file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+    def close(self):
+        self._file.close()
+
+def diff_sheet(left, right, title, key_columns, report, ignore=()):
+    """
+    Compares one sheet of two extractions and writes its differences.
+
+    Args:
+        left: Source of the reference extraction (e.g. the legacy tenant).
+        right: Source of the compared extraction (e.g. the migrated tenant).
+        title (str): Sheet name.
+        key_columns (tuple[str]): Columns identifying an entity.
+        report (DiffReport): Destination of the differences.
+        ignore (iterable[str]): Columns left out of the comparison.
+
+    Returns:
+        dict: Row and difference counts of the sheet.
+    """
+    def key_dict(key):
+        named = dict(zip(key_columns, key))
+        if len(key) > len(key_columns):
+            named["occurrence"] = key[-1]
+        return named
+
+    # Build side: entity key -> digest of its normalized fields
+    digests = {}
+    for key, fields in _entities(left, title, key_columns, ignore):
+        digests[key] = _digest(fields)
+    summary = {"sheet": title, "status": "summary", "left_rows": len(digests), "right_rows": 0,
+               "added": 0, "removed": 0, "changed": 0, "unchanged": 0}
+
+    # Probe side: stream the right rows against the digests
+    changed = {}
+    for key, fields in _entities(right, title, key_columns, ignore):
+        summary["right_rows"] += 1
+        digest = digests.pop(key, None)
+        if digest is None:
+            summary["added"] += 1
+            report.write({"sheet": title, "status": "added", "key": key_dict(key), "fields": fields})
+        elif digest != _digest(fields):
+            changed[key] = fields
+        else:
+            summary["unchanged"] += 1
+
+    # Keys left in the build side are removed; removed and changed entities
+    # take one more pass over the left rows for their field values
+    removed = digests
+    if removed or changed:
+        for key, fields in _entities(left, title, key_columns, ignore):
+            if key in removed:
+                summary["removed"] += 1
+                report.write({"sheet": title, "status": "removed", "key": key_dict(key), "fields": fields})
+            elif key in changed:
+                summary["changed"] += 1
+                report.write({"sheet": title, "status": "changed", "key": key_dict(key),
+                              "changes": field_changes(fields, changed[key])})
+    report.write(summary)
+    return summary
+
+def diff_extractions(left_path, right_path, sheets=None, keys=None, ignore=(), report_path=None):
+    """
+    Compares two extractions sheet by sheet.
+
+    Args:
+        left_path (str): Reference extraction (snapshot, workbook or export directory).
+        right_path (str): Compared extraction.
+        sheets (list[str], optional): Sheets to compare; defaults to the
+            DEFAULT_DIFF_SHEETS present on either side.
+        keys (dict, optional): Sheet -> key columns overriding DIFF_KEYS.
+        ignore (iterable[str]): Columns left out of the comparison (e.g. ids
+            that differ between tenants).
+        report_path (str, optional): NDJSON report file (defaults to
+            <VERINT_DIFF_DIR>/diff_<timestamp>.ndjson).
+
+    Returns:
+        tuple: (list of per-sheet summaries, report path). A sheet found on one
+        side only has a summary with status "missing".
+
+    Raises:
+        ValueError: If an extraction cannot be read or a sheet has no key.
+    """
+    left, right = open_source(left_path), open_source(right_path)
+    keys = dict(DIFF_KEYS, **(keys or {}))
+    left_sheets, right_sheets = set(left.sheets()), set(right.sheets())
+    if sheets is None:
+        sheets = [title for title in DEFAULT_DIFF_SHEETS if title in left_sheets | right_sheets]
+    unkeyed = [title for title in sheets if title not in keys]
+    if unkeyed:
+        raise ValueError(f"No key columns for sheets {', '.join(unkeyed)}; set them with --diff-key")
+
+    report_path = report_path or os.path.join(DIFF_DIR, f"diff_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson")
+    report = DiffReport(report_path)
+    summaries = []
+    try:
+        for title in sheets:
+            if title not in left_sheets or title not in right_sheets:
+                side = right_path if title in left_sheets else left_path
+                logging.warning(f"Sheet '{title}' is missing from {side}; not compared")
+                missing = {"sheet": title, "status": "missing", "missing_from": side}
+                report.write(missing)
+                summaries.append(missing)
+                continue
+            summary = diff_sheet(left, right, title, keys[title], report, ignore)
+            summaries.append(summary)
+            logging.info(f"{title}: {summary['left_rows']} vs {summary['right_rows']} rows, "
+                         f"{summary['added']} added, {summary['removed']} removed, "
+                         f"{summary['changed']} changed")
+    finally:
+        report.close()
+    return summaries, report_path
@@ -0,0 +1,62 @@
+"""
+Module: conftest.py
+Purpose: Shared fixtures of the test suite.
+
+config.py reads the environment on import, so before any test module imports
+the toolkit it is pointed at a scratch directory (exports, snapshot, archive,
+checkpoints) and at a local emulator port. The emulator serves a small
+SyntheticTenant and is only started by the tests that request it.
+"""
+
+import os
+import socket
+import sys
+import tempfile
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from emulator.app import DEFAULT_API_KEY_ID, DEFAULT_API_KEY_SECRET, create_app
+from emulator.benchmark import WORK_DIR_PATHS
+from emulator.server import start_in_thread
+from emulator.tenant import SyntheticTenant
+
+WORK_DIR = tempfile.mkdtemp(prefix="verint_tests_")
+
+with socket.socket() as sock:
+    sock.bind(("127.0.0.1", 0))
+    EMULATOR_PORT = sock.getsockname()[1]
+
+# Test runs never touch a real migration's files or tenant
+for name, path in WORK_DIR_PATHS.items():
+    os.environ[name] = os.path.join(WORK_DIR, path)
+os.environ.update({
+    "VERINT_BASE_URL": f"http://127.0.0.1:{EMULATOR_PORT}",
+    "VERINT_API_KEY_ID": DEFAULT_API_KEY_ID,
+    "VERINT_API_KEY_SECRET": DEFAULT_API_KEY_SECRET,
+    "VERINT_MAX_WORKERS": "4",
+    "VERINT_EXPORT_FORMATS": "xlsx",
+    "VERINT_ACCESS_RIGHTS_MODE": "flat",
+    "VERINT_CACHE_DIR": "",
+    "VERINT_ARCHIVE": "false",
+})
+
+@pytest.fixture(scope="session")
+def tenant():
+    """
+    Small deterministic synthetic tenant.
+    """
+    return SyntheticTenant(employees=60, orgs=8, org_depth=3, groups=12, group_depth=3, roles=6,
+                           skills_per_employee=3, seed=7)
+
+@pytest.fixture(scope="session")
+def emulator(tenant):
+    """
+    Emulator serving the tenant on the port config.py points at; yields the app
+    (request counters in app.state.stats).
+    """
+    app = create_app(tenant)
+    server, _ = start_in_thread(app, port=EMULATOR_PORT)
+    yield app
+    server.should_exit = True
@@ -0,0 +1,105 @@
+"""
+Single-flight memoization of repeated GET lookups.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from memo_cache import ResponseMemo, parse_memo_rules
+
+CALLERS = 8
+ENDPOINT = "api/em/v2/datasources/300"
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+def test_concurrent_identical_gets_share_one_call():
+    memo = ResponseMemo(parse_memo_rules("api/em/v2/datasources/{id}=16"))
+    rule = memo.rule_for("GET", ENDPOINT)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        # Hold the request in flight until every other caller is waiting on it
+        wait_for(lambda: memo.shared == CALLERS - 1)
+        return {"data": [{"id": "300"}]}
+
+    with ThreadPoolExecutor(CALLERS) as pool:
+        results = list(pool.map(lambda _: memo.call(rule, ENDPOINT, fetch), range(CALLERS)))
+
+    assert len(calls) == 1
+    assert sorted(source or "" for _, source in results) == [""] + ["shared"] * (CALLERS - 1)
+    assert all(value is results[0][0] for value, _ in results)
+    # Later calls are answered from memory
+    assert memo.call(rule, ENDPOINT, fetch)[1] == "memo"
+    assert len(calls) == 1
+
+def test_concurrent_identical_async_gets_share_one_call():
+    memo = ResponseMemo(parse_memo_rules("api/em/v2/datasources/{id}=16"))
+    rule = memo.rule_for("GET", ENDPOINT)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        while memo.shared < CALLERS - 1:
+            await asyncio.sleep(0.001)
+        return {"data": [{"id": "300"}]}
+
+    async def run():
+        return await asyncio.gather(*(memo.call_async(rule, ENDPOINT, fetch) for _ in range(CALLERS)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert sorted(source or "" for _, source in results) == [""] + ["shared"] * (CALLERS - 1)
+
+def test_failures_are_shared_but_not_memoized():
+    memo = ResponseMemo(parse_memo_rules("api/em/v2/datasources/{id}=16"))
+    rule = memo.rule_for("GET", ENDPOINT)
+
+    def failing_fetch():
+        wait_for(lambda: memo.shared == CALLERS - 1)
+        raise RuntimeError("upstream failed")
+
+    def call(_):
+        try:
+            memo.call(rule, ENDPOINT, failing_fetch)
+        except RuntimeError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(CALLERS) as pool:
+        errors = list(pool.map(call, range(CALLERS)))
+    assert errors == ["upstream failed"] * CALLERS
+
+    # The next call retries the request
+    value, source = memo.call(rule, ENDPOINT, lambda: "ok")
+    assert (value, source) == ("ok", None)
+
+def test_client_sends_one_request_for_concurrent_lookups(emulator):
+    from verint_client import VerintClient
+
+    client = VerintClient(memo=ResponseMemo(parse_memo_rules("api/em/v2/datasources/{id}=16")))
+    barrier = threading.Barrier(CALLERS)
+
+    def lookup(_):
+        barrier.wait()
+        return client.verint_call(ENDPOINT)
+
+    try:
+        before = emulator.state.stats["requests"]
+        with ThreadPoolExecutor(CALLERS) as pool:
+            responses = list(pool.map(lookup, range(CALLERS)))
+        assert emulator.state.stats["requests"] - before == 1
+    finally:
+        client.close()
+    assert all(response == responses[0] for response in responses)
+    assert client.memo.stats()["misses"] == 1
+
+@pytest.mark.parametrize("spec", ["api/em/v2/datasources/{id}", "=4", "pattern=0"])
+def test_malformed_rules_are_rejected(spec):
+    with pytest.raises(ValueError):
+        parse_memo_rules(spec)
@@ -0,0 +1,89 @@
+"""
+Entity-level diff of two extractions, across snapshot, workbook and export
+directory inputs.
+"""
+
+import json
+import pytest
+from exporters.line_sinks import CsvSink, NdjsonSink
+from exporters.snapshot_sink import SnapshotSink
+from exporters.workbook_sink import WorkbookSink
+from snapshot_diff import diff_extractions
+
+HEADERS = ["Employee ID", "Username", "Organization ID", "Is Supervisor", "Groups"]
+
+KINDS = ("sqlite", "xlsx", "csv", "ndjson")
+
+def employee_rows(tenant, reverse_groups=False):
+    groups = {}
+    for group_id, members in tenant.group_members.items():
+        for emp_id in members:
+            groups.setdefault(emp_id, []).append({"id": group_id, "name": f"Group {group_id}"})
+    rows = []
+    for emp in tenant.employees:
+        attr = emp["attributes"]
+        memberships = groups.get(emp["id"], [])
+        rows.append([emp["id"], attr["user"]["username"], attr["organizationId"], attr["isSupervisor"],
+                     json.dumps(memberships[::-1] if reverse_groups else memberships)])
+    return rows
+
+def write_extraction(kind, directory, name, rows):
+    """
+    Writes an Employees sheet as a snapshot, workbook or export directory and returns its path.
+    """
+    if kind == "sqlite":
+        path = str(directory / f"{name}.sqlite")
+        sink = SnapshotSink(path)
+    elif kind == "xlsx":
+        path = str(directory / f"{name}.xlsx")
+        sink = WorkbookSink(path, preserve_existing=False)
+    else:
+        path = str(directory / f"{name}_{kind}")
+        sink = CsvSink(path) if kind == "csv" else NdjsonSink(path)
+    with sink:
+        sink.sheet("Employees", headers=HEADERS).extend(rows)
+    return path
+
+def run_diff(tmp_path, left, right):
+    summaries, report_path = diff_extractions(left, right, sheets=["Employees"],
+                                              report_path=str(tmp_path / "diff.ndjson"))
+    with open(report_path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    return summaries[0], entries
+
+@pytest.mark.parametrize("left_kind,right_kind",
+                         [(kind, kind) for kind in KINDS]
+                         + [("sqlite", "xlsx"), ("xlsx", "csv"), ("ndjson", "sqlite")])
+def test_added_removed_and_changed_rows(tmp_path, tenant, left_kind, right_kind):
+    left_rows = employee_rows(tenant)
+    # Same entities, group memberships listed in another order
+    right_rows = employee_rows(tenant, reverse_groups=True)
+    removed = right_rows.pop(0)
+    right_rows[0][1] = "renamed.user"
+    right_rows.append(["999999", "new.user", 1000, False, "[]"])
+
+    left = write_extraction(left_kind, tmp_path, "left", left_rows)
+    right = write_extraction(right_kind, tmp_path, "right", right_rows)
+    summary, entries = run_diff(tmp_path, left, right)
+
+    assert summary["left_rows"] == len(left_rows)
+    assert summary["right_rows"] == len(right_rows)
+    assert (summary["added"], summary["removed"], summary["changed"]) == (1, 1, 1)
+    assert summary["unchanged"] == len(left_rows) - 2
+
+    by_status = {entry["status"]: entry for entry in entries if entry["status"] != "summary"}
+    assert by_status["added"]["key"] == {"Employee ID": "999999"}
+    assert by_status["removed"]["key"] == {"Employee ID": removed[0]}
+    assert by_status["changed"]["key"] == {"Employee ID": left_rows[1][0]}
+    assert list(by_status["changed"]["changes"]) == ["Username"]
+
+@pytest.mark.parametrize("left_kind,right_kind", [("sqlite", "xlsx"), ("xlsx", "csv"), ("csv", "ndjson"),
+                                                  ("ndjson", "sqlite")])
+def test_same_extraction_in_other_format_has_no_differences(tmp_path, tenant, left_kind, right_kind):
+    rows = employee_rows(tenant)
+    left = write_extraction(left_kind, tmp_path, "left", rows)
+    right = write_extraction(right_kind, tmp_path, "right", rows)
+    summary, _ = run_diff(tmp_path, left, right)
+
+    assert (summary["added"], summary["removed"], summary["changed"]) == (0, 0, 0)
+    assert summary["unchanged"] == len(rows)
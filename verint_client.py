@@ -4,23 +4,97 @@ Purpose: Defines a client for making authenticated requests to the Verint API
 using HMAC authentication.
 """
 
+import json
 import requests
+import time
+from requests.adapters import HTTPAdapter
 from hmac_auth import VerintHmac
 import logging
-from config import BASE_URL, API_KEY_ID, API_KEY_SECRET
+from rate_limiter import RetryPolicy, get_default_rate_limiter, parse_retry_after
+from http_cache import get_default_response_cache
+from response_archive import get_default_response_archive
+from metrics import get_default_metrics
+from diagnostics import get_diagnostics
+from memo_cache import ResponseMemo
+from config import BASE_URL, API_KEY_ID, API_KEY_SECRET, POOL_SIZE
 
 class VerintClient:
     """
     A client to interact with the Verint API using HMAC authentication.
+
+    The client owns a long-lived, keep-alive ``requests.Session`` backed by a
+    pooled connection adapter, so repeated calls reuse TCP/TLS connections
+    instead of performing a new handshake each time. A single instance may be
+    shared by several worker threads; the underlying urllib3 pool hands out
+    one connection per in-flight request and blocks when the pool is full.
+
+    Every call first takes a token from a rate limiter shared across clients,
+    and 429/5xx responses or connection errors are retried with backoff.
+    GET responses can optionally be cached on disk and revalidated with
+    conditional requests, and every response body is appended as received to
+    the run's response archive unless archiving is disabled. Latency, status,
+    size and retries of every attempt are recorded per endpoint template in
+    the run's metrics registry. Repeated lookups of the endpoints configured
+    in VERINT_MEMO_ENDPOINTS are answered from memory, and concurrent
+    identical GETs to them share one request.
     """
 
-    def __init__(self):
+    def __init__(self, base_url=None, api_key_id=None, api_key_secret=None, pool_size=None,
+                 rate_limiter=None, retry_policy=None, cache=None, archive=None, metrics=None,
+                 memo=None):
         """
         Initializes the VerintClient with API credentials and base URL.
+
+        Args:
+            base_url (str, optional): Verint base URL (defaults to config).
+            api_key_id (str, optional): API key id (defaults to config).
+            api_key_secret (str, optional): Base64url API secret (defaults to config).
+            pool_size (int, optional): Keep-alive connections per host (defaults to config).
+            rate_limiter (TokenBucket, optional): Limiter to share (defaults to the process-wide one).
+            retry_policy (RetryPolicy, optional): Retry/backoff policy (defaults to config).
+            cache (ResponseCache, optional): GET response cache (defaults to VERINT_CACHE_DIR, if set).
+            archive (ResponseArchive, optional): Raw response archive (defaults to the run's
+                archive unless VERINT_ARCHIVE is off).
+            metrics (MetricsRegistry, optional): Request metrics (defaults to the process-wide registry).
+            memo (ResponseMemo, optional): In-memory memo of repeated GETs (defaults to
+                a new memo of the VERINT_MEMO_ENDPOINTS rules, for the client's lifetime).
         """
-        self.base_url = BASE_URL
-        self.api_key_id = API_KEY_ID
-        self.api_key_val = API_KEY_SECRET
+        self.base_url = base_url or BASE_URL
+        self.api_key_id = api_key_id or API_KEY_ID
+        self.api_key_val = api_key_secret or API_KEY_SECRET
+        self.pool_size = pool_size or POOL_SIZE
+        self.rate_limiter = rate_limiter or get_default_rate_limiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.cache = cache or get_default_response_cache()
+        self.archive = archive or get_default_response_archive()
+        self.metrics = metrics or get_default_metrics()
+        self.memo = memo if memo is not None else ResponseMemo()
+
+        # Reusable HMAC signer; it is stateless per request and safe to share
+        self.auth = VerintHmac(self.api_key_id, self.api_key_val)
+
+        # Long-lived session with a pooled adapter for keep-alive connections
+        self.session = requests.Session()
+        self.session.headers.update({'Content-Type': 'application/json'})
+        adapter = HTTPAdapter(pool_connections=self.pool_size,
+                              pool_maxsize=self.pool_size,
+                              pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the underlying session and releases pooled connections.
+        """
+        self.session.close()
+        if self.archive is not None:
+            self.archive.close()
 
     def verint_call(self, endpoint, method="GET", request_body=None):
         """
@@ -37,21 +111,89 @@ class VerintClient:
         Raises:
             HTTPError: If the HTTP request returned an unsuccessful status code.
         """
+        # Memoized lookups are served from memory or shared with an identical
+        # request in flight
+        rule = self.memo.rule_for(method, endpoint)
+        if rule is None:
+            return self._request(endpoint, method, request_body)
+        response, source = self.memo.call(rule, endpoint, lambda: self._request(endpoint, method))
+        if source is not None:
+            self.metrics.observe_local(method, endpoint, source)
+        return response
+
+    def _request(self, endpoint, method="GET", request_body=None):
         # Construct the full URL by appending the endpoint to the base URL
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        logging.info(f"Calling Verint API [{method}] => {url}")
+        logging.debug(f"Calling Verint API [{method}] => {url}")
 
-        # Set required headers for the request
-        headers = {'Content-Type': 'application/json'}
+        # Serve or revalidate GETs from the response cache when enabled
+        cached = None
+        headers = None
+        if self.cache is not None and method.upper() == "GET":
+            cached = self.cache.get(method, url)
+            if cached is not None:
+                if self.cache.is_fresh(cached):
+                    self.metrics.observe_local(method, endpoint, "cache")
+                    if self.archive is not None:
+                        self.archive.record(method, endpoint, 200, cached.body, cached=True)
+                    return json.loads(cached.body)
+                headers = self.cache.conditional_headers(cached)
 
-        # Generate HMAC authentication header
-        auth = VerintHmac(self.api_key_id, self.api_key_val)
+        attempt = 0
+        while True:
+            # Wait for the shared rate limiter before sending
+            self.rate_limiter.acquire()
 
-        # Make the HTTP request
-        response = requests.request(method, url, headers=headers, auth=auth, json=request_body)
+            # Make the HTTP request over the pooled session using the shared signer
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, auth=self.auth, json=request_body,
+                                                headers=headers)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.metrics.observe_request(method, endpoint, "error", time.perf_counter() - start)
+                if not self.retry_policy.should_retry(attempt):
+                    raise
+                self.metrics.observe_retry(method, endpoint)
+                delay = self.retry_policy.backoff(attempt)
+                get_diagnostics().record("retry", method=method, endpoint=endpoint, error=str(e),
+                                         delay=round(delay, 3))
+                logging.debug(f"Verint API [{method}] {url} failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.metrics.observe_request(method, endpoint, response.status_code,
+                                         time.perf_counter() - start, len(response.content))
+
+            if self.retry_policy.should_retry(attempt, response.status_code):
+                self.metrics.observe_retry(method, endpoint)
+                # Honour Retry-After and hold back every worker sharing the limiter
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = self.retry_policy.backoff(attempt, retry_after)
+                if retry_after is not None:
+                    self.rate_limiter.pause(delay)
+                get_diagnostics().record("retry", method=method, endpoint=endpoint,
+                                         status=response.status_code, delay=round(delay, 3))
+                logging.debug(f"Verint API [{method}] {url} returned {response.status_code}; "
+                              f"retrying in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+                continue
+            break
+
+        # Unchanged since the cached copy: reuse it without a payload transfer
+        if cached is not None and response.status_code == 304:
+            self.cache.touch(cached)
+            if self.archive is not None:
+                self.archive.record(method, endpoint, 304, cached.body, cached=True)
+            return json.loads(cached.body)
 
         # Raise an exception for unsuccessful responses
         response.raise_for_status()
 
+        if self.cache is not None and method.upper() == "GET":
+            self.cache.store(method, url, response.content, response.headers)
+        if self.archive is not None:
+            self.archive.record(method, endpoint, response.status_code, response.content)
+
         # Return the parsed JSON response
-        return response.json()
\ No newline at end of file
+        return response.json()